@@ -0,0 +1,4 @@
+from enso import engine, variants
+
+# 수온 추세 탐구 (미션 정의는 enso/variants.py의 TREND_LAB)
+engine.run(variants.TREND_LAB)
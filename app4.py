@@ -0,0 +1,4 @@
+from enso import engine, variants
+
+# ENSO 예측 실험실 (미션 정의는 enso/variants.py의 FORECAST_LAB)
+engine.run(variants.FORECAST_LAB)
@@ -0,0 +1 @@
+# ENSO 미션 앱 공용 모듈
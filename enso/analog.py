@@ -0,0 +1,194 @@
+import heapq
+
+import numpy as np
+
+# -----------------------
+# 유사 사례(analog) 예측
+# -----------------------
+# 지수의 연속된 window개월을 한 점(벡터)으로 보고, 고른 기간과 가장 가까운(유클리드 거리) 과거 기간을 찾아
+# 그 뒤 horizon개월 동안 무슨 일이 있었는지 보여준다.
+# 점들은 로드할 때 KD-트리로 한 번 묶어 두고, 새 달이 덧붙으면 새 점만 꼬리(tail)에 모아 전수 비교한다.
+# 꼬리가 TAIL_MAX를 넘으면 그때 트리를 다시 만든다.
+WINDOWS = (6, 12, 24, 36)
+DEFAULT_WINDOW = 12
+DEFAULT_K = 10
+HORIZON = 6
+LEAF_SIZE = 32
+TAIL_MAX = 256
+THRESHOLD = 0.5
+
+
+def embed(values, window):
+    """(끝 위치 배열, (점 수, window) 배열). NaN이 들어간 기간은 뺀다."""
+    v = np.asarray(values, dtype=np.float64)
+    if len(v) < window:
+        return np.empty(0, dtype=np.int64), np.empty((0, window))
+    vecs = np.lib.stride_tricks.sliding_window_view(v, window)
+    ok = np.isfinite(vecs).all(axis=1)
+    return np.flatnonzero(ok) + window - 1, vecs[ok]
+
+
+class KDTree:
+    """정적인 점 집합의 KD-트리. 노드마다 경계 상자를 두고 가까운 노드부터 훑는다."""
+
+    def __init__(self, points, leaf_size=LEAF_SIZE):
+        self.points = np.ascontiguousarray(points, dtype=np.float64)
+        self.order = np.arange(len(self.points))
+        self.lo, self.hi, self.left, self.right, self.box_min, self.box_max = [], [], [], [], [], []
+        if len(self.points):
+            self._build(leaf_size)
+        self.box_min = np.array(self.box_min)
+        self.box_max = np.array(self.box_max)
+
+    def _node(self, lo, hi):
+        pts = self.points[self.order[lo:hi]]
+        self.lo.append(lo)
+        self.hi.append(hi)
+        self.left.append(-1)
+        self.right.append(-1)
+        self.box_min.append(pts.min(axis=0))
+        self.box_max.append(pts.max(axis=0))
+        return len(self.lo) - 1
+
+    def _build(self, leaf_size):
+        stack = [self._node(0, len(self.points))]
+        while stack:
+            node = stack.pop()
+            lo, hi = self.lo[node], self.hi[node]
+            if hi - lo <= leaf_size:
+                continue
+            # 가장 넓게 퍼진 축의 중앙값으로 나눈다
+            dim = int(np.argmax(self.box_max[node] - self.box_min[node]))
+            mid = (lo + hi) // 2
+            part = self.order[lo:hi]
+            self.order[lo:hi] = part[np.argpartition(self.points[part, dim], mid - lo)]
+            self.left[node] = self._node(lo, mid)
+            self.right[node] = self._node(mid, hi)
+            stack += [self.left[node], self.right[node]]
+
+    def _box_dist(self, node, q):
+        d = np.maximum(self.box_min[node] - q, 0.0) + np.maximum(q - self.box_max[node], 0.0)
+        return float(d @ d)
+
+    def query(self, q, k, allowed=None):
+        """q에서 가까운 점 k개의 [(-거리², 점 번호)] 최대 힙. allowed(점 번호 → bool 배열)로 후보를 거른다."""
+        q = np.asarray(q, dtype=np.float64)
+        best = []
+        if not len(self.points):
+            return best
+        todo = [(self._box_dist(0, q), 0)]
+        while todo:
+            d, node = heapq.heappop(todo)
+            if len(best) == k and d >= -best[0][0]:
+                break
+            if self.left[node] >= 0:
+                for child in (self.left[node], self.right[node]):
+                    cd = self._box_dist(child, q)
+                    if len(best) < k or cd < -best[0][0]:
+                        heapq.heappush(todo, (cd, child))
+                continue
+            ids = self.order[self.lo[node]:self.hi[node]]
+            if allowed is not None:
+                ids = ids[allowed[ids]]
+            diff = self.points[ids] - q
+            _push(best, k, np.einsum("ij,ij->i", diff, diff), ids)
+        return best
+
+
+def _push(best, k, dist2, ids):
+    for d, i in zip(dist2.tolist(), ids.tolist()):
+        if len(best) < k:
+            heapq.heappush(best, (-d, i))
+        elif d < -best[0][0]:
+            heapq.heapreplace(best, (-d, i))
+
+
+class AnalogIndex:
+    """한 시계열, 한 window의 유사 사례 색인. 트리 + 꼬리(트리를 만든 뒤 덧붙은 점)."""
+
+    def __init__(self, values, window, tree=None, tree_ends=None, leaf_size=LEAF_SIZE):
+        self.values = np.array(values, dtype=np.float64)
+        self.window = window
+        self.leaf_size = leaf_size
+        ends, vecs = embed(self.values, window)
+        if tree is None:
+            self.tree, self.tree_ends = KDTree(vecs, leaf_size), ends
+        else:
+            self.tree, self.tree_ends = tree, tree_ends
+        # 트리에 없는 끝 위치는 꼬리로 전수 비교한다
+        tail = ends > (self.tree_ends[-1] if len(self.tree_ends) else -1)
+        self.tail_ends, self.tail = ends[tail], vecs[tail]
+        self.ends = ends
+
+    def extended(self, values):
+        """덧붙은 달까지 포함한 새 색인. 앞부분이 같으면 트리를 그대로 쓰고 새 점만 꼬리에 더한다.
+
+        원래 색인은 바꾸지 않으므로 다른 세션이 쓰는 중이어도 안전하다.
+        """
+        values = np.asarray(values, dtype=np.float64)
+        n = len(self.values)
+        same = len(values) >= n and np.array_equal(values[:n], self.values, equal_nan=True)
+        if not same or len(values) - (self.tree_ends[-1] if len(self.tree_ends) else 0) > TAIL_MAX:
+            return AnalogIndex(values, self.window, leaf_size=self.leaf_size)
+        return AnalogIndex(values, self.window, self.tree, self.tree_ends, self.leaf_size)
+
+    def query(self, end, k=DEFAULT_K, horizon=HORIZON):
+        """end에서 끝나는 기간과 가장 비슷한 과거 기간 k개.
+
+        후보는 뒤따르는 horizon개월이 모두 있고 고른 기간과 겹치지 않는 기간이다. 가까운 순으로
+        dict(ends, dist, paths, outcome, query)를 돌려준다. paths는 (k, window + horizon)으로 각 사례의
+        기간과 그 뒤 값이고, outcome은 horizon개월 뒤 값이다.
+        """
+        w = self.window
+        if end < w - 1 or end >= len(self.values):
+            raise ValueError(f"기간의 끝이 자료 범위를 벗어났습니다: {end}")
+        q = self.values[end - w + 1:end + 1]
+        if not np.isfinite(q).all():
+            raise ValueError("고른 기간에 빈 값이 있습니다. 다른 달을 고르세요.")
+
+        last = len(self.values) - 1
+
+        def allowed(ends):
+            return (ends + horizon <= last) & (np.abs(ends - end) >= w)
+
+        best = self.tree.query(q, k, allowed(self.tree_ends)) if len(self.tree_ends) else []
+        ok = allowed(self.tail_ends)
+        if ok.any():
+            diff = self.tail[ok] - q
+            # 꼬리 번호는 트리 번호 뒤에 이어 붙인다
+            _push(best, k, np.einsum("ij,ij->i", diff, diff), np.flatnonzero(ok) + len(self.tree_ends))
+
+        best = sorted((-d, i) for d, i in best)
+        ids = np.array([i for _, i in best], dtype=np.int64)
+        ends = np.concatenate((self.tree_ends, self.tail_ends))[ids] if len(ids) else ids
+        steps = np.arange(-w + 1, horizon + 1)
+        paths = self.values[ends[:, None] + steps] if len(ends) else np.empty((0, len(steps)))
+        return {
+            "ends": ends,
+            "dist": np.sqrt([d for d, _ in best]),
+            "paths": paths,
+            "outcome": paths[:, -1] if len(ends) else np.empty(0),
+            "query": q,
+        }
+
+
+def outlook(result):
+    """사례들의 horizon개월 뒤 값 중앙값으로 본 ENSO 상태 (엘니뇨/라니냐/중립). 사례가 없으면 None."""
+    if not len(result["outcome"]):
+        return None
+    m = float(np.nanmedian(result["outcome"]))
+    if m >= THRESHOLD:
+        return "엘니뇨"
+    if m <= -THRESHOLD:
+        return "라니냐"
+    return "중립"
+
+
+def choices(values, window=max(WINDOWS)):
+    """고를 수 있는 기간의 끝 위치: 값이 있고 가장 긴 기간도 들어가는 달.
+
+    기간 길이를 바꿔도 선택지가 같도록 가장 긴 window를 기준으로 한다.
+    """
+    v = np.asarray(values, dtype=np.float64)
+    pos = np.flatnonzero(np.isfinite(v))
+    return pos[pos >= window - 1]
@@ -0,0 +1,175 @@
+import numpy as np
+
+from enso import events
+
+# -----------------------
+# 시계열 분석 도구 (노트북/미션 공용)
+# -----------------------
+# 모든 함수는 마지막 축을 시간으로 보고 배열 전체를 한 번에 계산한다. 앞쪽 축은 여러 시계열이라서
+# (시계열 수, 달 수) 배열을 넣으면 수백 개 지연(lag) x 여러 시계열 상관도 한 번의 FFT로 끝난다.
+# 빠진 달(NaN)은 짝이 맞는 달만 써서 계산한다.
+#
+#   from enso import analysis, dataset
+#   df = dataset.load()
+#   lags, r = analysis.lag_correlation(df["nino3.4 index"], df["서울 기온"], max_lag=24)
+PHASES = ("엘니뇨", "라니냐", "중립")
+
+
+def _as_series(values):
+    return np.asarray(values, dtype=np.float64)
+
+
+def _xcorr(a, b, nfft, max_lag):
+    # sum_t a[t] * b[t + k], k = -max_lag..max_lag
+    c = np.fft.irfft(np.conj(np.fft.rfft(a, nfft)) * np.fft.rfft(b, nfft), nfft)
+    return np.concatenate((c[..., nfft - max_lag:], c[..., :max_lag + 1]), axis=-1)
+
+
+def lag_correlation(x, y, max_lag=None, min_pairs=10):
+    """x와 y를 k달 어긋나게 놓았을 때의 상관계수 r[k] (x[t]와 y[t+k]의 피어슨 상관).
+
+    k > 0이면 x가 y보다 k달 앞선다. x, y는 (..., 달 수) 모양이고 앞쪽 축은 서로 브로드캐스트된다.
+    (지연 배열, 상관 배열) 을 돌려준다. 짝이 min_pairs개보다 적은 지연은 NaN.
+    """
+    x, y = _as_series(x), _as_series(y)
+    n = x.shape[-1]
+    if y.shape[-1] != n:
+        raise ValueError(f"두 시계열의 길이가 다릅니다: {n}, {y.shape[-1]}")
+    max_lag = n - 1 if max_lag is None else min(int(max_lag), n - 1)
+    nfft = 1 << int(np.ceil(np.log2(n + max_lag)))
+
+    mx, my = np.isfinite(x), np.isfinite(y)
+    # 평균을 먼저 빼 두면 합 공식의 자릿수 손실이 줄어든다 (상관계수 자체는 바뀌지 않는다)
+    with np.errstate(invalid="ignore"):
+        x0 = np.where(mx, x - np.nanmean(np.where(mx, x, np.nan), axis=-1, keepdims=True), 0.0)
+        y0 = np.where(my, y - np.nanmean(np.where(my, y, np.nan), axis=-1, keepdims=True), 0.0)
+    mx, my = mx.astype(np.float64), my.astype(np.float64)
+
+    pairs = _xcorr(mx, my, nfft, max_lag)
+    sx = _xcorr(x0, my, nfft, max_lag)
+    sy = _xcorr(mx, y0, nfft, max_lag)
+    sxx = _xcorr(x0 * x0, my, nfft, max_lag)
+    syy = _xcorr(mx, y0 * y0, nfft, max_lag)
+    sxy = _xcorr(x0, y0, nfft, max_lag)
+
+    pairs = np.rint(pairs)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        cov = pairs * sxy - sx * sy
+        var = (pairs * sxx - sx * sx) * (pairs * syy - sy * sy)
+        r = cov / np.sqrt(np.maximum(var, 0.0))
+    r = np.where((pairs >= max(min_pairs, 2)) & (var > 0), np.clip(r, -1.0, 1.0), np.nan)
+    return np.arange(-max_lag, max_lag + 1), r
+
+
+def best_lag(lags, r):
+    """|r|이 가장 큰 지연과 그 상관계수. (..., 지연) 모양이면 앞쪽 축마다."""
+    i = np.nanargmax(np.abs(np.where(np.isnan(r), 0.0, r)), axis=-1)
+    return lags[i], np.take_along_axis(r, np.expand_dims(i, -1), axis=-1)[..., 0]
+
+
+def lag_table(df, target, columns=None, max_lag=24, min_pairs=10):
+    """target 컬럼과 여러 컬럼의 지연 상관표 (행: 지연, 열: 컬럼). 양의 지연은 target이 앞선다."""
+    import pandas as pd
+
+    columns = [c for c in (columns or df.columns) if c != target]
+    others = np.stack([df[c].to_numpy(dtype=np.float64) for c in columns])
+    lags, r = lag_correlation(df[target].to_numpy(dtype=np.float64), others, max_lag, min_pairs)
+    return pd.DataFrame(r.T, index=pd.Index(lags, name="지연(개월)"), columns=columns)
+
+
+# -----------------------
+# 계절 변동 분해
+# -----------------------
+def _month_onehot(months):
+    m = np.asarray(months, dtype=np.int64) - 1
+    if m.min() < 0 or m.max() > 11:
+        raise ValueError("월은 1~12여야 합니다.")
+    return np.eye(12)[m]
+
+
+def _monthly_means(values, onehot, use=None):
+    ok = np.isfinite(values)
+    if use is not None:
+        ok &= use
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = (np.where(ok, values, 0.0) @ onehot) / (ok.astype(np.float64) @ onehot)
+    return means
+
+
+def decompose(values, months, years=None, base=None, trend=True):
+    """값 = 추세 + 계절 변동 + 나머지(편차)로 나눈다.
+
+    추세는 빠진 달을 뺀 최소제곱 직선(trend=False면 평균), 계절 변동은 추세를 뺀 값의 달별 평균이다.
+    base=(시작 연도, 끝 연도)를 주면 계절 변동을 그 기간에서만 구한다 (years 필요).
+    dict(trend, seasonal, resid, cycle)을 돌려주며 cycle은 (..., 12) 달별 계절 변동이다.
+    """
+    v = _as_series(values)
+    onehot = _month_onehot(months)
+    use = None
+    if base is not None:
+        if years is None:
+            raise ValueError("base를 쓰려면 years가 필요합니다.")
+        y = np.asarray(years)
+        use = (y >= base[0]) & (y <= base[1])
+
+    ok = np.isfinite(v)
+    t = np.arange(v.shape[-1], dtype=np.float64)
+    n = ok.sum(axis=-1, keepdims=True)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.where(ok, v, 0.0).sum(axis=-1, keepdims=True) / n
+        if trend:
+            tc = np.where(ok, t, 0.0)
+            t_mean = tc.sum(axis=-1, keepdims=True) / n
+            dt = np.where(ok, t - t_mean, 0.0)
+            slope = (dt * np.where(ok, v - mean, 0.0)).sum(axis=-1, keepdims=True) / (dt * dt).sum(axis=-1, keepdims=True)
+            line = mean + slope * (t - t_mean)
+        else:
+            line = np.broadcast_to(mean, v.shape)
+
+    cycle = _monthly_means(v - line, onehot, use)
+    # 계절 변동은 12달 평균이 0이 되도록 맞추고 남는 값은 추세로 보낸다
+    offset = np.nanmean(cycle, axis=-1, keepdims=True)
+    cycle = cycle - offset
+    line = line + offset
+    seasonal = cycle @ onehot.T
+    return {"trend": line, "seasonal": seasonal, "resid": v - line - seasonal, "cycle": cycle}
+
+
+# -----------------------
+# 엘니뇨/라니냐 합성(composite)
+# -----------------------
+def phase(oni, threshold=0.5, min_length=5):
+    """달마다 ENSO 상태: events.EL_NINO(1), events.LA_NINA(-1), 중립 0. 사건 판정은 enso.events와 같다."""
+    ep = events.detect(oni, threshold, min_length)
+    step = np.zeros(len(np.asarray(oni)) + 1, dtype=np.int64)
+    np.add.at(step, ep["start"], ep["kind"])
+    np.add.at(step, ep["end"] + 1, -ep["kind"].astype(np.int64))
+    return np.cumsum(step[:-1]).astype(np.int8)
+
+
+def composite(values, months, phases):
+    """상태(엘니뇨/라니냐/중립)별, 달별 평균과 표본 수.
+
+    values는 (..., 달 수) 모양이고 (평균 (..., 3, 12), 표본 수 (..., 3, 12))를 돌려준다.
+    상태 순서는 PHASES와 같다.
+    """
+    v = _as_series(values)
+    p = np.asarray(phases)
+    m = np.asarray(months, dtype=np.int64) - 1
+    group = np.select([p == events.EL_NINO, p == events.LA_NINA], [0, 1], 2) * 12 + m
+    onehot = np.eye(36)[group]
+    ok = np.isfinite(v)
+    counts = ok.astype(np.float64) @ onehot
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = (np.where(ok, v, 0.0) @ onehot) / counts
+    shape = v.shape[:-1] + (3, 12)
+    return means.reshape(shape), counts.astype(np.int64).reshape(shape)
+
+
+def composite_table(df, column, oni_col="ONI index", threshold=0.5, min_length=5):
+    """column의 상태별 달별 평균표 (행: 상태, 열: 1~12월)."""
+    import pandas as pd
+
+    means, _ = composite(df[column].to_numpy(dtype=np.float64), df["Month"].to_numpy(),
+                         phase(df[oni_col].to_numpy(dtype=np.float64), threshold, min_length))
+    return pd.DataFrame(means, index=pd.Index(PHASES, name="상태"), columns=pd.RangeIndex(1, 13, name="월"))
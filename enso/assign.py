@@ -0,0 +1,151 @@
+import argparse
+import hashlib
+import sys
+from itertools import repeat
+
+import numpy as np
+
+from enso import variants
+
+# -----------------------
+# 학생별 과제(월, 연도 범위)와 정답표
+# -----------------------
+# 모두 같은 기본 범위(전체 연도, 8월)로 풀면 한 명의 정답이 교실 전체에 퍼지므로, Variant.assign이 켜진 앱에서는
+# 학생마다 미션별로 월과 연도 범위를 하나씩 정해 준다. 고르는 방법은 (앱, 미션, 반, 학생)으로 정해지는 씨앗이라서
+# 새로고침하거나 서버를 다시 켜도 같은 학생은 같은 과제를 받는다.
+#
+# 연도 범위 후보는 자료 첫 해부터 TASK_YEARS년 안에서만 고른다. 새 달이 덧붙어 마지막 해가 늘어도 후보 목록이
+# 그대로여야 수업 중에 과제가 바뀌지 않는다 (덧붙이기만 하므로 첫 해는 바뀌지 않는다).
+#
+# 과제 후보(월 x 길이가 MIN_SPAN년 이상인 모든 연도 범위)의 정답은 시작할 때 희소 테이블로 한꺼번에 구해 두고,
+# 정답 확인은 사전 조회 한 번이다. 대상은 구간 최댓값/최솟값을 묻는 미션(answer "max"/"min")이다.
+MIN_SPAN = 20
+TASK_YEARS = 40
+ANSWERS = ("max", "min")
+COLUMNS = ["앱", "미션", "컬럼", "월", "시작 연도", "끝 연도", "정답"]
+
+
+def windows(min_year, max_year, min_span=MIN_SPAN):
+    """(시작 연도 배열, 끝 연도 배열): 길이가 min_span년 이상인 모든 범위. 자료가 더 짧으면 전체 범위 하나."""
+    years = np.arange(min_year, max_year + 1)
+    start, end = np.meshgrid(years, years, indexing="ij")
+    ok = end - start + 1 >= min(min_span, len(years))
+    return start[ok], end[ok]
+
+
+def seed(*parts):
+    # hash()는 프로세스마다 달라지므로 고정된 해시를 쓴다
+    return int.from_bytes(hashlib.sha256("\x1f".join(map(str, parts)).encode()).digest()[:8], "little")
+
+
+class AnswerKey:
+    """Variant.assign이 켜진 앱의 과제 후보와 정답표.
+
+    ctx는 enso.engine.Context, month_charts는 월을 고르는 그래프 종류다.
+    """
+
+    def __init__(self, ctx, variant_list, month_charts, min_span=MIN_SPAN):
+        # 자료가 TASK_YEARS년보다 짧으면 있는 해까지만 (이때는 해가 늘면 후보도 늘어난다)
+        self.starts, self.ends = windows(ctx.min_year, min(ctx.max_year, ctx.min_year + TASK_YEARS - 1), min_span)
+        self.months = {}  # (앱, 미션) -> 고를 수 있는 월 (월이 없는 그래프면 (None,))
+        self.columns = {}  # (앱, 미션) -> 정답을 구해 둔 컬럼
+        self._answers = {}
+        self._parts = []
+        starts, ends = self.starts.tolist(), self.ends.tolist()
+        for variant in variant_list:
+            if not variant.assign:
+                continue
+            for mission in variant.missions:
+                if mission.answer not in ANSWERS:
+                    continue
+                task = (variant.key, mission.number)
+                self.months[task] = tuple(range(1, 13)) if mission.chart in month_charts else (None,)
+                self.columns[task] = [ctx.column(k) for k in mission.series if k in ctx.series] \
+                    or [ctx.column(mission.column)]
+                for col in self.columns[task]:
+                    for month in self.months[task]:
+                        years = ctx.ext.years_many(col, mission.answer, self.starts, self.ends, month)
+                        answers = [y if y >= 0 else None for y in years.tolist()]
+                        keys = zip(repeat(variant.key), repeat(mission.number), repeat(col), repeat(month),
+                                   starts, ends)
+                        self._answers.update(zip(keys, answers))
+                        self._parts.append((variant.key, mission.number, col, month, years))
+
+    def __len__(self):
+        return len(self._answers)
+
+    def task(self, variant, mission, student):
+        """학생의 과제 (월 또는 None, (시작 연도, 끝 연도)). 과제가 없는 미션이면 None."""
+        months = self.months.get((variant.key, mission.number))
+        if months is None:
+            return None
+        rng = np.random.default_rng(seed(variant.key, mission.number, *student))
+        month = months[int(rng.integers(len(months)))]
+        i = int(rng.integers(len(self.starts)))
+        return month, (int(self.starts[i]), int(self.ends[i]))
+
+    def answer(self, variant, mission, col, month, year_range):
+        """정답 연도. 후보가 아니거나 범위에 값이 없으면 None."""
+        return self._answers.get((variant.key, mission.number, col, month, *year_range))
+
+    def frame(self):
+        """전체 정답표 (앱, 미션, 컬럼, 월, 시작 연도, 끝 연도, 정답). 값이 없는 범위의 정답은 빈 값."""
+        import pandas as pd
+
+        n = len(self.starts)
+        parts = [pd.DataFrame({
+            "앱": key, "미션": number, "컬럼": col, "월": pd.array([month] * n, dtype="Int64"),
+            "시작 연도": self.starts, "끝 연도": self.ends,
+            "정답": pd.Series(years, dtype="Int64").mask(years < 0),
+        }) for key, number, col, month, years in self._parts]
+        return pd.concat(parts, ignore_index=True) if parts else pd.DataFrame(columns=COLUMNS)
+
+    def roster(self, class_code, students, variant_list):
+        """반 학생들의 과제와 정답 (반, 학생, 앱, 미션, 월, 시작 연도, 끝 연도, 정답). 시계열을 고르는 미션은 기본 시계열 기준."""
+        import pandas as pd
+
+        rows = []
+        for student in students:
+            for variant in variant_list:
+                for mission in variant.missions:
+                    task = self.task(variant, mission, (class_code, student))
+                    if task is None:
+                        continue
+                    month, yr = task
+                    col = self.columns[(variant.key, mission.number)][0]
+                    rows.append((class_code, student, variant.key, mission.number, month, *yr,
+                                 self.answer(variant, mission, col, month, yr)))
+        return pd.DataFrame(rows, columns=["반", "학생", "앱", "미션", "월", "시작 연도", "끝 연도", "정답"]) \
+            .astype({"월": "Int64", "정답": "Int64"})
+
+
+def build(month_charts=None):
+    """저장소 데이터로 모든 앱의 정답표를 만든다 (명령줄용)."""
+    from enso import dataset, engine
+
+    ctx = engine.Context(dataset.load())
+    return AnswerKey(ctx, variants.VARIANTS.values(), month_charts or engine.MONTH_CHARTS)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="학생별 과제 정답표를 CSV로 내보냅니다.")
+    parser.add_argument("--out", help="CSV 파일 (없으면 표준 출력)")
+    parser.add_argument("--class", dest="class_code", help="반 코드 (--students와 함께: 학생별 과제와 정답)")
+    parser.add_argument("--students", help="학생 이름/번호 파일 (한 줄에 한 명)")
+    args = parser.parse_args()
+    if bool(args.class_code) != bool(args.students):
+        parser.error("--class와 --students는 함께 써야 합니다.")
+
+    key = build()
+    if args.students:
+        with open(args.students, encoding="utf-8-sig") as f:
+            students = [line.strip() for line in f if line.strip()]
+        table = key.roster(args.class_code, students, variants.VARIANTS.values())
+    else:
+        table = key.frame()
+    # 엑셀에서 한글이 깨지지 않도록 파일에는 BOM을 붙인다
+    if args.out:
+        table.to_csv(args.out, index=False, encoding="utf-8-sig")
+        print(f"{args.out}: {len(table)}행")
+    else:
+        table.to_csv(sys.stdout, index=False)
@@ -0,0 +1,273 @@
+import argparse
+import json
+import logging
+import random
+import re
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+from enso import data, dataset, extrema, metrics, query
+
+# -----------------------
+# 부하/지연 시간 벤치마크
+# -----------------------
+# streamlit.testing.v1.AppTest로 앱을 헤드리스로 돌려서 인트로 → 미션 1~4 → 최종 암호까지
+# 여러 세션을 번갈아 진행시키고, rerun마다 걸린 시간을 모은다. 네트워크 없이 저장소의 CSV만 쓴다.
+#
+#   python -m enso.bench --app app2.py --sessions 30
+#   python -m enso.bench --app app.py --max-p95 250 --baseline bench.json   (회귀 검사)
+#
+# 미션 수, 정답, 최종 암호는 앱이 돌리는 Variant(enso/variants.py)에서 가져온다. 입력 칸에 답을 넣는 미션
+# (최댓값/최솟값, 자유 답)만 진행할 수 있으므로 추세/유사 사례 앱(app3.py, app4.py)과 여러 페이지 앱은 거부한다.
+ANSWERS = ("max", "min", None)
+
+
+def percentiles(xs):
+    xs = sorted(xs)
+    if not xs:
+        return {}
+
+    def pick(p):
+        return xs[min(len(xs) - 1, int(round(p / 100 * (len(xs) - 1))))]
+
+    return {
+        "count": len(xs),
+        "mean_ms": statistics.fmean(xs) * 1000,
+        "p50_ms": pick(50) * 1000,
+        "p90_ms": pick(90) * 1000,
+        "p95_ms": pick(95) * 1000,
+        "p99_ms": pick(99) * 1000,
+        "max_ms": xs[-1] * 1000,
+    }
+
+
+def _timed(fn, repeat=20):
+    times = []
+    for _ in range(repeat):
+        t = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t)
+    return percentiles(times)
+
+
+def phase_timings(repeat=20):
+    """앱 밖에서 각 단계(데이터 로드, 전처리, 필터, 그래프 생성)를 따로 잰다."""
+    import plotly.express as px
+
+    raw = data.load_raw(refresh_remote=False)
+    df = dataset.load()
+    q = query.YearIndex(dataset.display_frame(df))
+    ext = extrema.RangeExtrema(df)
+    col = df.attrs["index_col"]
+    yr = (q.min_year, q.max_year)
+    return {
+        "data_load": _timed(lambda: data.load_raw(refresh_remote=False), repeat),
+        "preprocess": _timed(lambda: dataset.normalize(raw), repeat),
+        "artifact_load": _timed(dataset.load, repeat),
+        "filter": _timed(lambda: q.select(yr), repeat),
+        "answer": _timed(lambda: ext.max_year(col, yr), repeat),
+        "figure_build": _timed(lambda: px.line(q.select(yr), x="date", y="지수", markers=True), repeat),
+    }
+
+
+class Session:
+    """한 학생의 진행. step()을 호출할 때마다 한 번의 상호작용(rerun)을 한다."""
+
+    def __init__(self, app, variant, answers, rng, slider_moves):
+        from streamlit.testing.v1 import AppTest
+
+        self.at = AppTest.from_file(str(app), default_timeout=60)
+        self.variant = variant
+        self.answers = answers
+        self.rng = rng
+        self.slider_moves = slider_moves
+        self.latencies = []
+        self.done = False
+        self._moves_left = slider_moves
+        self._run(self.at.run)
+
+    def _run(self, action):
+        t = time.perf_counter()
+        action()
+        self.latencies.append(time.perf_counter() - t)
+        if self.at.exception:
+            raise RuntimeError(self.at.exception[0].value)
+
+    def step(self):
+        at, state = self.at, self.at.session_state
+        mission = state["mission"]
+
+        if mission == 0:
+            self._run(at.button[0].click().run)
+        elif mission == self.variant.done_mission:
+            at.text_input[0].input(self.variant.secret)
+            self._run(at.button[0].click().run)
+            self.done = True
+        elif self._moves_left > 0:
+            # 슬라이더 드래그: 전체 범위로 돌아오기 전에 임의 범위를 몇 번 선택
+            self._moves_left -= 1
+            slider = at.slider[0]
+            lo, hi = slider.min, slider.max
+            a = self.rng.randint(lo, hi)
+            slider.set_value((a, self.rng.randint(a, hi)) if self._moves_left else (lo, hi))
+            self._run(at.run)
+        else:
+            self._moves_left = self.slider_moves
+            at.text_input[0].input(str(self.answers(state, mission)))
+            self._run(at.button[0].click().run)
+            # app2는 정답 후 "다음 미션으로 이동" 버튼을 한 번 더 누른다
+            if len(at.button) > 1 and at.session_state["mission"] == mission:
+                self._run(at.button[1].click().run)
+
+
+def app_variant(app):
+    """앱 파일이 돌리는 Variant (engine.run(variants.이름)). 벤치마크로 진행할 수 없는 앱이면 ValueError."""
+    from enso import variants
+
+    names = set(re.findall(r"engine\.run\(variants\.(\w+)\)", Path(app).read_text(encoding="utf-8")))
+    variant = getattr(variants, names.pop(), None) if len(names) == 1 else None
+    if not isinstance(variant, variants.Variant):
+        raise ValueError(f"engine.run(variants.…)으로 앱 하나를 돌리는 파일만 잴 수 있습니다: {Path(app).name}")
+    unsupported = [m.number for m in variant.missions if m.answer not in ANSWERS]
+    if unsupported:
+        raise ValueError(f"{Path(app).name}: 미션 {unsupported}은 입력 칸에 답을 넣는 미션(최댓값/최솟값)이 아니라 "
+                         "벤치마크가 진행할 수 없습니다.")
+    return variant
+
+
+def expected_answers(variant):
+    """(세션 상태, 미션 번호) -> 정답. 학생별 과제가 있는 앱(Variant.assign)은 그 세션의 과제 정답표에서 찾는다.
+
+    정답은 미션 정의대로 전체 연도 범위(월을 고르는 그래프는 기본 달)에서 구한다. 아무 답이나 통과하는 미션은 "1".
+    """
+    from enso import assign, engine
+
+    ctx = engine.Context(dataset.load())
+    yr = (ctx.min_year, ctx.max_year)
+    fixed = {}
+    for m in variant.missions:
+        if m.answer is None:
+            fixed[m.number] = 1
+            continue
+        find = ctx.ext.max_year if m.answer == "max" else ctx.ext.min_year
+        col = ctx.column(m.series[0] if m.series else m.column)
+        fixed[m.number] = find(col, yr, month=engine.DEFAULT_MONTH if m.chart in engine.MONTH_CHARTS else None)
+    if not variant.assign:
+        return lambda state, mission: fixed[mission]
+    key = assign.build()
+    missions = {m.number: m for m in variant.missions}
+
+    def answer(state, mission):
+        m = missions[mission]
+        task = key.task(variant, m, ("-", state["sid"]))
+        if task is None:
+            return fixed[mission]
+        return key.answer(variant, m, key.columns[(variant.key, m.number)][0], *task)
+
+    return answer
+
+
+def run_sessions(app, sessions, slider_moves=3, seed=0):
+    rng = random.Random(seed)
+    variant = app_variant(app)
+    answers = expected_answers(variant)
+    pool = [Session(app, variant, answers, rng, slider_moves) for _ in range(sessions)]
+    # 세션을 번갈아 한 단계씩 진행해 교실에서 동시에 쓰는 상황을 흉내 낸다
+    active = list(pool)
+    while active:
+        for s in list(active):
+            s.step()
+            if s.done:
+                active.remove(s)
+    return [t for s in pool for t in s.latencies]
+
+
+def memory_per_session(app, sessions=5):
+    variant = app_variant(app)
+    answers = expected_answers(variant)
+    rng = random.Random(0)
+    Session(app, variant, answers, rng, 0)  # 공용 캐시를 먼저 채운다
+    tracemalloc.start()
+    base = tracemalloc.take_snapshot()
+    pool = [Session(app, variant, answers, rng, 0) for _ in range(sessions)]
+    for s in pool:
+        while not s.done:
+            s.step()
+    used = sum(st.size_diff for st in tracemalloc.take_snapshot().compare_to(base, "filename"))
+    tracemalloc.stop()
+    return used / sessions
+
+
+def report(app, sessions, slider_moves=3, seed=0):
+    t = time.perf_counter()
+    latencies = run_sessions(app, sessions, slider_moves, seed)
+    wall = time.perf_counter() - t
+    result = {
+        "app": Path(app).name,
+        "sessions": sessions,
+        "wall_s": wall,
+        "rerun": percentiles(latencies),
+        "memory_per_session_kb": memory_per_session(app) / 1024,
+        "phases": phase_timings(),
+    }
+    if metrics.enabled():
+        # 앱 안에서 계측한 구간 합계 (--spans)
+        result["spans"] = metrics.snapshot()["spans"]
+    return result
+
+
+def check(result, max_p95=None, baseline=None, tolerance=1.5):
+    """회귀 검사. 실패 사유 목록을 돌려준다 (비어 있으면 통과)."""
+    failures = []
+    p95 = result["rerun"]["p95_ms"]
+    if max_p95 is not None and p95 > max_p95:
+        failures.append(f"rerun p95 {p95:.1f}ms > {max_p95}ms")
+    if baseline is not None:
+        ref = baseline["rerun"]["p95_ms"]
+        if p95 > ref * tolerance:
+            failures.append(f"rerun p95 {p95:.1f}ms > 기준 {ref:.1f}ms x {tolerance}")
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="ENSO 미션 앱 부하/지연 시간 벤치마크")
+    parser.add_argument("--app", default=str(data.ROOT / "app.py"))
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--slider-moves", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="결과 JSON 저장 경로")
+    parser.add_argument("--max-p95", type=float, help="rerun p95 허용치 (ms)")
+    parser.add_argument("--baseline", help="비교할 이전 결과 JSON")
+    parser.add_argument("--tolerance", type=float, default=1.5)
+    parser.add_argument("--spans", action="store_true", help="앱 내부 계측 구간도 함께 보고")
+    args = parser.parse_args(argv)
+    if args.spans:
+        metrics.enable()
+    # AppTest 실행 중 나오는 Streamlit 경고는 결과 출력을 가리므로 숨긴다
+    logging.disable(logging.WARNING)
+
+    app = Path(args.app)
+    if not app.is_absolute():
+        app = data.ROOT / app
+    try:
+        app_variant(app)
+    except ValueError as e:
+        parser.error(str(e))
+    result = report(app, args.sessions, args.slider_moves, args.seed)
+    text = json.dumps(result, ensure_ascii=False, indent=2)
+    print(text)
+    if args.out:
+        Path(args.out).write_text(text, encoding="utf-8")
+
+    baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8")) if args.baseline else None
+    failures = check(result, args.max_p95, baseline, args.tolerance)
+    for f in failures:
+        print("FAIL:", f, file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,199 @@
+import argparse
+import base64
+import functools
+import gzip
+import io
+import json
+import shutil
+import urllib.request
+from pathlib import Path
+
+from enso import data
+
+# -----------------------
+# 오프라인 번들
+# -----------------------
+# 네트워크가 불안정한 교실용으로 앱 코드, 데이터, 압축한 배경 이미지, 기본 화면 그래프(JSON)를
+# 한 폴더에 모은다. 번들 폴더에서 그대로 streamlit run 하거나, index.html을 열어
+# 브라우저 안의 Python(stlite)으로 서버 없이 실행할 수 있다.
+#
+#   python -m enso.bundle --out dist
+#   python -m enso.bundle --out dist --background 배경.jpg --stlite-url stlite/stlite.js
+CODE = ["app.py", "app2.py", "app3.py", "app4.py", "streamlit_app.py", "requirements.txt"]
+DATA = "data/oni_month.csv"
+BACKGROUND = "assets/background.jpg"
+FIGURES = "figures"
+MANIFEST = f"{FIGURES}/manifest.json"
+
+STLITE_URL = "https://cdn.jsdelivr.net/npm/@stlite/browser@0.80.5/build/stlite.js"
+INDEX_HTML = """<!doctype html>
+<html lang="ko">
+<head>
+  <meta charset="utf-8" />
+  <title>ENSO 미션</title>
+  <link rel="stylesheet" href="{css}" />
+</head>
+<body>
+  <div id="root"></div>
+  <script type="module">
+    import {{ mount }} from "{js}";
+    mount({{
+      requirements: ["plotly"],
+      entrypoint: "streamlit_app.py",
+      files: {files},
+    }}, document.getElementById("root"));
+  </script>
+</body>
+</html>
+"""
+
+
+# -----------------------
+# 번들에서 읽기 (앱 실행 중)
+# -----------------------
+@functools.lru_cache(maxsize=1)
+def background_uri():
+    """번들 배경 이미지의 data URI. 번들이 아니거나 이미지가 없으면 None."""
+    path = data.bundle_config().get("background")
+    if path is None or not path.exists():
+        return None
+    return "data:image/jpeg;base64," + base64.b64encode(path.read_bytes()).decode("ascii")
+
+
+def _key(parts):
+    return tuple(tuple(p) if isinstance(p, list) else p for p in parts)
+
+
+def preload(cache, ctx):
+    """미리 그려 둔 그래프를 캐시에 넣는다. 데이터가 번들을 만들 때와 다르면 넣지 않는다."""
+    path = data.bundle_config().get("figures")
+    if path is None or not path.exists():
+        return 0
+    import plotly.io as pio
+
+    manifest = json.loads(path.read_text(encoding="utf-8"))
+    if manifest.get("stamp") != stamp(ctx):
+        return 0
+    for item in manifest["figures"]:
+        with gzip.open(path.parent / item["file"], "rt", encoding="utf-8") as f:
+            cache.put(_key(item["key"]), pio.from_json(f.read()))
+    return len(manifest["figures"])
+
+
+def stamp(ctx):
+    # 행 수와 마지막 달이 같으면 같은 데이터로 본다
+    return [ctx.rows, str(ctx.display_q.df["날짜"].iloc[-1]) if ctx.rows else None]
+
+
+# -----------------------
+# 번들 만들기
+# -----------------------
+def compress_image(raw, width=1280, quality=60):
+    """배경 이미지를 줄여 JPEG로 다시 저장한다. Pillow가 없으면 원본 그대로."""
+    try:
+        from PIL import Image
+    except ImportError:
+        return raw
+    img = Image.open(io.BytesIO(raw)).convert("RGB")
+    if img.width > width:
+        img = img.resize((width, round(img.height * width / img.width)))
+    buf = io.BytesIO()
+    img.save(buf, "JPEG", quality=quality, optimize=True, progressive=True)
+    return buf.getvalue() if buf.tell() < len(raw) else raw
+
+
+def fetch_background(source, timeout=20):
+    if source is None:
+        return None
+    if Path(source).exists():
+        return Path(source).read_bytes()
+    try:
+        with urllib.request.urlopen(source, timeout=timeout) as resp:
+            return resp.read()
+    except (OSError, ValueError) as e:
+        print(f"배경 이미지를 받지 못했습니다 ({e}). 배경 없이 만듭니다.")
+        return None
+
+
+def export_csv(df, path):
+    # 저장소(덧붙인 달 포함)를 원본과 같은 모양(최신 달이 위, UTF-8 BOM)으로 내보낸다
+    from enso import ingest
+
+    cols = [c for c in df.columns if c not in ingest.DERIVED]
+    path.parent.mkdir(parents=True, exist_ok=True)
+    df[cols].iloc[::-1].to_csv(path, index=False, encoding="utf-8-sig")
+
+
+def render_figures(ctx, out):
+    """모든 앱의 미션 기본 화면(전체 연도, 기본 월) 그래프를 gzip JSON으로 저장한다."""
+    from enso import engine, figures
+
+    cache = figures.FigureCache(maxsize=100_000)
+    engine.default_views(ctx, cache)
+
+    items = []
+    (out / FIGURES).mkdir(parents=True, exist_ok=True)
+    for key, fig in cache.items():
+        # 트레이스 없는 틀(키 길이 3)은 기본 화면에 필요 없다
+        if len(key) < 4:
+            continue
+        name = f"f{len(items)}.json.gz"
+        with gzip.open(out / FIGURES / name, "wt", encoding="utf-8") as f:
+            f.write(fig.to_json())
+        items.append({"key": list(key), "file": name})
+    (out / MANIFEST).write_text(json.dumps({"stamp": stamp(ctx), "figures": items}, ensure_ascii=False),
+                                encoding="utf-8")
+    return len(items)
+
+
+def build(out, background=None, stlite_url=STLITE_URL):
+    """번들 폴더를 만들고 그 안의 파일 목록을 돌려준다."""
+    from enso import dataset, engine, variants
+
+    out = Path(out)
+    if out.exists():
+        if not (out / "bundle.json").exists():
+            raise ValueError(f"{out}은 번들 폴더가 아닙니다. 비어 있는 경로를 지정해 주세요.")
+        shutil.rmtree(out)
+    out.mkdir(parents=True)
+
+    # 코드
+    for name in CODE:
+        shutil.copy2(data.ROOT / name, out / name)
+    (out / "enso").mkdir()
+    for src in sorted((data.ROOT / "enso").glob("*.py")):
+        shutil.copy2(src, out / "enso" / src.name)
+
+    # 데이터: 번들 안에서 다시 정규화한 프레임으로 그래프를 그려야 키와 값이 앱과 같다
+    export_csv(dataset.load(), out / DATA)
+    ctx = engine.Context(dataset.normalize(data.load_raw(out / DATA, refresh_remote=False)))
+
+    conf = {"data": DATA, "figures": MANIFEST}
+    raw = fetch_background(background or variants.BACKGROUND_URL)
+    if raw:
+        (out / BACKGROUND).parent.mkdir(parents=True, exist_ok=True)
+        (out / BACKGROUND).write_bytes(compress_image(raw))
+        conf["background"] = BACKGROUND
+    n = render_figures(ctx, out)
+    (out / "bundle.json").write_text(json.dumps(conf, indent=2), encoding="utf-8")
+
+    # 브라우저 실행용 index.html (stlite). 파일은 모두 상대 경로로 불러온다
+    files = sorted(p.relative_to(out).as_posix() for p in out.rglob("*") if p.is_file())
+    mounted = {f: {"url": f"./{f}"} for f in files if f != "index.html"}
+    css = stlite_url.rsplit(".", 1)[0] + ".css"
+    (out / "index.html").write_text(
+        INDEX_HTML.format(css=css, js=stlite_url, files=json.dumps(mounted, ensure_ascii=False, indent=2)),
+        encoding="utf-8",
+    )
+    print(f"{out}: 파일 {len(files) + 1}개, 미리 그린 그래프 {n}개")
+    return files
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="오프라인 번들을 만듭니다.")
+    parser.add_argument("--out", default="dist")
+    parser.add_argument("--background", help="배경 이미지 파일 또는 URL (기본: 앱의 배경 이미지 URL)")
+    parser.add_argument("--stlite-url", default=STLITE_URL,
+                        help="stlite.js 위치. 완전 오프라인이면 번들 옆에 받아 둔 경로를 지정")
+    args = parser.parse_args()
+    build(args.out, args.background, args.stlite_url)
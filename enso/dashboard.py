@@ -0,0 +1,164 @@
+import threading
+
+# -----------------------
+# 교사용 실시간 집계
+# -----------------------
+# 학생 이벤트(미션 진입/통과/오답)가 들어올 때마다 카운터와 중앙값 추정치만 갱신한다.
+# 원본 이벤트는 저장하지 않으므로 갱신은 O(1), 조회는 미션 수에 비례한다.
+# 여러 앱이 한 서버에서 돌면 앱마다 미션이 다르므로 (앱, 반 코드)마다 따로 센다.
+
+
+class P2Quantile:
+    """P² 알고리즘 (Jain & Chlamtac, 1985). 값 5개만 저장하고 분위수를 추정한다."""
+
+    def __init__(self, p=0.5):
+        self.p = p
+        self.count = 0
+        self.q = []
+        self.n = [0, 1, 2, 3, 4]
+        self.np_ = [0, 2 * p, 4 * p, 2 + 2 * p, 4]
+        self.dn = [0, p / 2, p, (1 + p) / 2, 1]
+
+    def add(self, x):
+        self.count += 1
+        q, n = self.q, self.n
+        if self.count <= 5:
+            q.append(x)
+            q.sort()
+            return
+
+        if x < q[0]:
+            q[0] = x
+            k = 0
+        elif x >= q[4]:
+            q[4] = x
+            k = 3
+        else:
+            k = 0
+            while x >= q[k + 1]:
+                k += 1
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self.np_[i] += self.dn[i]
+
+        for i in (1, 2, 3):
+            d = self.np_[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                d = 1 if d > 0 else -1
+                qp = q[i] + d / (n[i + 1] - n[i - 1]) * (
+                    (n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+                    + (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+                )
+                if not q[i - 1] < qp < q[i + 1]:
+                    qp = q[i] + d * (q[i + d] - q[i]) / (n[i + d] - n[i])
+                q[i] = qp
+                n[i] += d
+
+    def value(self):
+        if self.count == 0:
+            return None
+        if self.count <= 5:
+            k = (self.count - 1) * self.p
+            lo = int(k)
+            hi = min(lo + 1, self.count - 1)
+            return self.q[lo] + (self.q[hi] - self.q[lo]) * (k - lo)
+        return self.q[2]
+
+
+def missions(variant):
+    """0: 인트로, 1~n: 미션, n+1: 완료."""
+    return range(0, variant.done_mission + 1)
+
+
+class ClassStats:
+    def __init__(self, missions):
+        self.missions = missions
+        self.at_mission = {m: 0 for m in missions}
+        self.wrong = {m: 0 for m in missions}
+        self.passed = {m: 0 for m in missions}
+        self.median_time = {m: P2Quantile(0.5) for m in missions}
+        self._students = {}  # 학생 -> (현재 미션, 진입 시각)
+
+    def enter(self, student, mission, t):
+        prev = self._students.get(student)
+        if prev is not None:
+            self.at_mission[prev[0]] -= 1
+        self.at_mission[mission] += 1
+        self._students[student] = (mission, t)
+
+    def complete(self, student, mission, next_mission, t):
+        cur = self._students.get(student)
+        if cur is not None and cur[0] == mission:
+            self.median_time[mission].add(t - cur[1])
+        self.passed[mission] += 1
+        self.enter(student, next_mission, t)
+
+    def add_wrong(self, mission):
+        self.wrong[mission] += 1
+
+    def students(self):
+        return sorted(self._students)
+
+    def table(self):
+        import pandas as pd
+
+        ms = list(self.missions)
+        return pd.DataFrame({
+            "미션": ms,
+            "현재 학생 수": [self.at_mission[m] for m in ms],
+            "통과": [self.passed[m] for m in ms],
+            "오답 수": [self.wrong[m] for m in ms],
+            "중앙 소요 시간(초)": [self.median_time[m].value() for m in ms],
+        })
+
+
+class Dashboard:
+    """(앱, 반 코드)별 ClassStats 모음. 여러 세션 스레드에서 동시에 호출해도 된다."""
+
+    def __init__(self):
+        self._classes = {}
+        self._lock = threading.Lock()
+
+    def _stats(self, variant, class_code):
+        stats = self._classes.get((variant.key, class_code))
+        if stats is None:
+            stats = self._classes[(variant.key, class_code)] = ClassStats(missions(variant))
+        return stats
+
+    def enter(self, variant, class_code, student, mission, t):
+        with self._lock:
+            self._stats(variant, class_code).enter(student, mission, t)
+
+    def complete(self, variant, class_code, student, mission, next_mission, t):
+        with self._lock:
+            self._stats(variant, class_code).complete(student, mission, next_mission, t)
+
+    def wrong(self, variant, class_code, mission):
+        with self._lock:
+            self._stats(variant, class_code).add_wrong(mission)
+
+    def classes(self):
+        with self._lock:
+            return sorted({c for _, c in self._classes})
+
+    def table(self, class_code):
+        """반의 앱별 미션 집계. 앱 컬럼으로 구분한다."""
+        import pandas as pd
+
+        with self._lock:
+            parts = [stats.table().assign(앱=key) for (key, c), stats in sorted(self._classes.items()) if c == class_code]
+        if not parts:
+            return pd.DataFrame(columns=["앱", "미션", "현재 학생 수", "통과", "오답 수", "중앙 소요 시간(초)"])
+        table = pd.concat(parts, ignore_index=True)
+        return table[["앱"] + [c for c in table.columns if c != "앱"]]
+
+    def students(self, class_code, variant=None):
+        """반 학생 목록. variant를 주면 그 앱에 들어온 학생만."""
+        with self._lock:
+            return sorted({s for (key, c), stats in self._classes.items()
+                           if c == class_code and (variant is None or key == variant.key) for s in stats.students()})
+
+
+# 같은 서버 프로세스 안의 모든 앱/세션이 공유하는 집계
+default = Dashboard()
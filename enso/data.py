@@ -0,0 +1,132 @@
+import json
+import os
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+from enso import metrics
+
+# -----------------------
+# 데이터 파일 위치
+# -----------------------
+ROOT = Path(__file__).resolve().parent.parent
+DATA_FILE = ROOT / "oni_month_20250821.csv"
+REMOTE_URLS = [
+    "https://raw.githubusercontent.com/edukosm/enso_colab_course/main/oni_month_20250821.csv",
+    "https://raw.githubusercontent.com/edukosm/enso_colab_course/refs/heads/main/oni_month_20250821.csv",
+]
+
+# 환경 변수로 경로/원격 갱신 여부를 바꿀 수 있음
+PATH_ENV = "ENSO_DATA_PATH"
+REFRESH_ENV = "ENSO_DATA_REFRESH"
+
+# python -m enso.bundle로 만든 오프라인 번들 안에서는 bundle.json이 파일 위치를 알려준다
+BUNDLE_FILE = ROOT / "bundle.json"
+
+
+def bundle_config():
+    """오프라인 번들 설정 (번들 밖이면 빈 dict). 경로는 ROOT 기준 절대 경로로 바꿔 돌려준다."""
+    try:
+        conf = json.loads(BUNDLE_FILE.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return {k: ROOT / v for k, v in conf.items()}
+
+
+def data_path(path=None):
+    """사용할 CSV 경로 (인자 > 환경 변수 > 번들 > 저장소에 포함된 파일)."""
+    return Path(path or os.environ.get(PATH_ENV) or bundle_config().get("data") or DATA_FILE)
+
+
+def _meta_path(path):
+    return path.with_name(path.name + ".meta.json")
+
+
+def read_meta(path=None):
+    """마지막 원격 갱신 때 저장한 ETag/Last-Modified 정보."""
+    p = _meta_path(data_path(path))
+    if not p.exists():
+        return {}
+    try:
+        return json.loads(p.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def version(path=None):
+    """데이터 버전 문자열. 캐시 키로 사용한다."""
+    p = data_path(path)
+    meta = read_meta(p)
+    if meta.get("etag"):
+        return meta["etag"]
+    st_ = p.stat()
+    return f"{st_.st_size}-{int(st_.st_mtime)}"
+
+
+def refresh(path=None, urls=None, timeout=10, opener=urllib.request.urlopen):
+    """원격 CSV가 바뀌었을 때만 내려받는다. 새로 받았으면 True."""
+    p = data_path(path)
+    meta = read_meta(p) if p.exists() else {}
+    headers = {}
+    if meta.get("etag"):
+        headers["If-None-Match"] = meta["etag"]
+    if meta.get("last_modified"):
+        headers["If-Modified-Since"] = meta["last_modified"]
+
+    last_error = None
+    for u in urls or REMOTE_URLS:
+        try:
+            with opener(urllib.request.Request(u, headers=headers), timeout=timeout) as resp:
+                body = resp.read()
+                resp_headers = resp.headers
+        except urllib.error.HTTPError as e:
+            if e.code == 304:
+                return False
+            last_error = e
+            continue
+        except (OSError, ValueError) as e:
+            last_error = e
+            continue
+
+        # 임시 파일에 쓴 뒤 교체해서 읽는 도중의 워커가 깨진 파일을 보지 않게 한다
+        tmp = p.with_name(p.name + ".tmp")
+        tmp.write_bytes(body)
+        os.replace(tmp, p)
+        _meta_path(p).write_text(json.dumps({
+            "url": u,
+            "etag": resp_headers.get("ETag"),
+            "last_modified": resp_headers.get("Last-Modified"),
+        }), encoding="utf-8")
+        return True
+
+    if last_error is not None and not p.exists():
+        raise last_error
+    return False
+
+
+def refresh_requested():
+    return os.environ.get(REFRESH_ENV) == "1"
+
+
+def try_refresh(path=None):
+    """원격 갱신을 시도한다. 네트워크가 없어도 로컬 파일이 있으면 그대로 진행한다. 새로 받았으면 True."""
+    p = data_path(path)
+    try:
+        return refresh(p)
+    except (OSError, ValueError):
+        if not p.exists():
+            raise
+        return False
+
+
+def load_raw(path=None, refresh_remote=None):
+    """로컬 CSV를 먼저 읽고, 요청했을 때만 원격 갱신을 시도한다."""
+    p = data_path(path)
+    if refresh_remote is None:
+        refresh_remote = refresh_requested()
+    if refresh_remote:
+        try_refresh(p)
+    import pandas as pd  # 인트로 화면만 볼 때는 pandas를 불러오지 않는다
+
+    with metrics.span("read_csv"):
+        return pd.read_csv(p, encoding="utf-8-sig")
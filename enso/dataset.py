@@ -0,0 +1,419 @@
+import json
+import mmap
+import os
+import sys
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from enso import data, metrics, registry
+
+# -----------------------
+# 정규화된 데이터셋 아티팩트
+# -----------------------
+# CSV를 한 번만 파싱해서 컬럼별 바이너리 파일(c{i}.bin)로 저장하고, 이후에는 memmap으로 읽는다.
+# 새 달은 파일 끝에 덧붙이기만 하고(append), meta.json의 행 수와 버전을 올린다.
+# 여러 서버 프로세스가 같은 파일을 읽기 전용으로 memmap하므로 데이터는 OS 페이지 캐시에 한 벌만 올라간다.
+#
+# 저장소는 언제든 지우고 다시 만들 수 있는 캐시다. 그래서 enso.ingest로 덧붙인 달은 원본 CSV 옆의 기록 파일
+# (<CSV>.ingested.csv)에도 남기고, 다시 빌드할 때 CSV에 없는 달만 이어 붙인다.
+# enso.registry로 더한 시계열도 같은 이유로 <CSV>.series.json에 남기고 다시 빌드할 때 컬럼으로 붙인다.
+# 버전은 다시 빌드해도 이전 버전 + 1로 계속 올라가고, 빌드마다 새 build id를 붙인다.
+CACHE_ENV = "ENSO_CACHE_DIR"
+ARTIFACT_VERSION = 2
+DATE_WIDTH = 16
+
+DATE_FORMATS = ["%Y년 %m월", "%Y-%m", "%Y.%m", "%Y/%m"]
+INDEX_CANDIDATES = ["nino3.4 index", "ONI index", "Anomaly"]
+
+
+def cache_dir():
+    return Path(os.environ.get(CACHE_ENV) or data.ROOT / ".enso_cache")
+
+
+def store_dir(out=None):
+    return Path(out or cache_dir() / "dataset")
+
+
+def _parse_dates(s):
+    for fmt in DATE_FORMATS:
+        try:
+            return pd.to_datetime(s, format=fmt, errors="raise")
+        except Exception:
+            continue
+    return pd.to_datetime(s, errors="coerce")
+
+
+def pick_index_col(df):
+    for c in INDEX_CANDIDATES:
+        if c in df.columns:
+            return c
+    raise ValueError("지수 컬럼을 찾지 못했습니다. ('nino3.4 index', 'ONI index', 'Anomaly' 중 하나 필요)")
+
+
+def normalize(raw):
+    """원본 CSV 프레임을 날짜순으로 정렬된 타입 고정 프레임으로 바꾼다."""
+    with metrics.span("normalize"):
+        return _normalize(raw)
+
+
+def _normalize(raw):
+    df = raw.copy()
+    df.columns = df.columns.map(lambda c: str(c).replace("\ufeff", "").strip())
+    if "날짜" not in df.columns:
+        raise ValueError("CSV에 '날짜' 컬럼이 필요합니다.")
+    df["날짜"] = df["날짜"].astype(str).str.replace("\ufeff", "", regex=False).str.strip()
+
+    # 덧붙인 달 기록 파일은 읽은 날짜를 date 컬럼으로 같이 저장해 둔다 (원본마다 날짜 형식이 다를 수 있다)
+    df["date"] = pd.to_datetime(df["date"]) if "date" in df.columns else _parse_dates(df["날짜"])
+    df = df.dropna(subset=["date"]).sort_values("date", kind="stable")
+
+    values = [c for c in df.columns if c not in ("날짜", "date")]
+    out = pd.DataFrame({"날짜": df["날짜"].to_numpy(dtype=str), "date": df["date"].to_numpy()})
+    for c in values:
+        out[c] = pd.to_numeric(df[c], errors="coerce").to_numpy(dtype=np.float32)
+    out["Year"] = out["date"].dt.year.astype(np.int16)
+    out["Month"] = out["date"].dt.month.astype(np.int8)
+    out.index = pd.DatetimeIndex(out["date"].to_numpy())
+    out.attrs["index_col"] = pick_index_col(out)
+    return out
+
+
+def _column_dtype(arr):
+    # 문자열은 고정 폭으로 저장해야 뒤에 이어 붙일 수 있다 ("2025년 07월"은 9자)
+    if arr.dtype == object or arr.dtype.kind == "U":
+        return np.dtype(f"<U{max(DATE_WIDTH, arr.astype(str).dtype.itemsize // 4)}")
+    return arr.dtype
+
+
+def build(path=None, out=None):
+    """CSV를 읽어 아티팩트 디렉터리를 만들고 그 경로를 돌려준다."""
+    src = data.data_path(path)
+    df = with_ingested(normalize(data.load_raw(src, refresh_remote=False)), src)  # 갱신은 load()에서 이미 했다
+    df, added = with_series(df, src)
+    out = store_dir(out)
+    prev = _read_meta(out) or {}
+    version = prev.get("version", 0) + 1
+    tmp = out.with_name(out.name + ".tmp")
+    tmp.mkdir(parents=True, exist_ok=True)
+
+    columns = list(df.columns)
+    # 나중에 더한 시계열은 새 달에 값이 없어도 된다
+    base = [c for c in columns if c not in {e["column"] for e in added}]
+    dtypes = []
+    for i, c in enumerate(columns):
+        arr = df[c].to_numpy()
+        dtype = _column_dtype(arr)
+        np.ascontiguousarray(arr.astype(dtype)).tofile(tmp / f"c{i}.bin")
+        dtypes.append(dtype.str)
+    _write_meta(tmp, {
+        "artifact_version": ARTIFACT_VERSION,
+        "source": str(src),
+        "source_version": data.version(src),
+        "columns": columns,
+        "dtypes": dtypes,
+        "index_col": df.attrs["index_col"],
+        "series": registry.Registry.from_columns(value_columns(base)).to_meta() + added,
+        "required": [c for c in base if c not in ("date", "Year", "Month")],
+        "rows": len(df),
+        "version": version,
+        "build": uuid.uuid4().hex,
+        "segments": [{"version": version, "start": 0, "rows": len(df)}],
+    })
+
+    # 디렉터리를 통째로 교체해서 다른 워커가 반쯤 쓴 파일을 읽지 않게 한다
+    if out.exists():
+        old = out.with_name(out.name + ".old")
+        if old.exists():
+            _rmtree(old)
+        os.replace(out, old)
+        os.replace(tmp, out)
+        _rmtree(old)
+    else:
+        os.replace(tmp, out)
+    return out
+
+
+def journal_path(path=None):
+    """enso.ingest로 덧붙인 달의 기록 파일 (원본 CSV 옆)."""
+    p = data.data_path(path)
+    return p.with_name(p.name + ".ingested.csv")
+
+
+def read_journal(path=None):
+    """덧붙인 달 기록을 정규화한 프레임. 없으면 None."""
+    p = journal_path(path)
+    if not p.exists():
+        return None
+    return normalize(pd.read_csv(p, dtype={"날짜": str}, encoding="utf-8-sig"))
+
+
+def record_ingested(df, path=None):
+    """정규화된 새 행들을 기록 파일에 더한다. 같은 달이 이미 있으면 새 값으로 바꾼다."""
+    p = journal_path(path)
+    new = df.drop(columns=["Year", "Month"]).reset_index(drop=True)
+    old = read_journal(path)
+    if old is not None:
+        old = old.drop(columns=["Year", "Month"]).reset_index(drop=True)
+        new = pd.concat([old, new], ignore_index=True).drop_duplicates("date", keep="last").sort_values("date")
+    new = new.assign(date=new["date"].dt.strftime("%Y-%m-%d"))
+    tmp = p.with_name(p.name + ".tmp")
+    new.to_csv(tmp, index=False, encoding="utf-8")
+    os.replace(tmp, p)
+
+
+def with_ingested(df, path=None):
+    """CSV 프레임에 기록 파일의 달 중 CSV에 없는 달을 이어 붙인다. 같은 달이면 CSV 값이 우선이다."""
+    extra = read_journal(path)
+    if extra is None:
+        return df
+    extra = extra.loc[~extra["date"].isin(df["date"])].reindex(columns=df.columns)
+    if extra.empty:
+        return df
+    out = pd.concat([df, extra]).sort_values("date", kind="stable")
+    for c in df.columns:
+        out[c] = out[c].astype(df[c].dtype)
+    out.attrs["index_col"] = df.attrs["index_col"]
+    return out
+
+
+def series_path(path=None):
+    """enso.registry로 더한 시계열의 기록 파일 (원본 CSV 옆)."""
+    p = data.data_path(path)
+    return p.with_name(p.name + ".series.json")
+
+
+def read_series(path=None):
+    """더한 시계열 기록 [{"series": Series dict, "values": {"YYYY-MM": 값 또는 None}}]. 없으면 빈 목록."""
+    try:
+        return json.loads(series_path(path).read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return []
+
+
+def record_series(series, dates, values, path=None):
+    """더한 시계열(Series dict)과 CSV의 (날짜, 값)을 기록 파일에 더한다. 저장소 범위 밖의 달도 남겨 둔다."""
+    p = series_path(path)
+    months = pd.DatetimeIndex(dates).strftime("%Y-%m")
+    entry = {"series": series, "values": {m: (None if np.isnan(v) else float(v)) for m, v in zip(months, values)}}
+    entries = [e for e in read_series(path) if e["series"]["column"] != series["column"]] + [entry]
+    tmp = p.with_name(p.name + ".tmp")
+    tmp.write_text(json.dumps(entries, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp, p)
+
+
+def with_series(df, path=None):
+    """기록해 둔 시계열을 프레임의 달에 맞춰 컬럼으로 붙인다. (프레임, 붙인 Series dict 목록)
+
+    기록에 없는 달(나중에 enso.ingest로 덧붙인 달)은 덧붙인 달 기록의 값을 쓴다. CSV에 이미 있는 컬럼은 건너뛴다.
+    """
+    entries = [e for e in read_series(path) if e["series"]["column"] not in df.columns]
+    if not entries:
+        return df, []
+    months = df["date"].dt.strftime("%Y-%m")
+    journal = read_journal(path)
+    df = df.copy()
+    for e in entries:
+        col = e["series"]["column"]
+        values = pd.Series(e["values"], dtype=np.float64).reindex(months).to_numpy()
+        if journal is not None and col in journal.columns:
+            extra = journal.set_index("date")[col].reindex(df["date"]).to_numpy(dtype=np.float64)
+            values = np.where(np.isnan(values), extra, values)
+        df[col] = values.astype(np.float32)
+    return df, [e["series"] for e in entries]
+
+
+@contextmanager
+def lock(out=None):
+    """저장소를 쓰는 쪽(빌드, 덧붙이기, 컬럼 추가)끼리 프로세스 간에 줄을 세운다.
+
+    여러 워커가 동시에 떠도 한 프로세스만 빌드하고 나머지는 기다렸다가 결과를 연다.
+    같은 프로세스 안에서 다시 잡으면 멈추므로 바깥쪽 호출에서 한 번만 잡는다. fcntl이 없으면(Windows) 잠그지 않는다.
+    """
+    out = store_dir(out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    with open(out.with_name(out.name + ".lock"), "w") as f:
+        try:
+            import fcntl
+        except ImportError:
+            yield
+            return
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def _rmtree(p):
+    for f in p.iterdir():
+        f.unlink()
+    p.rmdir()
+
+
+def _write_meta(out, meta):
+    tmp = out / "meta.json.tmp"
+    tmp.write_text(json.dumps(meta, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp, out / "meta.json")
+
+
+def _read_meta(out):
+    try:
+        return json.loads((out / "meta.json").read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def read_meta(out=None):
+    """저장소의 meta.json (없으면 None). 버전 확인용이라 열 파일은 건드리지 않는다."""
+    return _read_meta(store_dir(out))
+
+
+def stamp(out=None):
+    """meta.json의 수정 시각(ns). 매 rerun마다 불러도 될 만큼 싸다. 없으면 None."""
+    try:
+        return os.stat(store_dir(out) / "meta.json").st_mtime_ns
+    except OSError:
+        return None
+
+
+def is_fresh(path=None, out=None):
+    out = store_dir(out)
+    meta = _read_meta(out)
+    src = data.data_path(path)
+    return (
+        meta is not None
+        and meta.get("artifact_version") == ARTIFACT_VERSION
+        and meta.get("source") == str(src)
+        and meta.get("source_version") == data.version(src)
+    )
+
+
+def open_store(out, meta):
+    """meta의 행 수만큼만 memmap으로 연다. 뒤에 덧붙는 중인 바이트는 보이지 않는다."""
+    cols = {}
+    for i, (c, dtype) in enumerate(zip(meta["columns"], meta["dtypes"])):
+        if meta["rows"]:
+            cols[c] = np.memmap(out / f"c{i}.bin", dtype=np.dtype(dtype), mode="r", shape=(meta["rows"],))
+        else:
+            cols[c] = np.empty(0, dtype=np.dtype(dtype))
+    df = pd.DataFrame(cols, copy=False)
+    df.index = pd.DatetimeIndex(cols["date"])
+    df.attrs["index_col"] = meta["index_col"]
+    df.attrs["version"] = meta["version"]
+    df.attrs["build"] = meta.get("build")
+    # 시계열 목록이 없는 예전 저장소는 컬럼 이름으로 추측한다
+    series = meta.get("series") or registry.Registry.from_columns(value_columns(meta["columns"])).to_meta()
+    df.attrs["series"] = series
+    return df
+
+
+def load(path=None, out=None):
+    """아티팩트를 memmap으로 연다. 없거나 원본이 바뀌었으면 먼저 빌드한다.
+
+    ENSO_DATA_REFRESH=1이면 저장소가 있어도 먼저 원격 CSV 갱신을 확인한다 (바뀌었으면 새 CSV로 다시 빌드).
+    """
+    out = store_dir(out)
+    if data.refresh_requested():
+        with lock(out):  # 여러 워커가 같은 CSV 파일을 동시에 바꾸지 않도록
+            data.try_refresh(path)
+    if not is_fresh(path, out):
+        with lock(out):
+            if not is_fresh(path, out):  # 기다리는 동안 다른 워커가 만들었으면 그대로 쓴다
+                build(path, out)
+    return open_store(out, _read_meta(out))
+
+
+def append(df, out=None):
+    """정규화된 새 행들을 저장소 끝에 덧붙이고 데이터셋 버전을 올린다. 새 meta를 돌려준다.
+
+    호출하는 쪽이 lock(out)을 잡고 부른다. 열 파일에 바이트를 먼저 붙인 뒤 meta.json을 교체하므로, 그 사이에 읽는 쪽은
+    이전 행 수까지만 본다. 중간에 멈췄다면 다음 append가 meta 기준으로 잘라낸다.
+    """
+    out = store_dir(out)
+    meta = _read_meta(out)
+    if meta is None:
+        raise ValueError(f"저장소가 없습니다: {out} (먼저 python -m enso.dataset 실행)")
+    if list(df.columns) != meta["columns"]:
+        raise ValueError(f"컬럼이 저장소와 다릅니다: {list(df.columns)}")
+
+    rows = meta["rows"]
+    for i, dtype in enumerate(meta["dtypes"]):
+        dtype = np.dtype(dtype)
+        arr = df.iloc[:, i].to_numpy()
+        if dtype.kind == "U" and len(arr) and max(len(str(x)) for x in arr) > dtype.itemsize // 4:
+            raise ValueError(f"'{meta['columns'][i]}' 값이 저장 폭({dtype.itemsize // 4}자)보다 깁니다.")
+        with open(out / f"c{i}.bin", "r+b" if rows else "wb") as f:
+            f.truncate(rows * dtype.itemsize)
+            f.seek(0, os.SEEK_END)
+            np.ascontiguousarray(arr.astype(dtype)).tofile(f)
+
+    meta["version"] += 1
+    meta["rows"] = rows + len(df)
+    meta["segments"].append({"version": meta["version"], "start": rows, "rows": len(df)})
+    _write_meta(out, meta)
+    return meta
+
+
+def add_column(out, name, values, series=None):
+    """저장소에 컬럼 하나를 더한다. 다른 컬럼 파일은 건드리지 않고 meta.json만 교체한다.
+
+    호출하는 쪽이 lock(out)을 잡고 부른다.
+    """
+    out = store_dir(out)
+    meta = _read_meta(out)
+    if len(values) != meta["rows"]:
+        raise ValueError(f"행 수가 저장소({meta['rows']})와 다릅니다: {len(values)}")
+    arr = np.ascontiguousarray(np.asarray(values, dtype=np.float32))
+    i = len(meta["columns"])
+    arr.tofile(out / f"c{i}.bin")
+    meta["columns"].append(name)
+    meta["dtypes"].append(arr.dtype.str)
+    if series is not None:
+        meta["series"] = series
+    meta["version"] += 1
+    meta["segments"].append({"version": meta["version"], "start": meta["rows"], "rows": 0, "column": name})
+    _write_meta(out, meta)
+    return meta
+
+
+def _mapped(arr):
+    # base를 따라 올라가 memmap(mmap)에서 온 배열인지 본다
+    while isinstance(arr, np.ndarray):
+        if isinstance(arr, np.memmap):
+            return True
+        arr = arr.base
+    return isinstance(arr, mmap.mmap)
+
+
+def memory(df):
+    """프레임 컬럼의 메모리: 저장소 파일을 memmap으로 공유하는 바이트와 이 프로세스만 가진 복사본 바이트."""
+    shared = private = 0
+    for c in df.columns:
+        arr = df[c].to_numpy()
+        if _mapped(arr):
+            shared += arr.nbytes
+        else:
+            private += int(df[c].memory_usage(index=False, deep=True))
+    return {"shared_bytes": shared, "private_bytes": private}
+
+
+def value_columns(columns):
+    return [c for c in columns if c not in ("날짜", "date", "Year", "Month")]
+
+
+def display_frame(df, col=None):
+    """미션 2~4에서 쓰는 (날짜, 지수, date, Year, Month) 프레임. col을 주면 그 컬럼을 "지수"로."""
+    col = col or df.attrs["index_col"]
+    return df[["날짜", col, "date", "Year", "Month"]].rename(columns={col: "지수"})
+
+
+if __name__ == "__main__":
+    # python -m enso.dataset [CSV 경로]
+    src = sys.argv[1] if len(sys.argv) > 1 else None
+    if data.refresh_requested():
+        data.try_refresh(src)
+    print(build(src))
@@ -0,0 +1,747 @@
+import functools
+import sys
+import threading
+import time
+import uuid
+
+import streamlit as st
+
+from enso import bundle, dashboard, lazy, metrics, progress, teacher, variants
+from enso.variants import INDEX, SST
+
+# 데이터/그래프 모듈은 미션 화면에서 처음 쓸 때 불러온다 (warm_up이 인트로 동안 미리 불러 둔다)
+pd = lazy.module("pandas")
+px = lazy.module("plotly.express")
+analog = lazy.module("enso.analog")
+assign = lazy.module("enso.assign")
+dataset = lazy.module("enso.dataset")
+events = lazy.module("enso.events")
+extrema = lazy.module("enso.extrema")
+figures = lazy.module("enso.figures")
+grid = lazy.module("enso.grid")
+lod = lazy.module("enso.lod")
+oni = lazy.module("enso.oni")
+query = lazy.module("enso.query")
+registry = lazy.module("enso.registry")
+trend = lazy.module("enso.trend")
+
+# -----------------------
+# 미션 엔진
+# -----------------------
+# enso.variants에 선언된 Variant를 받아 화면을 그린다. 데이터, 그래프 캐시, 진행 저장소는
+# 이 모듈의 cache_resource에 한 번만 올라가므로 여러 페이지/앱이 같은 프로세스에서 공유한다.
+SST_COL = "nino3.4 수온 평균"
+ONI_COL = "ONI index"
+DEFAULT_MONTH = 8
+MONTH_CHARTS = ("month_line", "trend")  # 월을 고르는 그래프
+TREND_CHARTS = ("trend", "trend_months")  # 부트스트랩 재표본 수를 고르는 그래프
+ANALOG_CHART = "analog"  # 유사 사례 예측 (연도 범위 대신 기간 길이, 사례 수, 끝 달을 고른다)
+
+dash = dashboard.default
+
+
+class Context:
+    """한 번 로드한 데이터셋과 그 위의 조회 구조."""
+
+    def __init__(self, df, prev=None):
+        """prev는 같은 저장소에 새 달이 붙기 전의 Context다. 주면 ONI를 새 달만큼만 이어서 계산한다."""
+        self.df_q = query.YearIndex(df)
+        self.index_col = df.attrs["index_col"]
+        self.series = registry.Registry.from_meta(df.attrs["series"]) if "series" in df.attrs \
+            else registry.Registry.from_columns(dataset.value_columns(df.columns))
+        self._views = {}
+        self._analogs = {}
+        self.display_q, self.lod = self.view(self.index_col)
+        self.ext = extrema.RangeExtrema(df)
+        self.version = df.attrs.get("version")
+        self.build = df.attrs.get("build")
+        # 캐시 키: 다른 워커가 저장소를 다시 빌드하면 build가 바뀐다
+        self.data_id = (self.build, self.version)
+        self.rows = len(df)
+        self.min_year = self.display_q.min_year
+        self.max_year = self.display_q.max_year
+
+        # 수온 컬럼이 있으면 ONI를 직접 다시 계산한다 (기준 기간/끝 달 처리는 ENSO_ONI_BASE, ENSO_ONI_PARTIAL)
+        self.oni = None
+        self._oni_stream = None
+        if SST_COL in df.columns:
+            base, min_periods = oni.settings()
+            if prev is not None and prev.oni is not None and base is not None and min_periods == oni.WINDOW:
+                # 증분 계산기(oni.Stream)는 처음 새 달이 붙을 때 한 번 채우고, 이후에는 다음 Context로 넘겨준다
+                stream = prev._oni_stream or oni.Stream.from_frame(prev.df_q.df, base=base)
+                self.oni = oni.extend(prev.oni, df, stream)
+                if self.oni is not None:
+                    self._oni_stream, prev._oni_stream = stream, None
+            if self.oni is None:
+                self.oni = oni.frame(df, base=base, min_periods=min_periods)
+
+        # 엘니뇨/라니냐 사건 표 (ONI가 없으면 지수 컬럼으로 대신 판정)
+        if self.oni is not None:
+            event_values = self.oni[ONI_COL].to_numpy()
+        else:
+            event_values = df[ONI_COL if ONI_COL in df.columns else self.index_col].to_numpy()
+        self.episodes = pd.DataFrame(events.table(df["date"].to_numpy(), event_values))
+
+    def view(self, col):
+        """col을 "지수"로 둔 (연도 조회, 점 줄이기 피라미드). 컬럼마다 처음 쓸 때 만든다."""
+        if col not in self._views:
+            q = query.YearIndex(dataset.display_frame(self.df_q.df, col))
+            self._views[col] = (q, lod.Pyramid(q.df["지수"].to_numpy()))
+        return self._views[col]
+
+    def analog(self, col, window):
+        """col의 window개월 유사 사례 색인 (enso.analog). 처음 쓸 때 만들고, 새 달이 들어오면 carry_analogs가 이어 붙인다."""
+        key = (col, window)
+        if key not in self._analogs:
+            with metrics.span("analog_build"):
+                self._analogs[key] = analog.AnalogIndex(self.df_q.df[col].to_numpy(), window)
+        return self._analogs[key]
+
+    def carry_analogs(self, old):
+        # 이전 데이터의 색인을 새 행까지 늘려 쓴다 (트리는 그대로 두고 새 기간만 꼬리에)
+        for (col, window), index in list(old._analogs.items()):
+            if col in self.df_q.df.columns:
+                with metrics.span("analog_extend"):
+                    self._analogs[(col, window)] = index.extended(self.df_q.df[col].to_numpy())
+
+    def column(self, name):
+        # "sst"/"index"는 기존 이름, 그 밖에는 enso.registry의 시계열 키
+        if name == SST:
+            return SST_COL
+        if name == INDEX:
+            return self.index_col
+        return self.series.column(name, name)
+
+    def label(self, col, default):
+        s = self.series.by_column(col)
+        if s is None or col == SST_COL:
+            return default
+        return f"{s.label}({s.unit})" if s.unit else s.label
+
+
+class LiveData:
+    """저장소에 새 달이 덧붙으면(python -m enso.ingest) 다음 rerun에서 바꿔 끼운다.
+
+    CSV를 다시 읽지 않고 memmap만 새 행 수로 다시 열며, 그래프 캐시는 새 달이 들어가는 항목만 지운다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stamp = dataset.stamp()
+        self.ctx = Context(dataset.load())
+        # 저장소 파일을 공유하는 바이트와 이 워커만 가진 복사본 바이트
+        metrics.gauge("dataset_memory", lambda: dataset.memory(self.ctx.df_q.df))
+
+    def current(self):
+        stamp = dataset.stamp()
+        if stamp == self._stamp:
+            return self.ctx
+        with self._lock:
+            if stamp != self._stamp:
+                meta = dataset.read_meta()
+                if meta is not None and (meta.get("build"), meta.get("version")) != self.ctx.data_id:
+                    self._swap(meta)
+                self._stamp = stamp
+        return self.ctx
+
+    def _swap(self, meta):
+        with metrics.span("data_update"):
+            old = self.ctx
+            rebuilt = meta.get("build") != old.build
+            self.ctx = Context(dataset.open_store(dataset.cache_dir() / "dataset", meta), prev=None if rebuilt else old)
+            self.ctx.carry_analogs(old)
+        metrics.count("data.update")
+        if rebuilt or self.ctx.rows < old.rows:
+            figure_cache().clear()  # 다시 빌드된 저장소
+            return
+        new = self.ctx.df_q.df.iloc[old.rows:]
+        if new.empty:
+            return  # 컬럼(시계열)만 더해졌으면 기존 그래프는 그대로 쓸 수 있다
+        first_year = int(new["Year"].min())
+        months = set(new["Month"].tolist())
+
+        def affected(key):
+            # 키: (앱, 미션, 컬럼[, 연도 범위[, 월]]) - 연도 범위가 없는 것은 전체 구간 그림
+            if len(key) < 4:
+                return True
+            yr, month = key[3], key[4] if len(key) > 4 else None
+            return yr[1] >= first_year and (month is None or month in months)
+
+        figure_cache().invalidate(affected)
+
+
+@st.cache_resource(show_spinner=True)
+def live_data():
+    # 정규화된 아티팩트를 memmap으로 열고, 원본 CSV가 바뀌었을 때만 다시 빌드
+    metrics.count("cache.load_data.miss")
+    with metrics.span("load_data"):
+        live = LiveData()
+    # 오프라인 번들이면 미리 그려 둔 기본 화면 그래프를 캐시에 넣어 둔다
+    bundle.preload(figure_cache(), live.ctx)
+    return live
+
+
+def load_data():
+    return live_data().current()
+
+
+@st.cache_resource
+def figure_cache():
+    # 모든 세션이 같이 쓰는 그래프 캐시 (LRU, 최대 128개)
+    figs = figures.FigureCache(maxsize=128)
+    metrics.gauge("figure_cache", figs.stats)
+    return figs
+
+
+@st.cache_resource(max_entries=2)
+def grid_data(data_id):
+    # 데이터셋 버전이 바뀌면(새 달 추가) 예시 격자도 다시 만든다. 타일 캐시는 GridStore마다 따로
+    store = grid.load()
+    metrics.gauge("grid_cache", store.stats)
+    return store
+
+
+@st.cache_resource
+def trend_cache():
+    # 모든 세션이 같이 쓰는 추세 결과 캐시. 같은 질문이 동시에 들어오면 한 번만 계산한다
+    cache = trend.Cache(maxsize=256)
+    metrics.gauge("trend_cache", cache.stats)
+    return cache
+
+
+def trend_results(ctx, col, yr, resamples, month=None):
+    """{월: trend.bootstrap 결과}. month를 주면 그 달만, 없으면 12달 모두."""
+    months = [month] if month is not None else list(range(1, 13))
+
+    def compute():
+        with metrics.span("trend_bootstrap"):
+            return trend.monthly(ctx.df_q, col, yr, resamples, months=months)
+
+    return trend_cache().get((ctx.data_id, col, month, tuple(yr), resamples), compute)
+
+
+@st.cache_resource(max_entries=2)
+def answer_key(data_id, _ctx):
+    # 데이터셋 버전마다 한 번, 모든 앱의 학생별 과제 후보 정답을 한꺼번에 구해 둔다
+    with metrics.span("answer_key"):
+        key = assign.AnswerKey(_ctx, variants.VARIANTS.values(), MONTH_CHARTS)
+    metrics.gauge("answer_key", lambda: {"size": len(key)})
+    return key
+
+
+def current_answer_key():
+    ctx = load_data()
+    return answer_key(ctx.data_id, ctx)
+
+
+def student_task(ctx, variant, mission):
+    """이 학생의 과제 (월 또는 None, 연도 범위). 학생별 과제가 없는 앱/미션이면 None."""
+    if not variant.assign:
+        return None
+    return answer_key(ctx.data_id, ctx).task(variant, mission, who())
+
+
+@st.cache_resource
+def progress_store():
+    return progress.open_store()
+
+
+def default_views(ctx, cache=None, current=None):
+    """모든 앱의 미션 기본 화면(전체 연도, 기본 월) 그래프를 만들어 캐시에 넣는다.
+
+    current()가 거짓이 되면(도중에 새 달이 들어와 ctx가 바뀌면) 옛 데이터로 더 그리지 않는다.
+    """
+    yr = (ctx.min_year, ctx.max_year)
+    for variant in variants.VARIANTS.values():
+        for mission in variant.missions:
+            if current is not None and not current():
+                return
+            if mission.chart == ANALOG_CHART:
+                # 유사 사례 그래프는 학생이 고른 기간마다 달라서 색인만 미리 만든다
+                ctx.analog(ctx.column(mission.series[0] if mission.series else mission.column), analog.DEFAULT_WINDOW)
+                continue
+            month = DEFAULT_MONTH if mission.chart in MONTH_CHARTS else None
+            build_figure(ctx, variant, mission, yr, month, cache=cache)
+
+
+_warm_lock = threading.Lock()
+_warm_thread = None
+
+
+def warm_up():
+    """학생이 인트로/로그인 화면을 읽는 동안 모듈, 데이터, 기본 화면 그래프를 백그라운드에서 준비한다.
+
+    프로세스마다 한 번만 돈다. 실패해도 미션 화면이 같은 일을 다시 하므로 무시한다.
+    브라우저(stlite/Pyodide)에서는 스레드를 띄울 수 없고, 그 자리에서 하면 인트로가 늦어지므로 건너뛴다.
+    """
+    global _warm_thread
+    if sys.platform == "emscripten":
+        return
+    with _warm_lock:
+        if _warm_thread is not None:
+            return
+        _warm_thread = threading.Thread(target=_warm, name="enso-warm-up", daemon=True)
+        try:
+            _warm_thread.start()
+        except RuntimeError:  # 스레드를 더 만들 수 없는 환경
+            metrics.count("warm_up.error")
+
+
+def _warm():
+    try:
+        with metrics.span("warm_up"):
+            ctx = load_data()
+            default_views(ctx, current=lambda: load_data() is ctx)
+            answer_key(ctx.data_id, ctx)
+            grid_data(ctx.data_id)
+    except Exception:
+        metrics.count("warm_up.error")
+
+
+# -----------------------
+# 세션 상태
+# -----------------------
+def init_state(variant):
+    # 다른 페이지(Variant)에서 넘어오면 그 페이지의 저장된 진행 상황으로, 없으면 처음부터 시작한다
+    if st.session_state.get("variant") == variant.key:
+        return
+    st.session_state.variant = variant.key
+    st.session_state.mission = variant.first_mission
+    st.session_state.codes = []  # 암호 문자 저장
+    st.session_state.start_time = None if variant.intro else time.time()
+    st.session_state.end_time = None
+    st.session_state.finished = False
+    for n in range(1, len(variant.missions) + 1):
+        st.session_state.pop(f"q{n}_correct", None)
+    st.session_state.pop("tracked", None)
+    store = progress_store()
+    if store is not None and "student" in st.session_state:
+        saved = store.load(*st.session_state.student, variant.key)
+        if saved is not None:
+            progress.restore(saved, st.session_state)
+
+
+def who():
+    # (반 코드, 학생) - 로그인하지 않았으면 세션마다 임시 ID
+    if "student" in st.session_state:
+        return st.session_state.student
+    if "sid" not in st.session_state:
+        st.session_state.sid = uuid.uuid4().hex[:8]
+    return ("-", st.session_state.sid)
+
+
+def save_progress():
+    store = progress_store()
+    if store is not None and "student" in st.session_state:
+        store.save(progress.snapshot(st.session_state, *st.session_state.student, st.session_state.variant))
+
+
+def login(variant):
+    """ENSO_PROGRESS_DB가 설정되어 있으면 반 코드/학생 ID를 받고 저장된 진행 상황을 불러온다."""
+    store = progress_store()
+    if store is None or "student" in st.session_state:
+        return True
+    with st.form("login_form"):
+        class_code = st.text_input("반 코드")
+        student_id = st.text_input("이름 또는 번호")
+        entered = st.form_submit_button("시작 / 이어하기")
+    if entered and class_code.strip() and student_id.strip():
+        st.session_state.student = (class_code.strip(), student_id.strip())
+        saved = store.load(*st.session_state.student, variant.key)
+        if saved is not None:
+            progress.restore(saved, st.session_state)
+        elif not variant.intro:
+            st.session_state.start_time = time.time()
+        save_progress()
+        st.rerun()
+    return False
+
+
+def advance(variant, mission):
+    now = time.time()
+    nxt = mission.number + 1
+    st.session_state.codes.append(mission.code)
+    dash.complete(variant, *who(), mission.number, nxt, now)
+    st.session_state.mission = nxt
+    if nxt == variant.done_mission:
+        st.session_state.end_time = now
+    save_progress()
+    st.rerun()
+
+
+# -----------------------
+# 미션 화면
+# -----------------------
+# 그래프 영역과 정답 폼은 각각 fragment라서 슬라이더를 움직이거나 정답을 제출해도
+# 해당 부분만 다시 실행된다. 정답 입력은 form이라 타이핑 중에는 재실행되지 않는다.
+def widget_key(variant, mission, name):
+    return f"{variant.key}_m{mission.number}_{name}"
+
+
+def show_chart(fig):
+    with metrics.span("plotly_chart"):
+        st.plotly_chart(fig, use_container_width=True)
+
+
+def mission_column(ctx, variant, mission):
+    # 비교할 시계열(mission.series)이 있으면 학생이 고른 것, 없으면 미션의 컬럼
+    if mission.series:
+        key = st.session_state.get(widget_key(variant, mission, "series"), mission.series[0])
+        return ctx.column(key)
+    return ctx.column(mission.column)
+
+
+def build_figure(ctx, variant, mission, yr, month, cache=None, col=None, resamples=None):
+    cache = cache or figure_cache()
+    col = col or ctx.column(mission.column)
+    if mission.chart in TREND_CHARTS:
+        resamples = resamples or trend.DEFAULT_RESAMPLES
+        results = trend_results(ctx, col, yr, resamples, month if mission.chart == "trend" else None)
+
+        def build_trend():
+            if mission.chart == "trend_months":
+                return figures.trend_bars(results, mission.chart_title)
+            frame = ctx.df_q.select(yr, month=month)
+            return figures.trend_line(frame["Year"].to_numpy(), frame[col].to_numpy(), results[month],
+                                      mission.chart_title.format(month=month), ctx.label(col, "수온 평균(°C)"))
+
+        return cache.get((variant.key, mission.number, col, yr, month, resamples), build_trend)
+    if mission.chart == "index_line":
+        frame, pyramid = ctx.view(col)
+        return figures.index_view(
+            cache, (variant.key, mission.number, col), frame.df, yr, mission.chart_title,
+            labels=mission.thresholds, y_range=list(mission.y_range) if mission.y_range else None,
+            episodes=ctx.episodes if mission.episodes else None, pyramid=pyramid,
+        )
+
+    def build():
+        if mission.chart == "month_line":
+            frame = ctx.df_q.select(yr, month=month)
+            fig = px.line(frame, x="date", y=col,
+                          labels={col: ctx.label(col, "수온 평균(°C)"), "date": "날짜"},
+                          title=mission.chart_title.format(month=month))
+            if mission.markers:
+                fig.update_traces(mode="lines+markers")
+            if mission.y_pad is not None:
+                fig.update_layout(yaxis=dict(range=[frame[col].min() - mission.y_pad, frame[col].max() + mission.y_pad]))
+            return fig
+
+        fig = px.line(ctx.ext.yearly(col, "min", yr, name="지수"), x="Year", y="지수",
+                      title=mission.chart_title, markers=mission.markers)
+        if mission.threshold_lines:
+            figures.add_thresholds(fig, mission.thresholds)
+        if mission.y_range:
+            fig.update_yaxes(range=list(mission.y_range))
+        return fig
+
+    return cache.get((variant.key, mission.number, col, yr, month), build)
+
+
+@st.fragment
+def mission_chart(ctx, variant, mission):
+    with metrics.scope(f"mission{mission.number}.chart"):
+        # 학생별 과제가 있으면 그 월과 연도 범위로 시작한다
+        task = student_task(ctx, variant, mission)
+        if task is not None:
+            st.info(f"🎯 나의 과제: {task[1][0]}~{task[1][1]}년" + (f", {task[0]}월" if task[0] else ""))
+        month = None
+        if mission.chart in MONTH_CHARTS:
+            months = list(range(1, 13))
+            month = st.selectbox("📅 분석할 월을 선택하세요", months,
+                                 index=(task[0] if task and task[0] else DEFAULT_MONTH) - 1,
+                                 key=widget_key(variant, mission, "month"))
+        if mission.series:
+            choices = [k for k in mission.series if k in ctx.series]
+            st.selectbox("🌏 비교할 지역/지수", choices, format_func=lambda k: ctx.series.get(k).label,
+                         key=widget_key(variant, mission, "series"))
+        if mission.chart == ANALOG_CHART:
+            analog_view(ctx, variant, mission)
+            return
+        yr = st.slider("연도 범위 선택", ctx.min_year, ctx.max_year,
+                       task[1] if task else (ctx.min_year, ctx.max_year), key=widget_key(variant, mission, "range"))
+        resamples = None
+        if mission.chart in TREND_CHARTS:
+            resamples = st.selectbox("🔁 부트스트랩 재표본 수", trend.RESAMPLES, format_func=lambda n: f"{n:,}개",
+                                     key=widget_key(variant, mission, "resamples"))
+
+        col = mission_column(ctx, variant, mission)
+        if col not in ctx.df_q.df.columns:
+            st.error(f"컬럼 '{col}'이 없습니다.")
+            st.stop()
+        if ctx.display_q.select(yr).empty:
+            st.warning("선택한 기간에 데이터가 없습니다.")
+            return
+
+        show_chart(build_figure(ctx, variant, mission, yr, month, col=col, resamples=resamples))
+        if mission.chart == "trend":
+            res = trend_results(ctx, col, yr, resamples, month).get(month)
+            if res is None:
+                st.warning("선택한 기간에 값이 너무 적어 추세를 구할 수 없습니다.")
+            else:
+                st.write(f"추세 **{res['slope'] * 10:+.3f}°C/10년**, 95% 신뢰구간 "
+                         f"{res['low'] * 10:+.3f} ~ {res['high'] * 10:+.3f}°C/10년 "
+                         f"(p = {res['p']:.3f}, {res['n']}개 연도, 블록 {res['block']}년, 재표본 {res['n_resamples']:,}개)")
+        if mission.show_table:
+            st.dataframe(ctx.ext.yearly(col, "min", yr, name="지수"))
+
+        # 월에 따라 바뀌는 질문은 그래프와 같이 다시 그린다
+        if mission.input_label and "{month}" in mission.question:
+            st.markdown("#### 질문")
+            st.write(mission.question.format(month=month))
+
+
+def month_labels(ctx, positions):
+    df = ctx.df_q.df
+    years, months = df["Year"].to_numpy()[positions], df["Month"].to_numpy()[positions]
+    return [f"{y}년 {m:02d}월" for y, m in zip(years.tolist(), months.tolist())]
+
+
+def analog_query(ctx, variant, mission):
+    """학생이 고른 기간 길이, 사례 수, 끝 달로 찾은 유사 사례 (analog.AnalogIndex.query 결과).
+
+    고를 달이 없으면 None, 고른 기간에 빈 값이 있으면 ValueError.
+    """
+    col = mission_column(ctx, variant, mission)
+    ends = analog.choices(ctx.df_q.df[col].to_numpy())
+    if not len(ends):
+        return None
+    window = st.session_state.get(widget_key(variant, mission, "window"), analog.DEFAULT_WINDOW)
+    k = st.session_state.get(widget_key(variant, mission, "k"), analog.DEFAULT_K)
+    end = st.session_state.get(widget_key(variant, mission, "end"), int(ends[-1]))
+    with metrics.span("analog_query"):
+        return ctx.analog(col, window).query(end, k, analog.HORIZON)
+
+
+def analog_view(ctx, variant, mission):
+    """고른 기간과 비슷했던 과거 기간들, 그리고 그 뒤 HORIZON개월의 흐름."""
+    col = mission_column(ctx, variant, mission)
+    if col not in ctx.df_q.df.columns:
+        st.error(f"컬럼 '{col}'이 없습니다.")
+        st.stop()
+    positions = analog.choices(ctx.df_q.df[col].to_numpy())
+    ends = positions.tolist()
+    if not ends:
+        st.warning("비교할 기간을 만들 만큼 데이터가 없습니다.")
+        return
+    c1, c2 = st.columns(2)
+    c1.select_slider("🪟 비교할 기간 길이(개월)", analog.WINDOWS, value=analog.DEFAULT_WINDOW,
+                     key=widget_key(variant, mission, "window"))
+    c2.slider("🔎 찾을 과거 사례 수", 3, 30, analog.DEFAULT_K, key=widget_key(variant, mission, "k"))
+    names = dict(zip(ends, month_labels(ctx, positions)))
+    st.select_slider("📅 기간의 마지막 달", ends, value=ends[-1], format_func=names.get,
+                     key=widget_key(variant, mission, "end"))
+    try:
+        result = analog_query(ctx, variant, mission)
+    except ValueError as e:
+        st.warning(str(e))
+        return
+    labels = month_labels(ctx, result["ends"])
+    show_chart(figures.analog_paths(result, labels, mission.chart_title.format(horizon=analog.HORIZON),
+                                    ctx.label(col, "지수"), mission.thresholds))
+    if not labels:
+        st.warning("뒤따르는 기록이 있는 과거 기간이 없습니다.")
+        return
+    st.dataframe(pd.DataFrame({
+        "끝난 달": labels,
+        "거리": result["dist"].round(3),
+        f"{analog.HORIZON}개월 뒤": result["outcome"].round(2),
+    }), hide_index=True)
+
+
+@st.fragment
+def mission_map(ctx, variant, mission):
+    """열대 태평양 수온 편차 지도. 달을 옮기면 그 달의 타일만 읽고 이 부분만 다시 그린다."""
+    with metrics.scope(f"mission{mission.number}.map"):
+        try:
+            store = grid_data(ctx.data_id)
+        except ValueError as e:
+            st.warning(f"수온 지도를 만들 수 없습니다. {e}")
+            return
+        # 예시 격자는 관측 지도로 오해하지 않도록 제목과 그림에 예시라고 적는다
+        sample = " (예시: 합성 자료)" if store.sample else ""
+        st.markdown(f"#### 🗺️ 열대 태평양 수온 편차 지도{sample}")
+        if store.sample:
+            st.info("이 지도는 관측 자료가 아닙니다. Niño3.4 평균 편차에 엘니뇨 공간 모양을 곱해 만든 예시입니다. "
+                    "실제 격자 자료는 `python -m enso.grid import 파일.nc`로 가져올 수 있습니다.")
+        # 튜플을 값으로 주면 구간 슬라이더가 되므로 달 순서 번호로 고른다
+        months = store.months()
+        t = st.select_slider("지도에서 볼 달", range(len(months)), value=len(months) - 1,
+                             format_func=lambda i: f"{months[i][0]}년 {months[i][1]:02d}월",
+                             key=widget_key(variant, mission, "map_month"))
+        year, month = months[t]
+        view = st.radio("보기", list(grid.VIEWS), format_func=lambda k: grid.VIEWS[k][0], horizontal=True,
+                        key=widget_key(variant, mission, "map_view"))
+        box = grid.VIEWS[view][1]
+        with metrics.span("grid_read"):
+            lat, lon, values = store.overview(year, month) if box is None else store.field(year, month, box)
+        show_chart(figures.sst_map(lat, lon, values, f"{year}년 {month}월 수온 편차{sample}", box=grid.NINO34))
+        mean = store.box_mean(year, month)
+        if mean is not None:
+            st.write(f"Niño3.4 상자 평균 편차: **{mean:+.2f}°C**")
+
+
+def correct_answer(ctx, variant, mission):
+    if mission.answer in ("analog_year", "analog_outlook"):
+        # 학생이 보고 있는 것과 같은 조건으로 다시 찾는다 (몇 ms)
+        try:
+            result = analog_query(ctx, variant, mission)
+        except ValueError:
+            return None
+        if result is None or not len(result["ends"]):
+            return None
+        if mission.answer == "analog_outlook":
+            return analog.outlook(result)
+        return int(ctx.df_q.df["Year"].iloc[int(result["ends"][0])])
+    yr = st.session_state[widget_key(variant, mission, "range")]
+    month = st.session_state.get(widget_key(variant, mission, "month"))
+    task = student_task(ctx, variant, mission)
+    if task is not None:
+        # 학생별 과제는 그래프에서 고른 범위와 관계없이 과제의 정답 (시작할 때 구해 둔 표에서 찾는다)
+        month, yr = task
+        best = answer_key(ctx.data_id, ctx).answer(variant, mission, mission_column(ctx, variant, mission), month, yr)
+        if best is not None:
+            return best
+    if mission.answer in ("trend", "max_trend"):
+        # 학생이 본 그래프와 같은 재표본 수의 결과 (캐시에 있으므로 다시 계산하지 않는다)
+        resamples = st.session_state.get(widget_key(variant, mission, "resamples"), trend.DEFAULT_RESAMPLES)
+        col = mission_column(ctx, variant, mission)
+        if mission.answer == "trend":
+            res = trend_results(ctx, col, yr, resamples, month).get(month)
+            return trend.verdict(res) if res is not None else None
+        results = trend_results(ctx, col, yr, resamples)
+        return max(results, key=lambda m: results[m]["slope"]) if results else None
+    find = ctx.ext.max_year if mission.answer == "max" else ctx.ext.min_year
+    return find(mission_column(ctx, variant, mission), yr, month=month)
+
+
+@st.fragment
+def mission_answer(ctx, variant, mission):
+    with metrics.scope(f"mission{mission.number}.answer"):
+        n = mission.number
+        with st.form(f"{variant.key}_m{n}_form"):
+            if mission.input_label and "{month}" not in mission.question:
+                st.write(mission.question)
+            given = st.text_input(mission.input_label or mission.question, key=widget_key(variant, mission, "answer"))
+            submitted = st.form_submit_button(f"제출 (미션 {n})")
+
+        if submitted:
+            given = given.strip()
+            if mission.answer is None:
+                ok = bool(given)
+            else:
+                best = correct_answer(ctx, variant, mission)
+                ok = best is not None and given == str(best)
+
+            if not ok:
+                st.error("정답을 입력하세요." if mission.answer is None else "틀렸습니다. 다시 시도하세요.")
+                if mission.answer is not None:
+                    dash.wrong(variant, who()[0], n)
+            elif variant.gated:
+                st.session_state[f"q{n}_correct"] = True
+                save_progress()
+            else:
+                st.success(mission.pass_message)
+                st.info(f"이 미션의 암호 코드: **{mission.code}**")  # ✅ 코드 즉시 표시
+                advance(variant, mission)
+
+            if variant.gated and st.session_state.get(f"q{n}_correct"):
+                st.info(f"암호 코드: **{mission.code}**")
+
+        if variant.gated and st.session_state.get(f"q{n}_correct"):
+            last = n == len(variant.missions)
+            if st.button("미션 완료" if last else "다음 미션으로 이동", key=f"{variant.key}_next_m{n}"):
+                advance(variant, mission)
+
+
+# -----------------------
+# 인트로 / 완료 화면
+# -----------------------
+def intro_screen(variant):
+    st.title(variant.intro_title)
+    st.markdown(variant.intro)
+    if st.button("🚀 미션 시작"):
+        st.session_state.mission = 1
+        st.session_state.start_time = time.time()
+        dash.complete(variant, *who(), 0, 1, st.session_state.start_time)
+        save_progress()
+        st.rerun()
+
+
+def final_screen(variant):
+    st.subheader("🎉 미션 완료")
+
+    dur_sec = (st.session_state.end_time - st.session_state.start_time) if st.session_state.start_time else 0
+    m = int(dur_sec // 60)
+    s = int(dur_sec % 60)
+    st.write(f"✅ **총 소요 시간: {m}분 {s}초**")
+
+    st.write(variant.final_prompt)
+    with st.form(f"{variant.key}_final_form"):
+        code = st.text_input(variant.final_label)
+        decoded = st.form_submit_button("암호 해독")
+    if decoded:
+        if code.strip().upper() == variant.secret:
+            st.success(variant.final_success)
+            st.balloons()
+            if variant.final_cheer:
+                st.write(variant.final_cheer)
+            if variant.final_extra:
+                st.markdown(variant.final_extra)
+        else:
+            st.error("❌ 암호가 틀렸습니다. 다시 시도하세요.")
+
+
+@functools.lru_cache(maxsize=4)
+def page_css(css):
+    # 번들에 로컬 배경 이미지가 있으면 외부 URL 대신 data URI로 넣는다
+    return css.replace(variants.BACKGROUND_URL, bundle.background_uri() or variants.BACKGROUND_URL)
+
+
+def run(variant):
+    """Variant 하나를 한 페이지로 그린다."""
+    st.set_page_config(page_title=variant.page_title, layout="wide")
+    if variant.css:
+        st.markdown(page_css(variant.css), unsafe_allow_html=True)
+    if variant.title:
+        st.title(variant.title)
+
+    # 교사용 화면 (?view=teacher)
+    if teacher.requested():
+        teacher.show(dash, variant, answers=current_answer_key)
+        return
+
+    # 계측 (ENSO_METRICS=1, ENSO_METRICS_PORT를 주면 /metrics 제공)
+    metrics.serve()
+
+    init_state(variant)
+    warm_up()
+    if not login(variant):
+        return
+
+    if "tracked" not in st.session_state:
+        st.session_state.tracked = True
+        dash.enter(variant, *who(), st.session_state.mission, time.time())
+
+    missions = {m.number: m for m in variant.missions}
+    current = st.session_state.mission
+    if variant.css:
+        st.markdown('<div class="mission-card">', unsafe_allow_html=True)
+    if current == 0 and variant.intro:
+        intro_screen(variant)
+    elif current in missions:
+        try:
+            metrics.count("cache.load_data.call")
+            ctx = load_data()
+        except Exception as e:
+            st.error(f"❌ 데이터를 불러올 수 없습니다. {e}")
+            st.stop()
+        mission = missions[current]
+        st.subheader(mission.title)
+        mission_chart(ctx, variant, mission)
+        if mission.sst_map:
+            mission_map(ctx, variant, mission)
+        mission_answer(ctx, variant, mission)
+    else:
+        final_screen(variant)
+    if variant.css:
+        st.markdown("</div>", unsafe_allow_html=True)
@@ -0,0 +1,83 @@
+import numpy as np
+
+# -----------------------
+# 엘니뇨/라니냐 사건 탐지
+# -----------------------
+# ONI가 +0.5 이상(엘니뇨) 또는 -0.5 이하(라니냐)로 연속 min_length번 이상 유지된 구간을 사건으로 본다.
+# 런 길이 인코딩을 NumPy 연산만으로 처리하므로 150년 이상의 월별/주별 자료도 한 번에 계산된다.
+EL_NINO = 1
+LA_NINA = -1
+
+
+def runs(mask):
+    """True가 연속된 구간의 (시작, 끝+1) 위치 배열."""
+    m = np.concatenate(([0], np.asarray(mask, dtype=np.int8), [0]))
+    edges = np.flatnonzero(np.diff(m))
+    return edges[0::2], edges[1::2]
+
+
+def _episodes(v, mask, sign, min_length):
+    starts, stops = runs(mask)
+    keep = (stops - starts) >= min_length
+    starts, stops = starts[keep], stops[keep]
+    if len(starts) == 0:
+        empty = np.empty(0, dtype=np.int64)
+        return starts, stops, empty, np.empty(0), np.empty(0)
+
+    # 구간별 합(세기)은 누적합의 차이로 구한다
+    filled = np.where(np.isnan(v), 0.0, v)
+    cs = np.concatenate(([0.0], np.cumsum(filled)))
+    strength = cs[stops] - cs[starts]
+
+    # 구간별 정점: 구간 번호 → 값 순으로 정렬해 각 구간의 첫 원소를 고른다 (같은 값이면 이른 시점)
+    lengths = stops - starts
+    seg = np.repeat(np.arange(len(starts)), lengths)
+    pos = np.repeat(starts - np.concatenate(([0], np.cumsum(lengths)[:-1])), lengths) + np.arange(lengths.sum())
+    order = np.lexsort((pos, -sign * v[pos], seg))
+    first = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    peak_idx = pos[order[first]]
+    return starts, stops, peak_idx, v[peak_idx], strength
+
+
+def detect(values, threshold=0.5, min_length=5):
+    """사건 목록을 열 배열 dict로 돌려준다. 시간순으로 정렬되어 있다.
+
+    kind: EL_NINO/LA_NINA, start/end: 첫/마지막 위치(포함), peak_idx/peak: 정점 위치와 값,
+    duration: 길이(표본 수), strength: 구간 값의 합 (적분 세기)
+    """
+    v = np.asarray(values, dtype=np.float64)
+    with np.errstate(invalid="ignore"):
+        warm = v >= threshold
+        cold = v <= -threshold
+
+    parts = []
+    for sign, mask in ((EL_NINO, warm), (LA_NINA, cold)):
+        starts, stops, peak_idx, peak, strength = _episodes(v, mask, sign, min_length)
+        parts.append((np.full(len(starts), sign, dtype=np.int8), starts, stops, peak_idx, peak, strength))
+
+    kind, starts, stops, peak_idx, peak, strength = (np.concatenate(cols) for cols in zip(*parts))
+    order = np.argsort(starts, kind="stable")
+    return {
+        "kind": kind[order],
+        "start": starts[order],
+        "end": stops[order] - 1,
+        "peak_idx": peak_idx[order],
+        "peak": peak[order],
+        "duration": (stops - starts)[order],
+        "strength": strength[order],
+    }
+
+
+def table(dates, values, threshold=0.5, min_length=5):
+    """detect() 결과에 날짜를 붙인 열 dict (pandas.DataFrame에 바로 넣을 수 있다)."""
+    ep = detect(values, threshold, min_length)
+    dates = np.asarray(dates)
+    return {
+        "유형": np.where(ep["kind"] == EL_NINO, "엘니뇨", "라니냐"),
+        "시작": dates[ep["start"]],
+        "끝": dates[ep["end"]],
+        "정점 시기": dates[ep["peak_idx"]],
+        "정점": ep["peak"],
+        "기간(개월)": ep["duration"],
+        "세기": ep["strength"],
+    }
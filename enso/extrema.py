@@ -0,0 +1,132 @@
+import numpy as np
+import pandas as pd
+
+from enso import metrics
+
+# -----------------------
+# 구간 최댓값/최솟값 (정답 계산용)
+# -----------------------
+# 연도별 최댓값/최솟값 위에 희소 테이블(sparse table)을 한 번 만들어 두면
+# "a~b년 중 지수가 가장 높은 해" 같은 질문을 O(1)에 답할 수 있다.
+
+
+class SparseTable:
+    def __init__(self, values, op="max"):
+        v = np.asarray(values, dtype=np.float64)
+        fill = -np.inf if op == "max" else np.inf
+        self.values = np.where(np.isnan(v), fill, v)
+        self.op = op
+        self._fill = fill
+
+        n = len(self.values)
+        level = np.arange(n)
+        self.table = [level]
+        width = 1
+        while 2 * width <= n:
+            left = level[: n - 2 * width + 1]
+            right = level[width : n - width + 1]
+            level = np.where(self._better(self.values[right], self.values[left]), right, left)
+            self.table.append(level)
+            width *= 2
+
+    def _better(self, a, b):
+        # 같은 값이면 앞쪽(이른 연도)을 유지한다 (idxmax/idxmin과 동일)
+        return a > b if self.op == "max" else a < b
+
+    def argquery(self, lo, hi):
+        """[lo, hi) 구간에서 최댓값/최솟값의 위치. 값이 없으면 None."""
+        if hi <= lo:
+            return None
+        k = (hi - lo).bit_length() - 1
+        a = self.table[k][lo]
+        b = self.table[k][hi - (1 << k)]
+        best = b if self._better(self.values[b], self.values[a]) else a
+        if self.values[best] == self._fill:
+            return None
+        return int(best)
+
+    def argquery_many(self, lo, hi):
+        """argquery를 여러 구간 [lo[i], hi[i])에 한꺼번에. 값이 없는 구간은 -1."""
+        lo = np.asarray(lo, dtype=np.int64)
+        hi = np.asarray(hi, dtype=np.int64)
+        length = np.maximum(hi - lo, 1)
+        k = np.frexp(length.astype(np.float64))[1] - 1  # floor(log2(length))
+        out = np.zeros(len(lo), dtype=np.int64)
+        for level in np.unique(k).tolist():
+            m = k == level
+            a = self.table[level][lo[m]]
+            b = self.table[level][hi[m] - (1 << level)]
+            out[m] = np.where(self._better(self.values[b], self.values[a]), b, a)
+        return np.where((hi > lo) & (self.values[out] != self._fill), out, -1)
+
+
+class RangeExtrema:
+    def __init__(self, df, columns=None):
+        if columns is None:
+            columns = [c for c in df.columns if df[c].dtype.kind == "f"]
+        self.columns = list(columns)
+        self.years = np.unique(df["Year"].to_numpy())
+        self._df = df
+
+        # 연도별 값, (연도 x 월) 표, 희소 테이블은 컬럼마다 처음 질문할 때 만든다.
+        # 시계열이 많아져도 로드 시간은 그대로이고, 쓰는 컬럼만 메모리를 쓴다.
+        self._yearly = {}
+        self._monthly = {}
+        self._tables = {}
+
+    def _yearly_values(self, col, op):
+        key = (col, op)
+        if key not in self._yearly:
+            g = self._df.groupby("Year")[col]
+            self._yearly[key] = (g.max() if op == "max" else g.min()).reindex(self.years).to_numpy()
+        return self._yearly[key]
+
+    def _monthly_values(self, col, month):
+        if col not in self._monthly:
+            self._monthly[col] = (
+                self._df.pivot_table(index="Year", columns="Month", values=col, aggfunc="max")
+                .reindex(index=self.years, columns=range(1, 13))
+            )
+        return self._monthly[col][int(month)].to_numpy()
+
+    def _table(self, col, op, month=None):
+        key = (col, op, month)
+        if key not in self._tables:
+            if month is None:
+                values = self._yearly_values(col, op)
+            else:
+                values = self._monthly_values(col, month)
+            self._tables[key] = SparseTable(values, op)
+        return self._tables[key]
+
+    def _span(self, year_range):
+        return (
+            int(np.searchsorted(self.years, year_range[0], side="left")),
+            int(np.searchsorted(self.years, year_range[1], side="right")),
+        )
+
+    def _year(self, col, op, year_range, month):
+        with metrics.span("answer"):
+            pos = self._table(col, op, month).argquery(*self._span(year_range))
+        return None if pos is None else int(self.years[pos])
+
+    def max_year(self, col, year_range, month=None):
+        """year_range 안에서 col 값이 가장 큰 해 (month를 주면 그 달 기준)."""
+        return self._year(col, "max", year_range, month)
+
+    def min_year(self, col, year_range, month=None):
+        """year_range 안에서 col 값이 가장 작은 해 (month를 주면 그 달 기준)."""
+        return self._year(col, "min", year_range, month)
+
+    def years_many(self, col, op, starts, ends, month=None):
+        """여러 연도 범위 [starts[i], ends[i]]의 max_year/min_year를 한꺼번에. 답이 없는 범위는 -1."""
+        lo = np.searchsorted(self.years, starts, side="left")
+        hi = np.searchsorted(self.years, ends, side="right")
+        pos = self._table(col, op, month).argquery_many(lo, hi)
+        return np.where(pos >= 0, self.years[np.maximum(pos, 0)], -1)
+
+    def yearly(self, col, op, year_range, name=None):
+        """연도별 최댓값/최솟값 표 (Year, col) 중 year_range 부분."""
+        lo, hi = self._span(year_range)
+        return pd.DataFrame({"Year": self.years[lo:hi], name or col: self._yearly_values(col, op)[lo:hi]},
+                            index=range(lo, hi))
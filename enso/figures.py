@@ -0,0 +1,200 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import plotly.graph_objects as go
+
+from enso import lod, metrics
+from enso.variants import THRESHOLD_LABELS
+
+# -----------------------
+# 그래프 캐시
+# -----------------------
+# (미션, 컬럼, 연도 범위, 월) 키로 만들어 둔 Plotly 그림을 재사용한다.
+# 캐시된 그림은 여러 세션이 같이 쓰므로 꺼낸 뒤에 수정하면 안 된다.
+
+
+class FigureCache:
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, build):
+        with self._lock:
+            fig = self._data.get(key)
+            if fig is not None:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return fig
+            self.misses += 1
+
+        with metrics.span("figure_build"):
+            fig = build()
+        self.put(key, fig)
+        return fig
+
+    def put(self, key, fig):
+        with self._lock:
+            self._data[key] = fig
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def items(self):
+        with self._lock:
+            return list(self._data.items())
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def invalidate(self, affected):
+        """affected(key)가 참인 항목만 지운다. 지운 개수를 돌려준다."""
+        with self._lock:
+            keys = [k for k in self._data if affected(k)]
+            for k in keys:
+                del self._data[k]
+            return len(keys)
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._data)}
+
+
+def add_thresholds(fig, labels=THRESHOLD_LABELS):
+    el, la = labels if labels else (None, None)
+    fig.add_hline(y=0.5, line_dash="dash", line_color="red", annotation_text=el)
+    fig.add_hline(y=-0.5, line_dash="dash", line_color="blue", annotation_text=la)
+    return fig
+
+
+def add_episodes(fig, episodes):
+    """엘니뇨/라니냐 사건 구간을 배경색으로 칠한다 (episodes: enso.events.table 결과 프레임)."""
+    shapes = [
+        dict(type="rect", xref="x", yref="paper", x0=start, x1=end, y0=0, y1=1,
+             fillcolor="red" if kind == "엘니뇨" else "blue", opacity=0.08, line_width=0, layer="below")
+        for kind, start, end in zip(episodes["유형"], episodes["시작"], episodes["끝"])
+    ]
+    fig.update_layout(shapes=list(fig.layout.shapes) + shapes)
+    return fig
+
+
+def year_span(year_range):
+    return [f"{year_range[0]}-01-01", f"{year_range[1]}-12-31"]
+
+
+def with_x_range(base, x_range):
+    fig = go.Figure(base)
+    fig.update_xaxes(range=x_range)
+    return fig
+
+
+def index_view(cache, key, frame, year_range, title, labels=THRESHOLD_LABELS, y_range=None, episodes=None,
+               pyramid=None):
+    """기준선/사건 구간이 들어간 틀은 한 번만 만들고, 연도 범위마다 그 구간의 점만 얹는다.
+
+    pyramid(enso.lod.Pyramid)를 주면 구간이 길 때 점 수를 줄이고, 점이 많으면 WebGL로 그린다.
+    """
+    def base():
+        fig = go.Figure()
+        fig.update_layout(title=title, xaxis_title="date", yaxis_title="지수")
+        add_thresholds(fig, labels)
+        if episodes is not None:
+            add_episodes(fig, episodes)
+        if y_range is not None:
+            fig.update_yaxes(range=y_range)
+        return fig
+
+    def view():
+        years = frame["Year"].to_numpy()
+        lo = int(np.searchsorted(years, year_range[0], side="left"))
+        hi = int(np.searchsorted(years, year_range[1], side="right"))
+        idx = pyramid.indices(lo, hi) if pyramid is not None else np.arange(lo, hi)
+        trace = go.Scattergl if len(idx) > lod.WEBGL_POINTS else go.Scatter
+        fig = with_x_range(cache.get(key, base), year_span(year_range))
+        fig.add_trace(trace(
+            x=frame["date"].to_numpy()[idx], y=frame["지수"].to_numpy()[idx], mode="lines+markers",
+            name="지수", showlegend=False, hovertemplate="date=%{x}<br>지수=%{y}<extra></extra>",
+        ))
+        return fig
+
+    return cache.get((*key, tuple(year_range)), view)
+
+
+def sst_map(lat, lon, values, title, box=None, z_max=3.0):
+    """수온 편차 격자 지도. box(남, 북, 서, 동)를 주면 테두리와 이름을 얹는다."""
+    fig = go.Figure(go.Heatmap(
+        x=lon, y=lat, z=values, colorscale="RdBu_r", zmid=0, zmin=-z_max, zmax=z_max,
+        colorbar=dict(title="편차(°C)"), hovertemplate="경도 %{x}°E<br>위도 %{y}°<br>편차 %{z:.2f}°C<extra></extra>",
+    ))
+    fig.update_layout(title=title, xaxis_title="경도(°E)", yaxis_title="위도(°)")
+    fig.update_yaxes(scaleanchor="x", scaleratio=1)
+    if box is not None:
+        south, north, west, east = box
+        fig.add_shape(type="rect", x0=west, x1=east, y0=south, y1=north, line=dict(color="black", width=2))
+        fig.add_annotation(x=(west + east) / 2, y=north, text="Niño3.4", showarrow=False, yshift=10)
+    return fig
+
+
+def trend_line(years, values, result, title, y_label="수온 평균(°C)"):
+    """연도별 값과 추세선. 신뢰구간 끝의 기울기는 점선으로 (평균 연도를 지나게) 그린다."""
+    years = np.asarray(years, dtype=np.float64)
+    fig = go.Figure(go.Scatter(x=years, y=values, mode="lines+markers", name="값", line=dict(color="gray")))
+    x = np.array([years.min(), years.max()]) if len(years) else np.array([])
+    xm = years.mean() if len(years) else 0.0
+    ym = result["intercept"] + result["slope"] * xm
+    for slope, name, dash in ((result["slope"], "추세", "solid"), (result["low"], "신뢰구간 하한", "dot"),
+                              (result["high"], "신뢰구간 상한", "dot")):
+        fig.add_trace(go.Scatter(x=x, y=ym + slope * (x - xm), mode="lines", name=name,
+                                 line=dict(color="red", dash=dash, width=2 if dash == "solid" else 1)))
+    fig.update_layout(title=title, xaxis_title="연도", yaxis_title=y_label)
+    return fig
+
+
+def trend_bars(results, title):
+    """달별 추세(°C/10년)와 신뢰구간. 구간이 0을 넘으면 빨강, 0 아래면 파랑, 0을 포함하면 회색."""
+    months = sorted(results)
+    slope = np.array([results[m]["slope"] for m in months]) * 10
+    low = np.array([results[m]["low"] for m in months]) * 10
+    high = np.array([results[m]["high"] for m in months]) * 10
+    colors = np.where(low > 0, "red", np.where(high < 0, "blue", "gray"))
+    fig = go.Figure(go.Bar(
+        x=months, y=slope, marker_color=colors,
+        error_y=dict(type="data", symmetric=False, array=high - slope, arrayminus=slope - low),
+        hovertemplate="%{x}월<br>추세 %{y:.3f}°C/10년<extra></extra>",
+    ))
+    fig.update_layout(title=title, xaxis_title="월", yaxis_title="추세(°C/10년)")
+    fig.update_xaxes(tickmode="array", tickvals=list(range(1, 13)))
+    return fig
+
+
+def analog_paths(result, labels, title, y_label="지수", thresholds=THRESHOLD_LABELS):
+    """고른 기간(굵은 선)과 비슷했던 과거 사례들(가는 선), 사례들의 그 뒤 중앙값과 10~90% 범위.
+
+    x축은 고른 기간의 마지막 달을 0으로 둔 개월 수이고, labels는 사례마다 끝난 달 이름이다.
+    """
+    q, paths = result["query"], result["paths"]
+    steps = np.arange(-len(q) + 1, paths.shape[1] - len(q) + 1)
+    fig = go.Figure()
+    for path, label in zip(paths, labels):
+        fig.add_trace(go.Scatter(x=steps, y=path, mode="lines", name=label, showlegend=False,
+                                 line=dict(color="lightgray", width=1),
+                                 hovertemplate=f"{label}<br>%{{x}}개월: %{{y:.2f}}<extra></extra>"))
+    if len(paths):
+        future = steps >= 0
+        low, mid, high = np.nanpercentile(paths[:, future], [10, 50, 90], axis=0)
+        fig.add_trace(go.Scatter(x=steps[future], y=high, mode="lines", line=dict(width=0),
+                                 showlegend=False, hoverinfo="skip"))
+        fig.add_trace(go.Scatter(x=steps[future], y=low, mode="lines", line=dict(width=0), fill="tonexty",
+                                 fillcolor="rgba(255,0,0,0.15)", name="사례 10~90%", hoverinfo="skip"))
+        fig.add_trace(go.Scatter(x=steps[future], y=mid, mode="lines+markers", name="사례 중앙값",
+                                 line=dict(color="red", width=2)))
+    fig.add_trace(go.Scatter(x=steps[:len(q)], y=q, mode="lines+markers", name="고른 기간",
+                             line=dict(color="black", width=3)))
+    add_thresholds(fig, thresholds)
+    fig.add_vline(x=0, line_dash="dot", line_color="gray")
+    fig.update_layout(title=title, xaxis_title="고른 기간의 마지막 달부터 (개월)", yaxis_title=y_label)
+    return fig
@@ -0,0 +1,343 @@
+import argparse
+import functools
+import json
+import os
+import sys
+import warnings
+
+import numpy as np
+
+from enso import dataset, metrics
+
+# -----------------------
+# 열대 태평양 수온 편차 격자
+# -----------------------
+# 월별 격자를 위도/경도 타일(t{iy}_{ix}.bin, 모양 (달 수, 타일 높이, 타일 너비))로 나눠 저장하고 memmap으로 연다.
+# 한 타일 안에서는 한 달이 연속된 바이트라서, 지도 한 장은 요청한 달의 겹치는 타일 조각만 읽는다.
+# 전체 태평양 보기는 4x4 격자를 평균한 개략 격자(overview.bin)를 쓰고, 읽은 조각은 LRU로 캐시한다.
+#
+# 실제 격자 자료(ERSST, OISST 등의 NetCDF/Zarr)는 xarray가 있으면 가져올 수 있다:
+#   python -m enso.grid import sst.mnmean.nc --var sst
+# 없으면 저장소의 Niño3.4 수온 편차로 만든 예시 격자를 쓴다 (오프라인 확인용 합성 자료).
+#   python -m enso.grid sample
+GRID_DIR = "grid"
+TILE = (16, 16)
+OVERVIEW = 4
+TILE_CACHE = 256
+OVERVIEW_CACHE = 64
+
+LAT = np.arange(-30.0, 30.1, 2.0)
+LON = np.arange(120.0, 280.1, 2.0)  # 0~360°E (280°E = 80°W)
+NINO34 = (-5.0, 5.0, 190.0, 240.0)  # (남, 북, 서, 동), 5°S-5°N, 170°W-120°W
+VIEWS = {
+    "pacific": ("열대 태평양 (개략)", None),
+    "nino34": ("Niño3.4 주변 (상세)", (-15.0, 15.0, 160.0, 270.0)),
+}
+
+
+def store_dir(out=None):
+    return dataset.store_dir(out or dataset.cache_dir() / GRID_DIR)
+
+
+def _tiles(n, size):
+    return [(s, min(s + size, n)) for s in range(0, n, size)]
+
+
+def _coarsen(field, factor=OVERVIEW):
+    # factor x factor 묶음의 평균 (가장자리는 남는 칸만, 육지 NaN은 빼고)
+    ny, nx = field.shape
+    pad = np.full((-(-ny // factor) * factor, -(-nx // factor) * factor), np.nan, dtype=np.float32)
+    pad[:ny, :nx] = field
+    blocks = pad.reshape(pad.shape[0] // factor, factor, pad.shape[1] // factor, factor)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)  # 전부 NaN인 묶음
+        return np.nanmean(blocks, axis=(1, 3)).astype(np.float32)
+
+
+def _coarse_axis(axis, factor=OVERVIEW):
+    return np.array([axis[i:i + factor].mean() for i in range(0, len(axis), factor)])
+
+
+def _box_weights(lat, lon, box):
+    # 위도 cos 가중치, 상자 밖은 0
+    south, north, west, east = box
+    inside = ((lat >= south) & (lat <= north))[:, None] & ((lon >= west) & (lon <= east))[None, :]
+    return np.where(inside, np.cos(np.deg2rad(lat))[:, None], 0.0)
+
+
+# -----------------------
+# 쓰기
+# -----------------------
+class _Writer:
+    """달 순서대로 격자를 받아 타일 파일과 개략 격자를 채운다. 다 쓰면 close()로 meta.json을 쓴다."""
+
+    def __init__(self, out, lat, lon, first, count, source, extra=None):
+        self.out = out
+        self.tmp = out.with_name(out.name + ".tmp")
+        self.tmp.mkdir(parents=True, exist_ok=True)
+        self.lat, self.lon = np.asarray(lat, dtype=np.float64), np.asarray(lon, dtype=np.float64)
+        self.rows, self.cols = _tiles(len(lat), TILE[0]), _tiles(len(lon), TILE[1])
+        self.tiles = {
+            (iy, ix): np.memmap(self.tmp / f"t{iy}_{ix}.bin", dtype=np.float32, mode="w+",
+                                shape=(count, y1 - y0, x1 - x0))
+            for iy, (y0, y1) in enumerate(self.rows) for ix, (x0, x1) in enumerate(self.cols)
+        }
+        oy, ox = -(-len(lat) // OVERVIEW), -(-len(lon) // OVERVIEW)
+        self.overview = np.memmap(self.tmp / "overview.bin", dtype=np.float32, mode="w+", shape=(count, oy, ox))
+        self.meta = {"lat": self.lat.tolist(), "lon": self.lon.tolist(), "first": int(first), "count": int(count),
+                     "tile": list(TILE), "overview": OVERVIEW, "source": source, **(extra or {})}
+
+    def write(self, t, field):
+        field = np.asarray(field, dtype=np.float32)
+        for (iy, ix), mm in self.tiles.items():
+            (y0, y1), (x0, x1) = self.rows[iy], self.cols[ix]
+            mm[t] = field[y0:y1, x0:x1]
+        self.overview[t] = _coarsen(field)
+
+    def close(self):
+        for mm in (*self.tiles.values(), self.overview):
+            mm.flush()
+        self.tiles, self.overview = {}, None
+        dataset._write_meta(self.tmp, self.meta)
+        # 데이터셋과 같이 디렉터리를 통째로 교체한다
+        if self.out.exists():
+            old = self.out.with_name(self.out.name + ".old")
+            if old.exists():
+                dataset._rmtree(old)
+            os.replace(self.out, old)
+            os.replace(self.tmp, self.out)
+            dataset._rmtree(old)
+        else:
+            os.replace(self.tmp, self.out)
+        return self.out
+
+
+def pattern(lat=LAT, lon=LON, box=NINO34):
+    """엘니뇨 때 수온 편차의 대략적인 공간 모양. Niño3.4 상자 가중 평균이 1이 되도록 맞춘다."""
+    y, x = np.meshgrid(lat, lon, indexing="ij")
+    tongue = np.exp(-(y / 8.0) ** 2) * np.exp(-((x - 235.0) / 40.0) ** 2)
+    horseshoe = np.exp(-((np.abs(y) - 18.0) / 8.0) ** 2) * np.exp(-((x - 160.0) / 25.0) ** 2)
+    p = tongue - 0.3 * horseshoe
+    w = _box_weights(lat, lon, box)
+    return p / ((p * w).sum() / w.sum())
+
+
+def build_sample(out=None):
+    """저장소의 Niño3.4 월별 수온 편차 x pattern()으로 예시 격자를 만든다 (합성 자료)."""
+    from enso import ingest, oni
+
+    df = dataset.load()
+    if oni.SST_COL not in df.columns:
+        raise ValueError(f"예시 격자를 만들려면 '{oni.SST_COL}' 컬럼이 필요합니다.")
+    years, months = df["Year"].to_numpy(), df["Month"].to_numpy()
+    anomaly = oni.compute(years, months, df[oni.SST_COL].to_numpy())["anomaly"]
+    keys = ingest.month_keys(years, months)
+    first = int(keys[0])
+    count = int(keys[-1]) - first + 1
+    values = np.full(count, np.nan)
+    values[keys - first] = anomaly
+
+    p = pattern().astype(np.float32)
+    writer = _Writer(store_dir(out), LAT, LON, first, count, "sample",
+                     {"dataset_version": df.attrs.get("version"), "dataset_build": df.attrs.get("build"), "units": "°C"})
+    for t, a in enumerate(values):
+        writer.write(t, a * p)
+    return writer.close()
+
+
+def import_xarray(path, var=None, out=None, base=(1991, 2020)):
+    """NetCDF/Zarr 월별 격자를 열대 태평양 영역만 잘라 저장한다. 편차가 아니면 base 기간 평년값을 뺀다.
+
+    xarray가 자료를 지연 로딩하므로 한 번에 한 달씩만 메모리에 올린다.
+    """
+    try:
+        import xarray as xr
+    except ImportError:
+        raise ValueError("NetCDF/Zarr를 읽으려면 xarray가 필요합니다. (pip install xarray netCDF4 또는 zarr)")
+    import pandas as pd
+
+    path = str(path)
+    ds = xr.open_zarr(path) if path.rstrip("/").endswith(".zarr") else xr.open_dataset(path)
+    names = {"latitude": "lat", "longitude": "lon"}
+    ds = ds.rename({k: v for k, v in names.items() if k in ds.dims or k in ds.coords})
+    if var is None:
+        var = next((v for v in ds.data_vars if {"time", "lat", "lon"} <= set(ds[v].dims)), None)
+    if var is None or var not in ds:
+        raise ValueError(f"(time, lat, lon) 변수를 찾지 못했습니다: {list(ds.data_vars)}")
+    da = ds[var]
+    da = da.assign_coords(lon=da["lon"] % 360).sortby("lat").sortby("lon")
+    da = da.sel(lat=slice(LAT[0], LAT[-1]), lon=slice(LON[0], LON[-1])).transpose("time", "lat", "lon")
+
+    times = pd.DatetimeIndex(da["time"].values)
+    keys = times.year.to_numpy() * 12 + times.month.to_numpy() - 1
+    if len(keys) == 0 or np.any(np.diff(keys) <= 0):
+        raise ValueError("time 축이 비어 있거나 달 순서가 맞지 않습니다.")
+
+    # 편차 자료가 아니면 달별 평년값(base 기간 평균)을 먼저 구한다
+    is_anomaly = "anom" in var.lower() or "anom" in str(da.attrs.get("long_name", "")).lower()
+    clim = None
+    if not is_anomaly:
+        shape = (12, da.sizes["lat"], da.sizes["lon"])
+        total, n = np.zeros(shape), np.zeros(shape)
+        for t in np.flatnonzero((times.year >= base[0]) & (times.year <= base[1])):
+            v = da.isel(time=int(t)).values
+            ok = np.isfinite(v)
+            total[times.month[t] - 1][ok] += v[ok]
+            n[times.month[t] - 1][ok] += 1
+        if not n.any():
+            raise ValueError(f"기준 기간 {base[0]}-{base[1]}의 자료가 없습니다.")
+        with np.errstate(invalid="ignore"):
+            clim = total / n
+
+    first = int(keys[0])
+    writer = _Writer(store_dir(out), da["lat"].values, da["lon"].values, first, int(keys[-1]) - first + 1,
+                     os.path.abspath(path), {"var": var, "units": "°C", "base": list(base) if clim is not None else None})
+    empty = np.full((len(writer.lat), len(writer.lon)), np.nan, dtype=np.float32)
+    for t in np.setdiff1d(np.arange(writer.meta["count"]), keys - first):
+        writer.write(int(t), empty)  # 자료에 빠진 달
+    for t, key in enumerate(keys):
+        v = da.isel(time=t).values.astype(np.float64)
+        if clim is not None:
+            v = v - clim[times.month[t] - 1]
+        writer.write(int(key) - first, v)
+    return writer.close()
+
+
+# -----------------------
+# 읽기
+# -----------------------
+class GridStore:
+    """달/영역 단위로 필요한 타일만 읽는 격자 저장소."""
+
+    def __init__(self, out, meta):
+        self.out = out
+        self.meta = meta
+        self.lat = np.asarray(meta["lat"])
+        self.lon = np.asarray(meta["lon"])
+        self.first = meta["first"]
+        self.count = meta["count"]
+        self.sample = meta["source"] == "sample"
+        self.rows = _tiles(len(self.lat), meta["tile"][0])
+        self.cols = _tiles(len(self.lon), meta["tile"][1])
+        self.overview_lat = _coarse_axis(self.lat, meta["overview"])
+        self.overview_lon = _coarse_axis(self.lon, meta["overview"])
+        self._files = {}
+        # 인스턴스마다 캐시한다 (저장소가 바뀌면 새 GridStore가 생기므로 옛 조각이 섞이지 않는다)
+        self._tile = functools.lru_cache(maxsize=TILE_CACHE)(self._read_tile)
+        self._overview = functools.lru_cache(maxsize=OVERVIEW_CACHE)(self._read_overview)
+
+    def months(self):
+        """(연, 월) 목록, 오래된 달부터."""
+        keys = np.arange(self.first, self.first + self.count)
+        return list(zip((keys // 12).tolist(), (keys % 12 + 1).tolist()))
+
+    def month_index(self, year, month):
+        t = year * 12 + month - 1 - self.first
+        return t if 0 <= t < self.count else None
+
+    def _memmap(self, name, shape):
+        if name not in self._files:
+            self._files[name] = np.memmap(self.out / name, dtype=np.float32, mode="r", shape=(self.count, *shape))
+        return self._files[name]
+
+    def _read_tile(self, t, iy, ix):
+        metrics.count("grid.tile.read")
+        (y0, y1), (x0, x1) = self.rows[iy], self.cols[ix]
+        return np.array(self._memmap(f"t{iy}_{ix}.bin", (y1 - y0, x1 - x0))[t])
+
+    def _read_overview(self, t):
+        metrics.count("grid.overview.read")
+        return np.array(self._memmap("overview.bin", (len(self.overview_lat), len(self.overview_lon)))[t])
+
+    def _index(self, year, month):
+        t = self.month_index(year, month)
+        if t is None:
+            raise ValueError(f"격자 자료에 없는 달입니다: {year}년 {month}월")
+        return t
+
+    def field(self, year, month, box=None):
+        """(위도, 경도, 값). box(남, 북, 서, 동)를 주면 그 영역과 겹치는 타일만 읽어 잘라 준다."""
+        t = self._index(year, month)
+        ys = np.arange(len(self.lat)) if box is None else \
+            np.flatnonzero((self.lat >= box[0]) & (self.lat <= box[1]))
+        xs = np.arange(len(self.lon)) if box is None else \
+            np.flatnonzero((self.lon >= box[2]) & (self.lon <= box[3]))
+        out = np.full((len(ys), len(xs)), np.nan, dtype=np.float32)
+        if len(ys) and len(xs):
+            for iy, (y0, y1) in enumerate(self.rows):
+                if y1 <= ys[0] or y0 > ys[-1]:
+                    continue
+                for ix, (x0, x1) in enumerate(self.cols):
+                    if x1 <= xs[0] or x0 > xs[-1]:
+                        continue
+                    tile = self._tile(t, iy, ix)
+                    a, b = max(y0, ys[0]), min(y1, ys[-1] + 1)
+                    c, d = max(x0, xs[0]), min(x1, xs[-1] + 1)
+                    out[a - ys[0]:b - ys[0], c - xs[0]:d - xs[0]] = tile[a - y0:b - y0, c - x0:d - x0]
+        return self.lat[ys], self.lon[xs], out
+
+    def overview(self, year, month):
+        """전체 영역의 개략 격자 (위도, 경도, 값)."""
+        return self.overview_lat, self.overview_lon, self._overview(self._index(year, month))
+
+    def box_mean(self, year, month, box=NINO34):
+        """상자 안 위도 가중 평균 편차 (값이 없으면 None)."""
+        lat, lon, v = self.field(year, month, box)
+        w = _box_weights(lat, lon, box) * np.isfinite(v)
+        return float((np.nan_to_num(v) * w).sum() / w.sum()) if w.sum() else None
+
+    def stats(self):
+        return {"tiles": self._tile.cache_info().currsize, "overview": self._overview.cache_info().currsize}
+
+
+def read_meta(out=None):
+    return dataset._read_meta(store_dir(out))
+
+
+def load(out=None):
+    """격자 저장소를 연다. 없거나 예시 격자가 데이터셋보다 오래됐으면 예시 격자를 다시 만든다."""
+    out = store_dir(out)
+    meta = dataset._read_meta(out)
+    if _stale(meta):
+        with dataset.lock(out):
+            meta = dataset._read_meta(out)
+            if _stale(meta):  # 기다리는 동안 다른 워커가 만들었으면 그대로 쓴다
+                build_sample(out)
+                meta = dataset._read_meta(out)
+    return GridStore(out, meta)
+
+
+def _stale(meta):
+    if meta is None:
+        return True
+    current = dataset.read_meta()
+    current = current or {}
+    return meta["source"] == "sample" and (meta.get("dataset_build"), meta.get("dataset_version")) \
+        != (current.get("build"), current.get("version"))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="열대 태평양 수온 편차 격자 저장소")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("sample", help="Niño3.4 편차로 예시(합성) 격자 만들기")
+    p_imp = sub.add_parser("import", help="NetCDF/Zarr 격자 가져오기 (xarray 필요)")
+    p_imp.add_argument("path")
+    p_imp.add_argument("--var")
+    p_imp.add_argument("--base", default="1991-2020")
+    sub.add_parser("info")
+    for p in sub.choices.values():
+        p.add_argument("--out")
+    args = parser.parse_args()
+
+    try:
+        if args.cmd == "sample":
+            print(build_sample(args.out))
+        elif args.cmd == "import":
+            base = tuple(int(y) for y in args.base.split("-"))
+            print(import_xarray(args.path, args.var, args.out, base))
+        else:
+            meta = read_meta(args.out)
+            print(json.dumps({k: v for k, v in (meta or {}).items() if k not in ("lat", "lon")}, ensure_ascii=False))
+    except ValueError as e:
+        print(f"실패했습니다: {e}", file=sys.stderr)
+        sys.exit(1)
@@ -0,0 +1,192 @@
+import argparse
+import io
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from enso import dataset
+
+# -----------------------
+# 월별 자료 추가 (append-only)
+# -----------------------
+# 새 달만 담긴 CSV(또는 새 스냅샷 전체)를 받아 검사한 뒤 저장소 끝에 덧붙인다.
+# 이미 있는 달은 값이 같으면 건너뛰고, 다르면 거부한다. 검사는 모두 배열 연산으로 한 번에 한다.
+# 덧붙인 달은 원본 CSV 옆 기록 파일에도 남겨서, 원본이 바뀌어 저장소를 다시 빌드해도 사라지지 않는다.
+#
+#   python -m enso.ingest 새자료.csv            # 검사 후 추가
+#   python -m enso.ingest 새자료.csv --dry-run  # 검사만
+DERIVED = ("date", "Year", "Month")
+ENCODINGS = ["utf-8-sig", "cp949"]  # 엑셀에서 저장한 한글 CSV는 cp949인 경우가 많다
+
+
+def decode(raw):
+    """바이트를 문자열로. (text, 경고 목록)"""
+    for enc in ENCODINGS:
+        try:
+            text = raw.decode(enc)
+        except UnicodeDecodeError:
+            continue
+        return text, ([] if enc == ENCODINGS[0] else [f"UTF-8이 아니라 {enc}로 읽었습니다."])
+    raise ValueError("인코딩을 알 수 없습니다. UTF-8로 저장해 주세요.")
+
+
+def read(path):
+    """CSV를 읽어 (원본 문자열 프레임, 경고 목록). 값은 아직 변환하지 않는다."""
+    text, notes = decode(Path(path).read_bytes())
+    if "\ufffd" in text:
+        raise ValueError("깨진 문자(U+FFFD)가 있습니다. 원본 파일의 인코딩을 확인해 주세요.")
+    raw = pd.read_csv(io.StringIO(text), dtype=str, keep_default_na=False)
+
+    # 줄마다 붙은 BOM(\ufeff)은 자료 제공처 형식이라 지우고 개수만 알려준다
+    cells = raw.to_numpy(dtype=str)
+    n_bom = int(np.char.count(cells, "\ufeff").sum()) + sum("\ufeff" in c for c in raw.columns)
+    if n_bom:
+        notes.append(f"BOM {n_bom}개를 지웠습니다.")
+    raw.columns = [str(c).replace("\ufeff", "").strip() for c in raw.columns]
+    raw = raw.apply(lambda s: s.str.replace("\ufeff", "", regex=False).str.strip())
+    return raw, notes
+
+
+def month_keys(years, months):
+    return np.asarray(years, dtype=np.int64) * 12 + np.asarray(months, dtype=np.int64) - 1
+
+
+def parse_numbers(text, name):
+    """문자열 열 → float 배열. 빈 칸은 NaN, 글자가 있는데 숫자가 아니면 ValueError."""
+    text = text.to_numpy(dtype=str)
+    num = pd.to_numeric(pd.Series(text), errors="coerce").to_numpy(dtype=np.float64)
+    bad = np.flatnonzero(np.isnan(num) & (text != ""))
+    if len(bad):
+        raise ValueError(f"'{name}'에 숫자가 아닌 값 {len(bad)}개: {text[bad[:5]].tolist()}")
+    return num
+
+
+def _fmt(keys):
+    keys = list(keys)[:5]
+    return ", ".join(f"{k // 12}년 {k % 12 + 1:02d}월" for k in keys)
+
+
+def validate(raw, store, required=None):
+    """새 행을 검사한다. (덧붙일 정규화 프레임, 오류 목록, 안내 목록)
+
+    store는 dataset.open_store로 연 현재 저장소 프레임, required는 꼭 있어야 하는 컬럼(기본: 전부).
+    """
+    errors, notes = [], []
+    expected = [c for c in store.columns if c not in DERIVED]
+
+    # 스키마 (나중에 enso.registry로 더한 시계열 컬럼은 없어도 되고, 없으면 빈 값)
+    required = required or expected
+    missing = [c for c in expected if c not in raw.columns and c in required]
+    optional = [c for c in expected if c not in raw.columns and c not in required]
+    if optional:
+        raw = raw.assign(**{c: "" for c in optional})
+        notes.append(f"값이 없는 시계열은 빈 값으로 둡니다: {optional}")
+    extra = [c for c in raw.columns if c not in expected]
+    if missing:
+        errors.append(f"없는 컬럼: {missing}")
+    if extra:
+        errors.append(f"모르는 컬럼: {extra}")
+    if errors or raw.empty:
+        return None, errors, notes or ["추가할 행이 없습니다."]
+
+    # 날짜
+    dates = dataset._parse_dates(raw["날짜"])
+    bad = np.flatnonzero(dates.isna().to_numpy())
+    if len(bad):
+        errors.append(f"날짜를 읽을 수 없는 행 {len(bad)}개: {raw['날짜'].iloc[bad[:5]].tolist()}")
+
+    # 숫자 (빈 칸은 결측으로 허용, 글자가 있는데 숫자가 아니면 오류)
+    for c in expected:
+        if c == "날짜":
+            continue
+        try:
+            parse_numbers(raw[c], c)
+        except ValueError as e:
+            errors.append(str(e))
+    if errors:
+        return None, errors, notes
+
+    new = dataset.normalize(raw)[list(store.columns)]
+    keys = month_keys(new["Year"], new["Month"])
+
+    # 새 자료 안의 중복 달
+    uniq, counts = np.unique(keys, return_counts=True)
+    if (counts > 1).any():
+        errors.append(f"같은 달이 여러 번 있습니다: {_fmt(uniq[counts > 1])}")
+        return None, errors, notes
+
+    # 저장소에 이미 있는 달: 값이 같으면 건너뛰고, 다르면 거부 (빈 칸이 채워진 것은 안내만)
+    old_keys = month_keys(store["Year"], store["Month"])
+    pos = np.searchsorted(old_keys, keys)
+    pos_ok = np.minimum(pos, max(len(old_keys) - 1, 0))
+    seen = (pos < len(old_keys)) & (old_keys[pos_ok] == keys) if len(old_keys) else np.zeros(len(keys), bool)
+    if seen.any():
+        values = [c for c in expected if c != "날짜"]
+        a = new.loc[seen, values].to_numpy(dtype=np.float32)
+        b = store[values].to_numpy(dtype=np.float32)[pos[seen]]
+        differ = ~((a == b) | np.isnan(a) | np.isnan(b))
+        conflict = differ.any(axis=1)
+        if conflict.any():
+            errors.append(f"이미 있는 달의 값이 다릅니다: {_fmt(keys[seen][conflict])} (저장소는 덧붙이기만 합니다)")
+        filled = (np.isnan(b) & ~np.isnan(a)).any(axis=1)
+        if filled.any():
+            notes.append(f"이미 있는 달의 빈 값은 고치지 않습니다: {_fmt(keys[seen][filled])}")
+        notes.append(f"이미 있는 달 {int(seen.sum())}개는 건너뜁니다.")
+    new = new.loc[~seen]
+    keys = keys[~seen]
+
+    # 연속성: 저장소 마지막 달 다음부터 빈 달 없이 이어져야 한다
+    if len(keys):
+        order = np.argsort(keys, kind="stable")
+        new, keys = new.iloc[order], keys[order]
+        start = old_keys[-1] + 1 if len(old_keys) else keys[0]
+        if keys[0] < start:
+            errors.append(f"저장소 중간에 끼워 넣을 수 없습니다: {_fmt(keys[keys < start])}")
+        else:
+            missing = np.setdiff1d(np.arange(start, keys[-1] + 1), keys)
+            if len(missing):
+                errors.append(f"빠진 달이 있습니다: {_fmt(missing)}")
+    else:
+        notes.append("추가할 새 달이 없습니다.")
+    return new, errors, notes
+
+
+def ingest(path, out=None, dry_run=False):
+    """검사를 통과하면 덧붙이고 (추가한 행 수, 새 버전, 안내 목록)을 돌려준다. 실패하면 ValueError."""
+    out = dataset.store_dir(out)
+    raw, notes = read(path)
+    # 검사부터 덧붙이기까지 잠가 두어야 두 ingest가 같은 달을 두 번 붙이지 않는다
+    with dataset.lock(out):
+        if dataset.read_meta(out) is None:
+            dataset.build(out=out)
+        meta = dataset.read_meta(out)
+        store = dataset.open_store(out, meta)
+
+        new, errors, more = validate(raw, store, meta.get("required"))
+        notes += more
+        if errors:
+            raise ValueError("\n".join(errors))
+        if dry_run or new is None or new.empty:
+            return 0, meta["version"], notes
+        # 기록을 먼저 남긴다: 덧붙이다 멈춰도 다음 빌드에서 그 달이 돌아온다
+        dataset.record_ingested(new, meta["source"])
+        meta = dataset.append(new, out)
+    return len(new), meta["version"], notes
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="새 월별 자료를 저장소에 덧붙입니다.")
+    parser.add_argument("csv")
+    parser.add_argument("--out", help="저장소 디렉터리 (기본: .enso_cache/dataset)")
+    parser.add_argument("--dry-run", action="store_true", help="검사만 하고 추가하지 않음")
+    args = parser.parse_args()
+    try:
+        added, ver, notes = ingest(args.csv, args.out, args.dry_run)
+    except ValueError as e:
+        print(f"추가하지 못했습니다:\n{e}", file=sys.stderr)
+        sys.exit(1)
+    for n in notes:
+        print(f"- {n}")
+    print(f"{added}개 달 추가, 데이터셋 버전 {ver}")
@@ -0,0 +1,37 @@
+import importlib
+import threading
+
+from enso import metrics
+
+# -----------------------
+# 지연 import
+# -----------------------
+# pandas, plotly 같은 무거운 모듈은 처음 속성을 쓸 때 불러온다. 인트로/로그인 화면만 그리는
+# 첫 실행은 이 모듈들을 건드리지 않으므로 새 워커의 첫 화면이 빨리 뜬다.
+# import 시간은 metrics에 "import.<모듈>" 구간으로 남는다.
+
+
+class Module:
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    with metrics.span(f"import.{self._name}"):
+                        self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __repr__(self):
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<lazy module {self._name!r} ({state})>"
+
+
+def module(name):
+    return Module(name)
@@ -0,0 +1,46 @@
+import numpy as np
+
+from enso.extrema import SparseTable
+
+# -----------------------
+# 긴 시계열 그래프의 점 줄이기 (level of detail)
+# -----------------------
+# 단계마다 연속된 4점 묶음에서 최댓값/최솟값 점만 남겨 점 수를 절반으로 줄인 피라미드를 미리 만든다.
+# 선택한 구간의 점이 MAX_POINTS 이하가 되는 가장 촘촘한 단계를 쓰므로, 좁은 구간은 원래 해상도로 보인다.
+# 구간 경계에서 묶음이 잘려도 그 구간의 최댓값/최솟값(정답 연도) 점은 항상 넣는다.
+MAX_POINTS = 1500   # 한 그래프에 보내는 최대 점 수
+WEBGL_POINTS = 600  # 이보다 많으면 WebGL(scattergl)로 그린다
+
+
+def _halve(v, idx):
+    pad = (-len(idx)) % 4
+    groups = np.concatenate((idx, np.repeat(idx[-1:], pad))).reshape(-1, 4)
+    vals = v[groups]
+    rows = np.arange(len(groups))
+    hi = groups[rows, np.argmax(np.where(np.isnan(vals), -np.inf, vals), axis=1)]
+    lo = groups[rows, np.argmin(np.where(np.isnan(vals), np.inf, vals), axis=1)]
+    return np.unique(np.concatenate((hi, lo)))
+
+
+class Pyramid:
+    def __init__(self, values, max_points=MAX_POINTS):
+        v = np.asarray(values, dtype=np.float64)
+        self.max_points = max_points
+        self.levels = [np.arange(len(v))]
+        while len(self.levels[-1]) > max(max_points // 2, 4):
+            self.levels.append(_halve(v, self.levels[-1]))
+        self._max = SparseTable(v, "max")
+        self._min = SparseTable(v, "min")
+
+    def indices(self, lo, hi, max_points=None):
+        """[lo, hi) 구간에서 그릴 점의 위치 (정렬됨)."""
+        max_points = max_points or self.max_points
+        for level in self.levels:
+            a, b = np.searchsorted(level, lo), np.searchsorted(level, hi)
+            if b - a <= max_points:
+                break
+        idx = level[a:b]
+        if level is self.levels[0]:
+            return idx
+        keep = [i for i in (self._max.argquery(lo, hi), self._min.argquery(lo, hi)) if i is not None]
+        return np.union1d(idx, np.asarray(keep, dtype=idx.dtype))
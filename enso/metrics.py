@@ -0,0 +1,195 @@
+import contextvars
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# -----------------------
+# 실행 구간 계측 (ENSO_METRICS=1 일 때만)
+# -----------------------
+# span()으로 감싼 구간의 소요 시간을 링 버퍼에 쌓고 이름별 합계를 유지한다.
+# 꺼져 있으면 span()은 아무 일도 하지 않는 공용 객체를 돌려주므로 비용이 거의 없다.
+ENABLE_ENV = "ENSO_METRICS"
+PORT_ENV = "ENSO_METRICS_PORT"
+HOST_ENV = "ENSO_METRICS_HOST"  # 기본은 이 컴퓨터에서만 (학교망 전체에 열려면 0.0.0.0)
+DEFAULT_HOST = "127.0.0.1"
+
+_enabled = os.environ.get(ENABLE_ENV) == "1"
+_lock = threading.Lock()
+_events = deque(maxlen=4096)  # (이름, 시작 시각, 소요 시간 초)
+_spans = {}  # 이름 -> [횟수, 합계, 최댓값]
+_counters = {}
+_gauges = {}  # 이름 -> dict를 돌려주는 함수
+_server = None
+_scope = contextvars.ContextVar("enso_metrics_scope", default="")
+
+
+class _NoopSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NOOP = _NoopSpan()
+
+
+class _Span:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        observe(self.name, time.perf_counter() - self.start)
+        return False
+
+
+def enabled():
+    return _enabled
+
+
+def enable(on=True):
+    global _enabled
+    _enabled = on
+
+
+def span(name):
+    if not _enabled:
+        return _NOOP
+    prefix = _scope.get()
+    return _Span(f"{prefix}.{name}" if prefix else name)
+
+
+@contextmanager
+def scope(name):
+    """구간 전체를 span으로 재고, 안에서 만든 span 이름 앞에 name을 붙인다 (예: mission2.chart.filter)."""
+    if not _enabled:
+        yield
+        return
+    token = _scope.set(name)
+    try:
+        with _Span(name):
+            yield
+    finally:
+        _scope.reset(token)
+
+
+def observe(name, seconds):
+    if not _enabled:
+        return
+    with _lock:
+        _events.append((name, time.time(), seconds))
+        agg = _spans.get(name)
+        if agg is None:
+            _spans[name] = [1, seconds, seconds]
+        else:
+            agg[0] += 1
+            agg[1] += seconds
+            if seconds > agg[2]:
+                agg[2] = seconds
+
+
+def count(name, n=1):
+    if not _enabled:
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + n
+
+
+def gauge(name, fn):
+    """export 때마다 fn()을 호출해 {키: 숫자} 값을 함께 내보낸다 (예: FigureCache.stats)."""
+    with _lock:
+        _gauges[name] = fn
+
+
+def reset():
+    with _lock:
+        _events.clear()
+        _spans.clear()
+        _counters.clear()
+
+
+def snapshot():
+    with _lock:
+        spans = {k: {"count": c, "total_s": t, "max_s": m} for k, (c, t, m) in _spans.items()}
+        counters = dict(_counters)
+        events = list(_events)
+        gauges = dict(_gauges)
+    return {
+        "enabled": _enabled,
+        "spans": spans,
+        "counters": counters,
+        "gauges": {k: fn() for k, fn in gauges.items()},
+        "recent": [{"name": n, "at": a, "seconds": s} for n, a, s in events],
+    }
+
+
+def export_json():
+    return json.dumps(snapshot(), ensure_ascii=False)
+
+
+def _metric_name(name):
+    return "".join(c if c.isalnum() else "_" for c in name)
+
+
+def export_prometheus():
+    snap = snapshot()
+    lines = [
+        "# TYPE enso_span_seconds_total counter",
+        "# TYPE enso_span_count counter",
+        "# TYPE enso_span_max_seconds gauge",
+    ]
+    for name, s in sorted(snap["spans"].items()):
+        label = f'{{span="{name}"}}'
+        lines.append(f"enso_span_seconds_total{label} {s['total_s']:.6f}")
+        lines.append(f"enso_span_count{label} {s['count']}")
+        lines.append(f"enso_span_max_seconds{label} {s['max_s']:.6f}")
+    for name, v in sorted(snap["counters"].items()):
+        lines.append(f"enso_{_metric_name(name)}_total {v}")
+    for name, values in sorted(snap["gauges"].items()):
+        for k, v in sorted(values.items()):
+            lines.append(f"enso_{_metric_name(name)}_{_metric_name(k)} {v}")
+    return "\n".join(lines) + "\n"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.startswith("/metrics.json"):
+            body, ctype = export_json(), "application/json"
+        elif self.path.startswith("/metrics"):
+            body, ctype = export_prometheus(), "text/plain; version=0.0.4"
+        else:
+            self.send_error(404)
+            return
+        data = body.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", f"{ctype}; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+def serve(port=None, host=None):
+    """/metrics(Prometheus 텍스트)와 /metrics.json을 백그라운드 스레드에서 제공한다. 한 번만 뜬다."""
+    global _server
+    port = port or os.environ.get(PORT_ENV)
+    host = host or os.environ.get(HOST_ENV) or DEFAULT_HOST
+    if not _enabled or not port or _server is not None:
+        return _server
+    with _lock:
+        if _server is None:
+            _server = ThreadingHTTPServer((host, int(port)), _Handler)
+            threading.Thread(target=_server.serve_forever, name="enso-metrics", daemon=True).start()
+    return _server
@@ -0,0 +1,327 @@
+import os
+import sys
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+# -----------------------
+# ONI 계산 (nino3.4 수온 평균 → 평년값, 편차, 3개월 이동평균)
+# -----------------------
+# 자료 제공처가 계산해 준 'ONI index' 대신 원래 수온에서 직접 구한다.
+# 평년값은 달(1~12월)별 연도 누적합으로 구하므로 어떤 기준 기간이든 한 번의 뺄셈으로 나오고,
+# 새 달이 붙을 때도 누적합 한 칸만 늘리면 된다.
+SST_COL = "nino3.4 수온 평균"
+BASE_ENV = "ENSO_ONI_BASE"        # "1991-2020" 같은 고정 기준 기간, 또는 "sliding"
+PARTIAL_ENV = "ENSO_ONI_PARTIAL"  # 1이면 끝 달도 절반 이상 채워진 창으로 계산
+
+DEFAULT_BASE = (1991, 2020)
+WINDOW = 3
+
+# 자료와 같은 이름의 컬럼으로 내보낸다. 표준편차는 자료 제공처의 값(달마다 하나)과 정의가 달라
+# (어느 기준 기간, 자유도로 구해도 0.05°C 이상 차이) 같은 이름으로 내보내지 않고 compute()에만 둔다.
+COLUMNS = {
+    "anomaly": "nino3.4 index",
+    "oni": "ONI index",
+    "mean": "nino3.4 수온 평균(3개월)",
+    "clim": "nino3.4 수온 평년평균",
+}
+
+
+def parse_base(text):
+    """'1991-2020' → (1991, 2020), 'sliding' 또는 빈 값 → None(이동 기준 기간)."""
+    text = (text or "").strip().lower()
+    if text in ("", "sliding"):
+        return None
+    start, end = (int(x) for x in text.replace("~", "-").split("-"))
+    if end < start:
+        raise ValueError(f"기준 기간이 잘못되었습니다: {text}")
+    return start, end
+
+
+def settings():
+    """환경 변수에서 (기준 기간, 최소 개월 수)를 읽는다."""
+    base = parse_base(os.environ.get(BASE_ENV, "{}-{}".format(*DEFAULT_BASE)))
+    partial = os.environ.get(PARTIAL_ENV, "") not in ("", "0")
+    return base, (WINDOW // 2 + 1 if partial else WINDOW)
+
+
+# -----------------------
+# 기준 기간
+# -----------------------
+def sliding_base(years, first, last, length=30, step=5):
+    """CPC 방식 이동 기준 기간: 5년 묶음마다 그 묶음을 가운데에 둔 30년.
+
+    자료 범위(first~last, 12달이 다 있는 해) 밖으로 나가면 안쪽으로 밀어 넣는다.
+    """
+    years = np.asarray(years, dtype=np.int64)
+    if last - first + 1 <= length:
+        return np.full_like(years, first), np.full_like(years, last)
+    block = years - (years - 1) % step
+    start = np.clip(block - length // 2, first, last - length + 1)
+    return start, start + length - 1
+
+
+def full_years(years):
+    """12달이 모두 있는 첫 해와 마지막 해."""
+    years = np.asarray(years, dtype=np.int64)
+    counts = np.bincount(years - years.min(), minlength=1)
+    full = np.flatnonzero(counts >= 12) + years.min()
+    if len(full) == 0:
+        return int(years.min()), int(years.max())
+    return int(full[0]), int(full[-1])
+
+
+# -----------------------
+# 일괄 계산
+# -----------------------
+def accumulate(years, months, sst):
+    """연도 × 달 격자의 연도 방향 누적합 (합, 제곱합, 개수). 0번 행은 0."""
+    y0 = int(years.min())
+    ny = int(years.max()) - y0 + 1
+    grid = np.full((ny, 12), np.nan)  # 빠진 달은 NaN
+    grid[years - y0, months - 1] = sst
+    ok = ~np.isnan(grid)
+    g = np.where(ok, grid, 0.0)
+    zero = np.zeros((1, 12))
+    s1 = np.concatenate((zero, np.cumsum(g, axis=0)))
+    s2 = np.concatenate((zero, np.cumsum(g * g, axis=0)))
+    cnt = np.concatenate((zero, np.cumsum(ok, axis=0))).astype(np.int64)
+    return y0, s1, s2, cnt
+
+
+def rolling_mean(values, window=WINDOW, min_periods=None):
+    """가운데 정렬 이동평균. NaN은 건너뛰고, 창 안의 값이 min_periods보다 적으면 NaN."""
+    v = np.asarray(values, dtype=np.float64)
+    min_periods = window if min_periods is None else min_periods
+    ok = ~np.isnan(v)
+    half = window // 2
+    cs = np.concatenate(([0.0], np.cumsum(np.where(ok, v, 0.0))))
+    cn = np.concatenate(([0], np.cumsum(ok)))
+    i = np.arange(len(v))
+    lo = np.clip(i - half, 0, len(v))
+    hi = np.clip(i + half + 1, 0, len(v))
+    n = cn[hi] - cn[lo]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        out = (cs[hi] - cs[lo]) / n
+    return np.where(n >= max(min_periods, 1), out, np.nan)
+
+
+def compute(years, months, sst, base=DEFAULT_BASE, window=WINDOW, min_periods=None, length=30, step=5):
+    """월별 수온에서 평년값, 표준편차, 편차, 3개월 평균, ONI를 한 번에 구한다.
+
+    base가 None이면 이동 기준 기간(sliding_base)을 쓴다. 행 순서는 그대로 두고 값만 돌려준다.
+    """
+    years = np.asarray(years, dtype=np.int64)
+    months = np.asarray(months, dtype=np.int64)
+    sst = np.asarray(sst, dtype=np.float64)
+    y0, s1, s2, cnt = accumulate(years, months, sst)
+    ny = len(s1) - 1
+
+    # 행마다 기준 기간 [start, end]
+    if base is None:
+        first, last = full_years(years)
+        start, end = sliding_base(years, first, last, length, step)
+    else:
+        start = np.full_like(years, base[0])
+        end = np.full_like(years, base[1])
+    lo = np.clip(start - y0, 0, ny)
+    hi = np.clip(end - y0 + 1, 0, ny)
+    m = months - 1
+    n = cnt[hi, m] - cnt[lo, m]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        clim = (s1[hi, m] - s1[lo, m]) / n
+        var = ((s2[hi, m] - s2[lo, m]) - n * clim * clim) / (n - 1)
+    clim = np.where(n > 0, clim, np.nan)
+    std = np.sqrt(np.where(n > 1, np.maximum(var, 0.0), np.nan))
+    anomaly = sst - clim
+
+    # 이동평균은 빠진 달을 건너뛰지 않도록 연속된 월 격자에서 구한 뒤 행으로 돌려놓는다
+    pos = (years - y0) * 12 + m
+    flat_sst = np.full(ny * 12, np.nan)
+    flat_anom = np.full(ny * 12, np.nan)
+    flat_sst[pos] = sst
+    flat_anom[pos] = anomaly
+    return {
+        "clim": clim,
+        "std": std,
+        "anomaly": anomaly,
+        "mean": rolling_mean(flat_sst, window, min_periods)[pos],
+        "oni": rolling_mean(flat_anom, window, min_periods)[pos],
+    }
+
+
+def frame(df, base=DEFAULT_BASE, window=WINDOW, min_periods=None, sst_col=SST_COL):
+    """정규화된 프레임(Year, Month, 수온 컬럼)에서 자료와 같은 이름의 컬럼을 다시 계산한다."""
+    out = compute(df["Year"].to_numpy(), df["Month"].to_numpy(), df[sst_col].to_numpy(),
+                  base=base, window=window, min_periods=min_periods)
+    return pd.DataFrame({c: out[k].astype(np.float32) for k, c in COLUMNS.items()}, index=df.index)
+
+
+# -----------------------
+# 증분 계산
+# -----------------------
+class Stream:
+    """한 달씩 붙이며 ONI를 갱신한다. append 한 번이 O(1)이다.
+
+    달별 누적합을 연도 방향으로 한 칸씩 늘리고, 최근 window개의 편차만 들고 있다가
+    창이 차면 가운데 달의 ONI를 돌려준다. 이동 기준 기간일 때는 붙이는 시점까지
+    12달이 다 찬 해로 기간을 정하고, 이미 낸 값은 고치지 않는다(실시간 발표 방식).
+    """
+
+    def __init__(self, base=DEFAULT_BASE, window=WINDOW, length=30, step=5):
+        self.base = base
+        self.window = window
+        self.length = length
+        self.step = step
+        self.y0 = None
+        self.last = None  # 마지막으로 붙인 (연, 월)
+        self.first_full = None
+        self.last_full = None
+        self.month_count = 0
+        self.seeded_full = None  # from_frame으로 채운 자료에서 12달이 다 있는 마지막 해
+        # 달별 연도 누적합 (인덱스 k = y0부터 k년까지의 합)
+        self.s1 = [[0.0] for _ in range(12)]
+        self.s2 = [[0.0] for _ in range(12)]
+        self.cnt = [[0] for _ in range(12)]
+        self.recent = deque(maxlen=window)  # (연, 월, 편차)
+
+    @classmethod
+    def from_frame(cls, df, sst_col=SST_COL, **kw):
+        """지금까지의 자료로 누적합을 한 번에 채운다.
+
+        이후 append가 일괄 계산(frame)과 같은 값을 내는 것은 고정 기준 기간이 채운 자료 안에 다 들어 있을 때뿐이다
+        (exact). 아니면 일괄 계산은 뒤에 붙은 달까지 평년값에 넣지만 append는 그때까지 붙은 달만 쓴다.
+        """
+        stream = cls(**kw)
+        years = df["Year"].to_numpy().astype(np.int64)
+        months = df["Month"].to_numpy().astype(np.int64)
+        sst = df[sst_col].to_numpy().astype(np.float64)
+        if len(years) == 0:
+            return stream
+
+        stream.y0, s1, s2, cnt = accumulate(years, months, sst)
+        stream.s1 = s1.T.tolist()
+        stream.s2 = s2.T.tolist()
+        stream.cnt = cnt.T.tolist()
+        stream.last = (int(years[-1]), int(months[-1]))
+        counts = np.bincount(years - stream.y0)
+        stream.month_count = int(counts[-1]) if counts[-1] == months[-1] else 0
+        if (counts >= 12).any():
+            stream.first_full, stream.last_full = full_years(years)
+            stream.seeded_full = stream.last_full
+
+        anomaly = compute(years, months, sst, base=stream.base, window=stream.window,
+                          length=stream.length, step=stream.step)["anomaly"]
+        for y, m, a in zip(years[-stream.window:], months[-stream.window:], anomaly[-stream.window:]):
+            stream.recent.append((int(y), int(m), float(a)))
+        return stream
+
+    @property
+    def exact(self):
+        """append가 일괄 계산과 같은 값을 내는지: 고정 기준 기간의 끝 해가 from_frame으로 채운 자료 안에 있다."""
+        return self.base is not None and self.seeded_full is not None and self.base[1] <= self.seeded_full
+
+    def _period(self, year):
+        if self.base is not None:
+            return self.base
+        if self.first_full is None:
+            return self.y0, year
+        start, end = sliding_base([year], self.first_full, self.last_full, self.length, self.step)
+        return int(start[0]), int(end[0])
+
+    def climatology(self, year, month):
+        """(평년값, 표준편차). 누적합 두 칸의 차이라 O(1)."""
+        start, end = self._period(year)
+        k = month - 1
+        top = len(self.s1[k]) - 1
+        lo = min(max(start - self.y0, 0), top)
+        hi = min(max(end - self.y0 + 1, 0), top)
+        n = self.cnt[k][hi] - self.cnt[k][lo]
+        if n == 0:
+            return float("nan"), float("nan")
+        mean = (self.s1[k][hi] - self.s1[k][lo]) / n
+        if n < 2:
+            return mean, float("nan")
+        var = ((self.s2[k][hi] - self.s2[k][lo]) - n * mean * mean) / (n - 1)
+        return mean, max(var, 0.0) ** 0.5
+
+    def append(self, year, month, sst):
+        """다음 달 값을 붙이고, 창이 찼으면 (연, 월, ONI)를 돌려준다."""
+        if self.last is not None:
+            ly, lm = self.last
+            expected = (ly + lm // 12, lm % 12 + 1)
+            if (year, month) != expected:
+                raise ValueError(f"{expected[0]}년 {expected[1]:02d}월 자료가 와야 합니다. (받은 값: {year}년 {month:02d}월)")
+        else:
+            self.y0 = year
+        self.last = (year, month)
+
+        k = month - 1
+        idx = year - self.y0 + 1
+        # 중간에 빠진 해가 없으므로 달별 목록은 최대 한 칸씩만 늘어난다
+        while len(self.s1[k]) <= idx:
+            self.s1[k].append(self.s1[k][-1])
+            self.s2[k].append(self.s2[k][-1])
+            self.cnt[k].append(self.cnt[k][-1])
+        if not np.isnan(sst):
+            self.s1[k][idx] += sst
+            self.s2[k][idx] += sst * sst
+            self.cnt[k][idx] += 1
+
+        self.month_count = self.month_count + 1 if month != 1 else 1
+        if month == 12 and self.month_count == 12:
+            self.first_full = year if self.first_full is None else self.first_full
+            self.last_full = year
+
+        clim, _ = self.climatology(year, month)
+        self.recent.append((year, month, sst - clim))
+        if len(self.recent) < self.window:
+            return None
+        anoms = [a for _, _, a in self.recent if not np.isnan(a)]
+        cy, cm, _ = self.recent[self.window // 2]
+        oni = sum(anoms) / len(anoms) if len(anoms) == self.window else float("nan")
+        return cy, cm, oni
+
+
+def extend(prev, df, stream, sst_col=SST_COL):
+    """frame()의 결과 prev 뒤에 df의 새 행들을 stream(Stream)으로 이어 붙인다. 새 행 수만큼의 계산만 한다.
+
+    stream은 prev까지의 자료로 채워져 있어야 하고 이 함수가 새 행만큼 늘린다. 끝 달은 창이 다 찬 값만 낸다
+    (min_periods=window). stream.exact가 아니거나 새 행이 마지막 달 다음부터 빈 달 없이 이어지지 않으면
+    None을 돌려주므로 frame()으로 다시 계산한다.
+    """
+    n = len(prev)
+    if not stream.exact or len(df) < n:
+        return None
+    years = df["Year"].to_numpy()[n:].astype(np.int64)
+    months = df["Month"].to_numpy()[n:].astype(np.int64)
+    keys = years * 12 + months - 1
+    last = stream.last[0] * 12 + stream.last[1] - 1
+    if not np.array_equal(keys, last + 1 + np.arange(len(keys))):
+        return None
+
+    out = {k: np.concatenate((prev[c].to_numpy(dtype=np.float64), np.full(len(keys), np.nan)))
+           for k, c in COLUMNS.items()}
+    sst = df[sst_col].to_numpy().astype(np.float64)
+    half = stream.window // 2
+    for i, (y, m) in enumerate(zip(years.tolist(), months.tolist()), start=n):
+        done = stream.append(y, m, sst[i])
+        out["clim"][i] = stream.climatology(y, m)[0]
+        out["anomaly"][i] = sst[i] - out["clim"][i]
+        if done is not None:
+            # 창이 다 찬 가운데 달: 이전 자료의 끝 달도 여기서 값이 생긴다
+            out["oni"][i - half] = done[2]
+            out["mean"][i - half] = sst[i - stream.window + 1:i + 1].mean()
+    return pd.DataFrame({COLUMNS[k]: v.astype(np.float32) for k, v in out.items()}, index=df.index)[prev.columns]
+
+
+if __name__ == "__main__":
+    # python -m enso.oni [기준 기간 | sliding] > oni.csv
+    from enso import dataset
+
+    df = dataset.load()
+    base = parse_base(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_BASE
+    out = frame(df, base=base, min_periods=settings()[1])
+    out.insert(0, "날짜", df["날짜"].to_numpy())
+    out.iloc[::-1].to_csv(sys.stdout, index=False)
@@ -0,0 +1,221 @@
+import os
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+# -----------------------
+# 학생 진행 상황 저장소
+# -----------------------
+# 세션 상태(mission, codes, start_time, end_time, q{n}_correct)를 (반 코드, 학생 ID, 앱)으로 저장해
+# 새로고침이나 서버 재시작 후에도 이어서 할 수 있게 한다. 멀티페이지 앱에서는 페이지(앱)마다 따로 저장된다.
+DB_ENV = "ENSO_PROGRESS_DB"
+MAX_MISSIONS = 31  # correct 비트마스크에 담는 미션 수
+
+
+@dataclass(frozen=True)
+class Progress:
+    class_code: str
+    student_id: str
+    variant: str  # 앱(Variant) 키
+    mission: int = 0
+    codes: str = ""  # 획득한 암호 조각 (획득 순서대로)
+    correct: int = 0  # 정답을 맞힌 미션 비트마스크 (gated 앱의 q{n}_correct)
+    start_time: float | None = None
+    end_time: float | None = None
+
+    def row(self):
+        return (self.class_code, self.student_id, self.variant, self.mission, self.codes, self.correct,
+                self.start_time, self.end_time)
+
+
+def snapshot(state, class_code, student_id, variant):
+    """세션 상태를 Progress 레코드로 만든다."""
+    correct = 0
+    for n in range(1, MAX_MISSIONS + 1):
+        if state.get(f"q{n}_correct"):
+            correct |= 1 << (n - 1)
+    return Progress(class_code, student_id, variant, int(state.get("mission", 0)), "".join(state.get("codes", [])),
+                    correct, state.get("start_time"), state.get("end_time"))
+
+
+def restore(progress, state):
+    """저장된 Progress를 세션 상태에 되돌린다."""
+    state["mission"] = progress.mission
+    state["codes"] = list(progress.codes)
+    state["start_time"] = progress.start_time
+    state["end_time"] = progress.end_time
+    for n in range(1, MAX_MISSIONS + 1):
+        if progress.correct & (1 << (n - 1)):
+            state[f"q{n}_correct"] = True
+
+
+class ProgressStore:
+    def load(self, class_code, student_id, variant):
+        raise NotImplementedError
+
+    def save(self, progress):
+        raise NotImplementedError
+
+    def list_class(self, class_code, variant=None):
+        raise NotImplementedError
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class MemoryProgressStore(ProgressStore):
+    def __init__(self):
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def load(self, class_code, student_id, variant):
+        with self._lock:
+            return self._data.get((class_code, student_id, variant))
+
+    def save(self, progress):
+        with self._lock:
+            self._data[(progress.class_code, progress.student_id, progress.variant)] = progress
+
+    def list_class(self, class_code, variant=None):
+        with self._lock:
+            return [p for (c, _, v), p in self._data.items() if c == class_code and variant in (None, v)]
+
+
+# 앱별로 저장하고 암호 조각을 글자로 담는다
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS student_progress (
+    class_code TEXT NOT NULL,
+    student_id TEXT NOT NULL,
+    variant TEXT NOT NULL,
+    mission INTEGER NOT NULL,
+    codes TEXT NOT NULL,
+    correct INTEGER NOT NULL,
+    start_time REAL,
+    end_time REAL,
+    PRIMARY KEY (class_code, student_id, variant)
+) WITHOUT ROWID
+"""
+
+_UPSERT = "INSERT OR REPLACE INTO student_progress VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+
+
+class SQLiteProgressStore(ProgressStore):
+    """WAL 모드 SQLite. 쓰기는 전용 스레드 하나가 모아서 처리하고, 읽기는 연결 풀을 쓴다."""
+
+    def __init__(self, path, pool_size=4, batch_size=256, flush_interval=0.2):
+        self.path = str(path)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        conn = self._connect()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(_SCHEMA)
+        conn.commit()
+        self._writer_conn = conn
+
+        self._readers = queue.Queue()
+        for _ in range(pool_size):
+            self._readers.put(self._connect())
+
+        # 아직 디스크에 쓰지 않은 최신 레코드 (같은 학생의 연속 저장은 하나로 합쳐진다)
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._queue = queue.Queue()
+        self._writer = threading.Thread(target=self._write_loop, name="progress-writer", daemon=True)
+        self._writer.start()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    @contextmanager
+    def _reader(self):
+        conn = self._readers.get()
+        try:
+            yield conn
+        finally:
+            self._readers.put(conn)
+
+    def _write_loop(self):
+        while True:
+            item = self._queue.get()
+            waiters = []
+            stop = False
+            # 잠깐 기다리며 들어온 요청을 모아 한 트랜잭션으로 쓴다
+            while True:
+                if item is None:
+                    stop = True
+                elif isinstance(item, threading.Event):
+                    waiters.append(item)
+                if self._queue.qsize() >= self.batch_size:
+                    item = self._queue.get()
+                    continue
+                try:
+                    item = self._queue.get(timeout=self.flush_interval if not (stop or waiters) else 0)
+                except queue.Empty:
+                    break
+
+            with self._lock:
+                rows = [p.row() for p in self._pending.values()]
+                self._pending.clear()
+            if rows:
+                self._writer_conn.executemany(_UPSERT, rows)
+                self._writer_conn.commit()
+            for w in waiters:
+                w.set()
+            if stop:
+                return
+
+    def load(self, class_code, student_id, variant):
+        with self._lock:
+            pending = self._pending.get((class_code, student_id, variant))
+        if pending is not None:
+            return pending
+        with self._reader() as conn:
+            row = conn.execute(
+                "SELECT * FROM student_progress WHERE class_code = ? AND student_id = ? AND variant = ?",
+                (class_code, student_id, variant),
+            ).fetchone()
+        return Progress(*row) if row else None
+
+    def save(self, progress):
+        with self._lock:
+            self._pending[(progress.class_code, progress.student_id, progress.variant)] = progress
+        self._queue.put(True)
+
+    def list_class(self, class_code, variant=None):
+        self.flush()
+        with self._reader() as conn:
+            if variant is None:
+                rows = conn.execute("SELECT * FROM student_progress WHERE class_code = ?", (class_code,)).fetchall()
+            else:
+                rows = conn.execute("SELECT * FROM student_progress WHERE class_code = ? AND variant = ?",
+                                    (class_code, variant)).fetchall()
+        return [Progress(*r) for r in rows]
+
+    def flush(self):
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait()
+
+    def close(self):
+        self._queue.put(None)
+        self._writer.join()
+        self._writer_conn.close()
+        while not self._readers.empty():
+            self._readers.get().close()
+
+
+def open_store(path=None):
+    """ENSO_PROGRESS_DB가 설정되어 있으면 SQLite 저장소를 연다. 없으면 None."""
+    path = path or os.environ.get(DB_ENV)
+    if not path:
+        return None
+    return SQLiteProgressStore(path)
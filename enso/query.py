@@ -0,0 +1,46 @@
+import numpy as np
+
+from enso import metrics
+
+# -----------------------
+# 연도/월 범위 조회
+# -----------------------
+# 날짜순으로 정렬된 프레임에서 연도 범위를 이진 탐색으로 찾아 슬라이스로 돌려준다.
+# 월 선택은 월별 행 위치 배열을 같은 방식으로 잘라 그 행만 꺼낸다. 월별 프레임 복사본을 들고 있지 않으므로
+# memmap 저장소의 프레임이면 워커마다 따로 늘어나는 메모리는 위치 배열뿐이다.
+
+
+def _bounds(years, lo, hi):
+    return (
+        int(np.searchsorted(years, lo, side="left")),
+        int(np.searchsorted(years, hi, side="right")),
+    )
+
+
+class YearIndex:
+    def __init__(self, df):
+        if not df["Year"].is_monotonic_increasing:
+            df = df.sort_values(["Year", "Month"], kind="stable")
+        self.df = df
+        self.years = df["Year"].to_numpy()
+        self.min_year = int(self.years[0]) if len(df) else 0
+        self.max_year = int(self.years[-1]) if len(df) else 0
+
+        months = df["Month"].to_numpy()
+        self._by_month = {}
+        for m in range(1, 13):
+            rows = np.flatnonzero(months == m)
+            self._by_month[m] = (rows, self.years[rows])
+
+    def span(self, year_range, month=None):
+        """(lo, hi) 행 위치. month를 주면 해당 월 프레임 기준 위치."""
+        years = self.years if month is None else self._by_month[int(month)][1]
+        return _bounds(years, year_range[0], year_range[1])
+
+    def select(self, year_range, month=None):
+        """year_range 양끝을 포함하는 구간. 월을 주지 않으면 복사 없이 슬라이스로 돌려준다."""
+        with metrics.span("filter"):
+            lo, hi = self.span(year_range, month)
+            if month is None:
+                return self.df.iloc[lo:hi]
+            return self.df.iloc[self._by_month[int(month)][0][lo:hi]]
@@ -0,0 +1,158 @@
+import argparse
+import sys
+from dataclasses import asdict, dataclass
+
+# -----------------------
+# 시계열 목록 (지역/지수별 컬럼)
+# -----------------------
+# 저장소 하나에 여러 지역(Niño1+2, 3, 3.4, 4), SOI, 국내 관측소 기온 같은 월별 시계열을
+# 컬럼으로 나란히 두고, 어떤 컬럼이 어떤 시계열인지는 meta.json의 "series"에 적는다.
+# 컬럼마다 파일이 따로 있으므로 시계열을 더해도 다른 컬럼을 다시 쓰거나 읽지 않는다.
+# 더한 시계열은 원본 CSV 옆 기록 파일에도 남겨서, 저장소를 다시 빌드해도 사라지지 않는다.
+#
+#   python -m enso.registry                                   # 목록
+#   python -m enso.registry add nino4.csv --column "nino4 index" --label "Niño4 지수"
+REGIONS = {
+    "nino1+2": "Niño1+2",
+    "nino3": "Niño3",
+    "nino3.4": "Niño3.4",
+    "nino4": "Niño4",
+}
+
+
+@dataclass(frozen=True)
+class Series:
+    key: str  # "nino3.4:sst", "nino4:index", "soi", "station:서울" ...
+    column: str
+    label: str
+    kind: str  # "sst" | "index" | "oni" | "soi" | "station" | "other"
+    region: str | None = None
+    unit: str = ""
+
+
+def infer(column):
+    """컬럼 이름으로 시계열 정보를 추측한다. 모르는 이름은 kind="other"."""
+    name = column.strip()
+    low = name.lower()
+    if low == "oni index":
+        return Series("nino3.4:oni", name, "ONI", "oni", "nino3.4")
+    if low in ("soi", "soi index"):
+        return Series("soi", name, "남방진동지수(SOI)", "soi")
+    for region, label in sorted(REGIONS.items(), key=lambda kv: -len(kv[0])):
+        if not low.startswith(region + " "):
+            continue
+        rest = low[len(region) + 1:]
+        if rest == "index":
+            return Series(f"{region}:index", name, f"{label} 지수", "index", region)
+        if rest == "수온 평균":
+            return Series(f"{region}:sst", name, f"{label} 수온", "sst", region, "°C")
+    if low.endswith(" 기온"):
+        station = name[: -len(" 기온")]
+        return Series(f"station:{station}", name, f"{station} 기온", "station", None, "°C")
+    return Series(name, name, name, "other")
+
+
+class Registry:
+    def __init__(self, series):
+        self.series = list(series)
+        self._by_key = {s.key: s for s in self.series}
+        self._by_column = {s.column: s for s in self.series}
+
+    @classmethod
+    def from_columns(cls, columns):
+        return cls(infer(c) for c in columns)
+
+    @classmethod
+    def from_meta(cls, entries):
+        return cls(Series(**e) for e in entries)
+
+    def to_meta(self):
+        return [asdict(s) for s in self.series]
+
+    def __contains__(self, key):
+        return key in self._by_key
+
+    def get(self, key):
+        return self._by_key[key]
+
+    def by_column(self, column):
+        return self._by_column.get(column)
+
+    def of_kind(self, kind):
+        return [s for s in self.series if s.kind == kind]
+
+    def column(self, key, default=None):
+        s = self._by_key.get(key)
+        return s.column if s is not None else default
+
+
+def add(path, column, key=None, label=None, kind=None, out=None):
+    """CSV 하나(날짜 + column)를 저장소의 달에 맞춰 새 컬럼으로 붙인다. 추가한 Series를 돌려준다.
+
+    저장소에 없는 달의 값은 버리고, CSV에 없는 달은 NaN이다.
+    """
+    import numpy as np
+
+    from enso import dataset, ingest
+
+    raw, notes = ingest.read(path)
+    for n in notes:
+        print(f"- {n}")
+    if "날짜" not in raw.columns or column not in raw.columns:
+        raise ValueError(f"CSV에 '날짜'와 '{column}' 컬럼이 필요합니다.")
+
+    out = dataset.store_dir(out)
+    with dataset.lock(out):
+        meta = dataset.read_meta(out)
+        if meta is None:
+            dataset.build(out=out)
+            meta = dataset.read_meta(out)
+        store = dataset.open_store(out, meta)
+        if column in store.columns:
+            raise ValueError(f"이미 있는 컬럼입니다: {column}")
+
+        dates = dataset._parse_dates(raw["날짜"])
+        values = ingest.parse_numbers(raw[column], column)
+        ok = dates.notna().to_numpy()
+        keys = ingest.month_keys(dates[ok].dt.year, dates[ok].dt.month)
+        store_keys = ingest.month_keys(store["Year"], store["Month"])
+        pos = np.searchsorted(store_keys, keys)
+        hit = (pos < len(store_keys)) & (store_keys[np.minimum(pos, len(store_keys) - 1)] == keys)
+        aligned = np.full(len(store), np.nan, dtype=np.float32)
+        aligned[pos[hit]] = values[ok][hit]
+
+        guess = infer(column)
+        series = Series(key or guess.key, column, label or guess.label, kind or guess.kind, guess.region, guess.unit)
+        reg = Registry.from_meta(store.attrs["series"])
+        if series.key in reg:
+            raise ValueError(f"이미 있는 시계열 키입니다: {series.key}")
+        # 기록을 먼저 남긴다: 컬럼을 붙이다 멈춰도 다음 빌드에서 그 시계열이 돌아온다
+        dataset.record_series(asdict(series), dates[ok], values[ok], meta["source"])
+        dataset.add_column(out, column, aligned, series=Registry(reg.series + [series]).to_meta())
+        print(f"{series.key}: {int(hit.sum())}/{len(store)}개 달 채움 ({len(keys) - int(hit.sum())}개는 저장소 범위 밖)")
+        return series
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="저장소의 시계열 목록을 보거나 새 시계열을 붙입니다.")
+    sub = parser.add_subparsers(dest="cmd")
+    p_add = sub.add_parser("add")
+    p_add.add_argument("csv")
+    p_add.add_argument("--column", required=True)
+    p_add.add_argument("--key")
+    p_add.add_argument("--label")
+    p_add.add_argument("--kind")
+    p_add.add_argument("--out")
+    args = parser.parse_args()
+
+    if args.cmd == "add":
+        try:
+            add(args.csv, args.column, args.key, args.label, args.kind, args.out)
+        except ValueError as e:
+            print(f"추가하지 못했습니다: {e}", file=sys.stderr)
+            sys.exit(1)
+    else:
+        from enso import dataset
+
+        for s in Registry.from_meta(dataset.load().attrs["series"]).series:
+            print(f"{s.key:20} {s.column:28} {s.label}")
@@ -0,0 +1,153 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+from enso import data
+
+# -----------------------
+# 시작 시간 프로파일
+# -----------------------
+# 새 워커가 뜰 때 걸리는 시간을 매번 새 프로세스에서 잰다.
+#   - import: python -X importtime으로 enso.engine을 불러올 때 모듈별 누적 시간
+#   - 첫 화면: AppTest로 앱을 처음 실행한 시간, 그리고 첫 미션 화면이 뜰 때까지의 시간
+#
+#   python -m enso.startup --app app2.py --out startup.json
+#   python -m enso.startup --app app2.py --max-import-ms 150 --baseline startup.json   (회귀 검사)
+HEAVY = ["pandas", "numpy", "plotly.express"]
+
+RENDER_SCRIPT = """
+import json, logging, sys, time
+logging.disable(logging.WARNING)
+from streamlit.testing.v1 import AppTest
+
+app, intro_wait = sys.argv[1], float(sys.argv[2])
+at = AppTest.from_file(app, default_timeout=120)
+t = time.perf_counter()
+at.run()
+first = time.perf_counter() - t
+heavy = [m for m in {heavy!r} if m in sys.modules]
+
+mission = first
+if at.session_state.mission == 0:
+    time.sleep(intro_wait)  # 학생이 인트로를 읽는 시간
+    t = time.perf_counter()
+    at.button[0].click().run()
+    mission = time.perf_counter() - t
+print(json.dumps({{"first_ms": first * 1000, "first_mission_ms": mission * 1000, "heavy_at_first": heavy,
+                  "errors": [e.value for e in at.exception]}}))
+"""
+
+
+def _env():
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(data.ROOT), env.get("PYTHONPATH")]))
+    return env
+
+
+def parse_importtime(text):
+    """-X importtime 출력 → {모듈: (self ms, 누적 ms)}"""
+    out = {}
+    for line in text.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        self_us, cum_us, name = line[len("import time:"):].split("|")
+        out.setdefault(name.strip(), (int(self_us) / 1000, int(cum_us) / 1000))
+    return out
+
+
+def import_profile(module="enso.engine"):
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                          cwd=data.ROOT, env=_env(), capture_output=True, text=True, check=True)
+    times = parse_importtime(proc.stderr)
+    own = sorted(((n, t[0]) for n, t in times.items() if n.split(".")[0] == "enso"), key=lambda x: -x[1])
+    return {
+        "module": module,
+        "total_ms": times[module][1],
+        "streamlit_ms": times.get("streamlit", (0, 0))[1],
+        "enso_self_ms": sum(t for _, t in own),
+        "slowest_enso": dict(own[:5]),
+        "heavy_loaded": {m: times[m][1] for m in HEAVY if m in times},
+    }
+
+
+def render_profile(app, intro_wait=0.0):
+    script = RENDER_SCRIPT.format(heavy=HEAVY)
+    proc = subprocess.run([sys.executable, "-c", script, str(app), str(intro_wait)],
+                          cwd=data.ROOT, env=_env(), capture_output=True, text=True, check=True)
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def report(app, repeat=3, intro_wait=0.0):
+    imports = [import_profile() for _ in range(repeat)]
+    renders = [render_profile(app, intro_wait) for _ in range(repeat)]
+
+    def median(rows, key):
+        return statistics.median(r[key] for r in rows)
+
+    return {
+        "app": Path(app).name,
+        "repeat": repeat,
+        "intro_wait_s": intro_wait,
+        "import_ms": median(imports, "total_ms"),
+        "import_enso_self_ms": median(imports, "enso_self_ms"),
+        "streamlit_import_ms": median(imports, "streamlit_ms"),
+        "first_render_ms": median(renders, "first_ms"),
+        "first_mission_ms": median(renders, "first_mission_ms"),
+        "slowest_enso_modules": imports[-1]["slowest_enso"],
+        "heavy_loaded_by_import": imports[-1]["heavy_loaded"],
+        "heavy_loaded_at_first_render": renders[-1]["heavy_at_first"],
+        "errors": renders[-1]["errors"],
+    }
+
+
+def check(result, max_import_ms=None, max_first_render_ms=None, baseline=None, tolerance=1.5):
+    failures = list(result["errors"])
+    if result["heavy_loaded_by_import"]:
+        failures.append(f"import 시점에 무거운 모듈을 불러옴: {sorted(result['heavy_loaded_by_import'])}")
+    # streamlit 자체 import 시간은 빼고 우리 코드가 더한 시간만 본다
+    own = result["import_ms"] - result["streamlit_import_ms"]
+    if max_import_ms is not None and own > max_import_ms:
+        failures.append(f"import {own:.0f}ms > {max_import_ms:.0f}ms (streamlit 제외)")
+    if max_first_render_ms is not None and result["first_render_ms"] > max_first_render_ms:
+        failures.append(f"첫 화면 {result['first_render_ms']:.0f}ms > {max_first_render_ms:.0f}ms")
+    if baseline:
+        for key in ("first_render_ms", "first_mission_ms"):
+            if result[key] > baseline[key] * tolerance:
+                failures.append(f"{key} {result[key]:.0f}ms > 기준 {baseline[key]:.0f}ms x {tolerance}")
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="ENSO 미션 앱 시작 시간 프로파일")
+    parser.add_argument("--app", default=str(data.ROOT / "app2.py"))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--intro-wait", type=float, default=0.0, help="인트로에서 기다릴 시간(초), warm-up 효과 확인용")
+    parser.add_argument("--out", help="결과 JSON 저장 경로")
+    parser.add_argument("--max-import-ms", type=float, help="enso.engine import 허용치 (streamlit 제외, ms)")
+    parser.add_argument("--max-first-render-ms", type=float, help="첫 화면 허용치 (ms)")
+    parser.add_argument("--baseline", help="비교할 이전 결과 JSON")
+    parser.add_argument("--tolerance", type=float, default=1.5)
+    args = parser.parse_args(argv)
+
+    app = Path(args.app)
+    if not app.is_absolute():
+        app = data.ROOT / app
+    result = report(app, args.repeat, args.intro_wait)
+    text = json.dumps(result, ensure_ascii=False, indent=2)
+    print(text)
+    if args.out:
+        Path(args.out).write_text(text, encoding="utf-8")
+
+    baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8")) if args.baseline else None
+    failures = check(result, args.max_import_ms, args.max_first_render_ms, baseline, args.tolerance)
+    for f in failures:
+        print("FAIL:", f, file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,59 @@
+import os
+
+import streamlit as st
+
+# -----------------------
+# 교사용 화면 (?view=teacher)
+# -----------------------
+KEY_ENV = "ENSO_TEACHER_KEY"
+
+
+def requested():
+    return st.query_params.get("view") == "teacher"
+
+
+def show(dash, variant=None, answers=None):
+    """answers는 enso.assign.AnswerKey를 돌려주는 함수다. variant가 학생별 과제를 쓰면 정답표를 내려받을 수 있다."""
+    key = os.environ.get(KEY_ENV)
+    if key and st.query_params.get("key") != key:
+        st.error("교사 키가 올바르지 않습니다.")
+        return
+
+    st.subheader("👩‍🏫 교사용 대시보드")
+    classes = dash.classes()
+    class_code = None
+    if not classes:
+        st.info("아직 접속한 학생이 없습니다. 잠시 후 새로고침하세요.")
+    else:
+        class_code = st.selectbox("반 코드", classes)
+        live(dash, class_code)
+    if answers is not None and variant is not None and variant.assign:
+        # 키 없이 열리는 화면에서는 학생도 정답표를 받을 수 있으므로 보여주지 않는다
+        if not key:
+            st.info(f"학생별 과제 정답표는 {KEY_ENV}를 설정한 뒤 `?view=teacher&key=...`로 열면 볼 수 있습니다.")
+            return
+        answer_sheet(answers(), variant, dash.students(class_code, variant) if class_code else [], class_code)
+
+
+def answer_sheet(answer_key, variant, students, class_code):
+    st.markdown("#### 📥 학생별 과제 정답표")
+    table = answer_key.frame()
+    table = table[table["앱"] == variant.key]
+    # 엑셀에서 한글이 깨지지 않도록 BOM을 붙인다
+    st.download_button(f"전체 과제 후보와 정답 ({len(table):,}행, CSV)", table.to_csv(index=False).encode("utf-8-sig"),
+                       file_name=f"{variant.key}_answer_key.csv", mime="text/csv")
+    if not students:
+        return
+    roster = answer_key.roster(class_code, students, [variant])
+    st.dataframe(roster, hide_index=True)
+    st.download_button(f"{class_code} 반 학생별 과제와 정답 (CSV)", roster.to_csv(index=False).encode("utf-8-sig"),
+                       file_name=f"{variant.key}_{class_code}_answers.csv", mime="text/csv")
+
+
+@st.fragment(run_every=2)
+def live(dash, class_code):
+    table = dash.table(class_code)
+    c1, c2 = st.columns(2)
+    c1.bar_chart(table, x="미션", y="현재 학생 수", color="앱")
+    c2.bar_chart(table, x="미션", y="오답 수", color="앱")
+    st.dataframe(table, hide_index=True)
@@ -0,0 +1,217 @@
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+
+# -----------------------
+# 월별 추세와 블록 부트스트랩 신뢰구간
+# -----------------------
+# 한 달(예: 8월)의 연도별 값에 최소제곱 직선을 맞추고, 잔차를 연속된 몇 해씩 묶어(block) 다시 뽑아
+# 기울기의 분포를 만든다. 이웃한 해끼리 닮은 성질(자기상관)을 블록이 보존하므로 보통 부트스트랩보다 구간이 정직하다.
+# 재표본은 (재표본 수, 연도 수) 배열 하나로 한꺼번에 계산하고, CHUNK개씩 나눠 메모리를 묶어 둔다.
+# 한 번에 할 재표본(여러 달이면 달 수 x 재표본 수)이 POOL_MIN개 이상이면 조각을 프로세스 풀에 나눠 보낸다.
+# 조각마다 씨앗이 정해져 있어 풀을 쓰든 안 쓰든 결과가 같다.
+WORKERS_ENV = "ENSO_TREND_WORKERS"
+CHUNK = 10_000
+POOL_MIN = 100_000
+MAX_JOBS = 2  # 한 프로세스에서 동시에 도는 부트스트랩 수 (나머지는 기다린다)
+LEVEL = 0.95
+RESAMPLES = (1_000, 10_000, 100_000)
+DEFAULT_RESAMPLES = 1_000
+
+
+def fit(x, y):
+    """NaN을 뺀 최소제곱 직선 (기울기, 절편). y는 (..., 연도 수)이고 앞쪽 축마다 따로 맞춘다."""
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    ok = np.isfinite(y)
+    n = ok.sum(axis=-1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        xm = np.where(ok, x, 0.0).sum(axis=-1) / n
+        ym = np.where(ok, y, 0.0).sum(axis=-1) / n
+        dx = np.where(ok, x - xm[..., None], 0.0)
+        slope = (dx * np.where(ok, y - ym[..., None], 0.0)).sum(axis=-1) / (dx * dx).sum(axis=-1)
+    return slope, ym - slope * xm
+
+
+def default_block(n):
+    return max(2, int(np.ceil(n ** (1 / 3))))
+
+
+def _block_indices(rng, n, block, size):
+    # 길이 block인 연속 구간을 이어 붙여 길이 n짜리 재표본 위치를 size개 만든다
+    starts = rng.integers(0, n - block + 1, size=(size, -(-n // block)))
+    return (starts[:, :, None] + np.arange(block)).reshape(size, -1)[:, :n]
+
+
+def _chunk_slopes(x, fitted, resid, block, size, seed):
+    rng = np.random.default_rng(seed)
+    idx = _block_indices(rng, len(x), block, size)
+    return fit(x, fitted + resid[idx])[0]
+
+
+def _seeds(seed, n_resamples):
+    sizes = [CHUNK] * (n_resamples // CHUNK) + ([n_resamples % CHUNK] if n_resamples % CHUNK else [])
+    return list(zip(sizes, np.random.SeedSequence(seed).spawn(len(sizes))))
+
+
+def _prepare(years, values, block):
+    # NaN을 빼고 직선을 맞춘 뒤 재표본에 쓸 (x, 맞춘 값, 잔차, block, 기울기, 절편)
+    x = np.asarray(years, dtype=np.float64)
+    y = np.asarray(values, dtype=np.float64)
+    ok = np.isfinite(y)
+    x, y = x[ok], y[ok]
+    n = len(y)
+    if n < 3:
+        raise ValueError(f"추세를 구하려면 값이 3개 이상 필요합니다 (지금 {n}개).")
+    block = min(block or default_block(n), n)
+    slope, intercept = fit(x, y)
+    fitted = intercept + slope * x
+    return x, fitted, y - fitted, block, slope, intercept
+
+
+def _run(jobs, use_pool):
+    parts = _run_pool(jobs) if use_pool else None
+    if parts is None:
+        parts = [_chunk_slopes(*job) for job in jobs]
+    return parts
+
+
+def _summary(prep, slopes, level):
+    x, _, _, block, slope, intercept = prep
+    alpha = (1 - level) / 2
+    low, high = np.quantile(slopes, [alpha, 1 - alpha])
+    # 부트스트랩 분포를 0 중심으로 옮겼을 때 지금 기울기보다 더 극단적인 비율
+    p = (1 + np.count_nonzero(np.abs(slopes - slope) >= abs(slope))) / (len(slopes) + 1)
+    return {"slope": float(slope), "intercept": float(intercept), "low": float(low), "high": float(high),
+            "p": float(p), "n": len(x), "block": block, "n_resamples": len(slopes)}
+
+
+def bootstrap(years, values, n_resamples=DEFAULT_RESAMPLES, block=None, level=LEVEL, seed=0):
+    """연도별 값의 추세(°C/년)와 블록 부트스트랩 신뢰구간.
+
+    dict(slope, intercept, low, high, p, n, block, n_resamples)를 돌려준다. p는 기울기가 0이라는 가설의
+    양측 부트스트랩 p값이다. 값이 3개보다 적으면 ValueError.
+    """
+    prep = _prepare(years, values, block)
+    jobs = [(*prep[:4], size, s) for size, s in _seeds(seed, n_resamples)]
+    return _summary(prep, np.concatenate(_run(jobs, n_resamples >= POOL_MIN)), level)
+
+
+def verdict(result):
+    """신뢰구간이 0을 넘으면 "상승", 0 아래면 "하강", 0을 포함하면 "없음"."""
+    if result["low"] > 0:
+        return "상승"
+    if result["high"] < 0:
+        return "하강"
+    return "없음"
+
+
+def monthly(q, col, year_range, n_resamples=DEFAULT_RESAMPLES, months=range(1, 13), block=None, level=LEVEL, seed=0):
+    """달마다 bootstrap() 결과. {월: 결과} (값이 모자란 달은 빠진다).
+
+    q는 enso.query.YearIndex다. 모든 달의 재표본 조각을 한꺼번에 돌리므로, 달 수 x 재표본 수가 POOL_MIN 이상이면 풀을 쓴다.
+    """
+    preps = {}
+    for m in months:
+        part = q.select(year_range, m)
+        try:
+            preps[m] = _prepare(part["Year"].to_numpy(), part[col].to_numpy(), block)
+        except ValueError:
+            continue
+    jobs = [(*prep[:4], size, s) for prep in preps.values() for size, s in _seeds(seed, n_resamples)]
+    parts = _run(jobs, n_resamples * len(preps) >= POOL_MIN)
+    per_month = len(parts) // max(len(preps), 1)
+    return {m: _summary(prep, np.concatenate(parts[i * per_month:(i + 1) * per_month]), level)
+            for i, (m, prep) in enumerate(preps.items())}
+
+
+# -----------------------
+# 프로세스 풀과 결과 캐시
+# -----------------------
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _executor():
+    # 서버가 멈추지 않도록 CPU의 절반까지만 쓴다. 1개 이하면 풀 없이 이 프로세스에서 계산한다
+    global _pool
+    workers = int(os.environ.get(WORKERS_ENV) or max(1, (os.cpu_count() or 2) // 2))
+    if workers <= 1:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            # fork는 Streamlit의 스레드까지 복제하므로 spawn으로 띄운다
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        return _pool
+
+
+def _run_pool(jobs):
+    # 풀이 없거나 깨졌으면 None (이 프로세스에서 계산한다)
+    global _pool
+    pool = _executor()
+    if pool is None:
+        return None
+    try:
+        return list(pool.map(_chunk_slopes, *zip(*jobs)))
+    except BrokenProcessPool:
+        with _pool_lock:
+            if _pool is pool:
+                _pool = None
+        return None
+
+
+class Cache:
+    """(열, 월, 연도 범위, 재표본 수) 같은 키로 결과를 저장하는 LRU.
+
+    같은 키를 여러 세션이 동시에 물으면 한 번만 계산하고 나머지는 그 결과를 기다린다.
+    """
+
+    def __init__(self, maxsize=256, max_jobs=MAX_JOBS):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_jobs)
+
+    def get(self, key, compute):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            fut = self._pending.get(key)
+            owner = fut is None
+            if owner:
+                fut = self._pending[key] = Future()
+                self.misses += 1
+            else:
+                self.hits += 1
+        if not owner:
+            return fut.result()
+
+        try:
+            with self._slots:
+                value = compute()
+        except BaseException as e:
+            with self._lock:
+                del self._pending[key]
+            fut.set_exception(e)
+            raise
+        with self._lock:
+            del self._pending[key]
+            self._data[key] = value
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        fut.set_result(value)
+        return value
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._data), "running": len(self._pending)}
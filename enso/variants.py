@@ -0,0 +1,287 @@
+from dataclasses import dataclass
+
+# -----------------------
+# 미션 정의
+# -----------------------
+# 미션은 데이터로 선언하고 enso.engine이 화면을 그린다.
+# column은 "sst"(nino3.4 수온 평균), "index"(데이터셋의 지수 컬럼) 또는 enso.registry의 시계열 키이고,
+# answer는 "max"/"min"(구간에서 값이 가장 큰/작은 해), "trend"(고른 달의 추세: 상승/하강/없음),
+# "max_trend"(추세가 가장 큰 달), "analog_year"(가장 비슷한 과거 기간이 끝난 해),
+# "analog_outlook"(비슷했던 기간들의 그 뒤 상태: 엘니뇨/라니냐/중립) 또는 None(아무 답이나 통과)이다.
+SST = "sst"
+INDEX = "index"
+
+# 그래프를 그리지 않는 화면(인트로 등)에서도 plotly를 불러오지 않도록 여기에 둔다
+THRESHOLD_LABELS = ("엘니뇨 기준 (+0.5)", "라니냐 기준 (-0.5)")
+
+
+@dataclass(frozen=True)
+class Mission:
+    number: int
+    title: str
+    code: str
+    question: str
+    input_label: str
+    chart: str  # "month_line" | "index_line" | "yearly_min" | "trend" | "trend_months" | "analog"
+    chart_title: str
+    column: str = INDEX
+    answer: str | None = "max"
+    markers: bool = True
+    y_pad: float | None = None  # month_line: 값 범위 위아래로 둘 여백
+    y_range: tuple | None = None
+    threshold_lines: bool = True  # ±0.5 기준선
+    thresholds: tuple | None = THRESHOLD_LABELS  # 기준선 설명 (None이면 선만)
+    show_table: bool = False
+    episodes: bool = True  # index_line: 엘니뇨/라니냐 사건 구간 음영
+    series: tuple = ()  # 학생이 고를 수 있는 시계열 키 (enso.registry, 예: ("nino3.4:index", "nino4:index"))
+    sst_map: bool = False  # 그래프 아래에 열대 태평양 수온 편차 지도 (enso.grid)
+    pass_message: str = "정답입니다! 다음 미션으로 이동합니다."
+
+
+@dataclass(frozen=True)
+class Variant:
+    key: str
+    page_title: str
+    missions: tuple
+    title: str | None = None
+    css: str | None = None
+    intro_title: str | None = None
+    intro: str | None = None  # 있으면 미션 0(인트로)부터 시작
+    gated: bool = False  # True: 정답 확인 후 "다음 미션으로 이동" 버튼으로 넘어감
+    assign: bool = False  # True: 최댓값/최솟값 미션마다 학생별 월과 연도 범위를 정해 줌 (enso.assign)
+    final_prompt: str = "마지막 단계: 암호를 입력하세요."
+    final_label: str = "최종 암호 (예: ENSO)"
+    final_success: str = "🎯 암호해독 성공!"
+    final_cheer: str | None = None
+    final_extra: str | None = None
+
+    @property
+    def first_mission(self):
+        return 0 if self.intro else 1
+
+    @property
+    def done_mission(self):
+        return len(self.missions) + 1
+
+    @property
+    def secret(self):
+        return "".join(m.code for m in self.missions)
+
+
+# -----------------------
+# 기후 데이터 미션 챌린지 (app.py)
+# -----------------------
+BACKGROUND_URL = "https://images.unsplash.com/photo-1507525428034-b723cf961d3e"  # 번들에서는 로컬 이미지로 바뀜
+
+CSS = """
+<style>
+/* 전체 배경 이미지 */
+[data-testid="stAppViewContainer"] {
+  background-image: url("https://images.unsplash.com/photo-1507525428034-b723cf961d3e");
+  background-size: cover;
+  background-position: center;
+}
+
+/* 헤더 완전 투명 */
+[data-testid="stHeader"] {
+  background: rgba(0, 0, 0, 0);
+}
+
+/* 기본 컨테이너의 흰색 배경 제거 */
+[data-testid="block-container"] {
+  background: rgba(0, 0, 0, 0) !important;
+  padding-top: 0rem !important; /* 상단 여백 최소화 */
+}
+
+/* 미션 카드 스타일 */
+.mission-card {
+  background: rgba(255, 255, 255, 0.85);
+  padding: 20px;
+  border-radius: 16px;
+  margin-bottom: 20px;
+  color: #111;
+}
+
+/* 버튼 스타일 */
+.stButton button {
+  background: #111 !important;
+  color: #fff !important;
+  font-weight: 700;
+  border-radius: 10px;
+  padding: 8px 16px;
+  border: none;
+}
+</style>
+"""
+
+
+CLASSIC = Variant(
+    key="app",
+    page_title="기후 데이터 미션 챌린지",
+    title="🌊 기후 데이터 탐험 미션",
+    css=CSS,
+    assign=True,
+    missions=(
+        Mission(1, "미션 1️⃣ : Nino3.4 해역과 수온 데이터 탐색", "E",
+                "1️⃣ 언제 Nino3.4 해역에서 {month}월의 수온 평균값이 가장 높았나요? (예: 2024년)", "정답 입력",
+                chart="month_line", chart_title="{month}월 Nino3.4 해역 수온 평균 변화", column=SST,
+                answer=None, y_pad=1, sst_map=True, pass_message="정답이 제출되었습니다! 다음 미션으로 이동합니다."),
+        Mission(2, "미션 2️⃣ : ENSO 지수 탐색", "N",
+                "질문: 이 기간 동안 지수가 가장 높은 해는?", "정답 입력 (예: 1997)",
+                chart="index_line", chart_title="ENSO 지수 변화", answer="max", y_range=(-3, 3)),
+        Mission(3, "미션 3️⃣ : 라니냐 탐색", "S",
+                "질문: 이 기간 동안 가장 강한 라니냐는 몇 년?", "정답 입력 (예: 2010)",
+                chart="index_line", chart_title="ENSO 지수 변화 (라니냐 탐색)", answer="min", y_range=(-3, 3)),
+        Mission(4, "미션 4️⃣ : 가장 강한 라니냐가 있었던 연도는?", "O",
+                "질문: 이 기간 동안 가장 강한 라니냐(지수가 가장 낮은) 연도는?", "정답 입력",
+                chart="yearly_min", chart_title="연도별 최소 지수 (가장 강한 라니냐 후보)", answer="min",
+                y_range=(-3, 3), show_table=True, pass_message="정답입니다! 모든 미션을 완료했습니다."),
+    ),
+)
+
+# -----------------------
+# 엘니뇨 사건 파일 (app2.py)
+# -----------------------
+INTRO = """
+    **세계 기후를 흔드는 정체불명의 힘**이 있다는 보고가 있었습니다.   
+    최근 지구 곳곳에서 이상 기후 현상이 보고되고 있습니다.   
+     **2023년**    
+    아시아, 아프리카, 남미지역에서 농업 생산량이 감소하고 물이 부족해지는 현상이 나타났습니다.   
+    이때문에 '기후플레이션'이라 불리는 식량가격 상승이 일어났어요.   
+    **2020년**   
+    아시아 지역에서 한파와 폭우가 나타났습니다.   
+    중국과 인동서는 기록적인 폭설과 홍수로 인해 수천명이 피해를 입었습니다.   
+    **한국에서**   
+    2024년 한국은 겨울철 매우 가물어서, 농사를 지을 물이 부족하여 농작물에 피해를 입었습니다.   
+    2022년에는 여름에 폭우와 집중호우로 홍수 피해가 발생했습니다.   
+    **기후 수사국**은 당신에게 중요한 임무를 맡겼습니다.  
+
+    🌊 **미션:**  
+    태평양 바다 속에서 숨겨진 기후의 단서를 찾고,  
+    기후 코드의 암호를 해독하여 전세계에 이상기후를 일으키는 원인을 찾아라!
+
+    🔍 **단서 수집 방법:**  
+    4개의 미션을 수행하고 각 미션에서 **암호 조각**을 획득하세요.  
+    모든 조각을 모으면, **최종 암호 해독**에 성공할 수 있습니다!
+    """
+
+ENSO_EXPLAINED = """
+    🌍 **ENSO (El Niño–Southern Oscillation, 엘니뇨-남방진동)**
+
+**ENSO 약자 의미:**  
+- **El Niño** → 중앙·동부 열대 태평양 해수면이 평소보다 **따뜻해지는 현상**  
+- **Southern Oscillation** → 태평양 서부와 동부 대기압 차이로 나타나는 **남방진동**  
+
+즉, ENSO는 열대 태평양에서 발생하는 **주기적 해수면 온도 변화와 대기 순환 변화**를 결합한 기후 패턴입니다.
+
+- **엘니뇨(El Niño):** 태평양 적도 해수면 온도가 평소보다 높아지는 현상  
+- **라니냐(La Niña):** 태평양 적도 해수면 온도가 평소보다 낮아지는 현상  
+
+**인간과 사회에 미치는 영향:**  
+- 이상 기후로 인한 가뭄, 폭우, 산불, 농작물 피해  
+- 홍수나 가뭄으로 식량 생산과 물 공급에 영향  
+- 열대 지역과 해양 생태계 변화  
+
+**세계 기후에 미치는 영향:**  
+- 북미, 남미, 아시아, 호주 등 지역별 강수량과 기온 패턴 변화  
+- 허리케인, 태풍 등 극한 기상현상 발생 빈도 변화  
+- 해양 생태계 및 어업 자원에 장기적 영향
+    """
+
+CASE_FILE = Variant(
+    key="app2",
+    page_title="엘니뇨 사건 파일",
+    intro_title="🕵️‍♀️ 엘니뇨 사건 파일: 기후의 흔적을 찾아라",
+    intro=INTRO,
+    gated=True,
+    assign=True,
+    final_prompt="모은 암호 조각을 조합해 암호를 입력하세요.",
+    final_label="최종 암호 입력",
+    final_success="🎯 암호 해독 성공! 사건의 진실이 밝혀졌습니다! 전세계 기후를 바꾼것은 바로 ENSO였습니다!",
+    final_cheer="🌍 **축하합니다! 당신은 기후의 비밀을 밝혀낸 최고의 수사관입니다.**",
+    final_extra=ENSO_EXPLAINED,
+    missions=(
+        Mission(1, "미션 1️⃣ : Nino3.4 해역과 수온 데이터 탐색", "E",
+                "질문: 언제 가장 높았나요? (예: 2024년)", None,
+                chart="month_line", chart_title="{month}월 Nino3.4 해역 수온 평균 변화", column=SST,
+                answer="max", markers=False, sst_map=True),
+        Mission(2, "미션 2️⃣ : ENSO 지수 탐색", "N",
+                "질문: 지수가 가장 높은 해는?", None,
+                chart="index_line", chart_title="ENSO 지수 변화", answer="max",
+                thresholds=("엘니뇨 기준", "라니냐 기준")),
+        Mission(3, "미션 3️⃣ : 라니냐 탐색", "S",
+                "질문: 가장 강한 라니냐는 몇 년?", None,
+                chart="index_line", chart_title="ENSO 지수 변화 (라니냐 탐색)", answer="min", thresholds=None),
+        Mission(4, "미션 4️⃣ : 가장 강한 라니냐 연도", "O",
+                "질문: 가장 강한 라니냐 연도는?", None,
+                chart="yearly_min", chart_title="연도별 최소 지수", answer="min", threshold_lines=False),
+    ),
+)
+
+# -----------------------
+# 수온 추세 탐구 (app3.py)
+# -----------------------
+TREND_EXPLAINED = """
+**블록 부트스트랩으로 추세 확인하기**
+
+- 같은 달의 연도별 수온에 직선을 맞추면 기울기가 추세입니다 (°C/10년).
+- 직선에서 벗어난 값(잔차)을 몇 해씩 묶어 다시 뽑아 수천 번 기울기를 구하면, 기울기가 얼마나 흔들리는지 알 수 있습니다.
+- 95% 신뢰구간이 0을 넘으면 '상승', 0보다 아래면 '하강', 0을 포함하면 우연과 구별하기 어렵습니다.
+- 엘니뇨/라니냐처럼 이웃한 해끼리 닮은 변동이 있어서, 한 해씩이 아니라 몇 해씩 묶어 뽑습니다.
+"""
+
+TREND_LAB = Variant(
+    key="trend",
+    page_title="수온 추세 탐구",
+    title="📈 Nino3.4 수온 추세 탐구",
+    css=CSS,
+    final_prompt="마지막 단계: 모은 암호를 입력하세요.",
+    final_label="최종 암호 (예: UP)",
+    final_extra=TREND_EXPLAINED,
+    missions=(
+        Mission(1, "미션 1️⃣ : 한 달의 수온 추세", "U",
+                "질문: {month}월 수온에는 통계적으로 의미 있는 추세가 있나요? (상승/하강/없음)", "정답 입력 (상승/하강/없음)",
+                chart="trend", chart_title="{month}월 Nino3.4 수온과 추세", column=SST, answer="trend"),
+        Mission(2, "미션 2️⃣ : 가장 빠르게 따뜻해지는 달", "P",
+                "질문: 선택한 기간에 추세(기울기)가 가장 큰 달은? (숫자만, 예: 6)", "정답 입력 (예: 6)",
+                chart="trend_months", chart_title="달별 Nino3.4 수온 추세 (95% 신뢰구간)", column=SST,
+                answer="max_trend", pass_message="정답입니다! 모든 미션을 완료했습니다."),
+    ),
+)
+
+# -----------------------
+# ENSO 예측 실험실 (app4.py)
+# -----------------------
+ANALOG_EXPLAINED = """
+**유사 사례(analog)로 예측하기**
+
+- 최근 몇 달 동안의 지수 흐름을 하나의 모양으로 보고, 과거 기록에서 모양이 가장 비슷했던 기간을 찾습니다.
+- 그 기간들 뒤에 실제로 일어난 일을 모으면 앞으로 일어날 수 있는 일의 범위가 됩니다.
+- 사례들이 한쪽으로 모이면 예측이 비교적 믿을 만하고, 넓게 퍼지면 불확실성이 큽니다.
+- 기상청과 NOAA도 역학 모델과 함께 이런 통계적 방법을 참고합니다.
+"""
+
+FORECAST_LAB = Variant(
+    key="analog",
+    page_title="ENSO 예측 실험실",
+    title="🔮 ENSO 예측 실험실",
+    css=CSS,
+    final_prompt="마지막 단계: 모은 암호를 입력하세요.",
+    final_label="최종 암호 입력",
+    final_extra=ANALOG_EXPLAINED,
+    missions=(
+        Mission(1, "미션 1️⃣ : 과거에서 닮은 꼴 찾기", "G",
+                "질문: 고른 기간과 가장 비슷했던 과거 기간은 몇 년에 끝났나요? (숫자만, 예: 1997)",
+                "정답 입력 (예: 1997)",
+                chart="analog", chart_title="고른 기간과 비슷했던 과거 사례, 그 뒤 {horizon}개월",
+                series=("nino3.4:oni", "nino3.4:index"), answer="analog_year"),
+        Mission(2, "미션 2️⃣ : 사례로 예측하기", "O",
+                "질문: 비슷했던 사례들의 6개월 뒤 값(중앙값)으로 보면 앞으로 ENSO 상태는? (엘니뇨/라니냐/중립)",
+                "정답 입력 (엘니뇨/라니냐/중립)",
+                chart="analog", chart_title="유사 사례로 본 앞으로 {horizon}개월",
+                series=("nino3.4:oni", "nino3.4:index"), answer="analog_outlook",
+                pass_message="정답입니다! 모든 미션을 완료했습니다."),
+    ),
+)
+
+VARIANTS = {v.key: v for v in (CLASSIC, CASE_FILE, TREND_LAB, FORECAST_LAB)}
@@ -0,0 +1,32 @@
+import streamlit as st
+
+from enso import engine, variants
+
+# -----------------------
+# 미션 앱들을 한 프로세스의 페이지로 제공
+# -----------------------
+# 데이터셋과 그래프 캐시는 enso.engine에 한 번만 올라가므로 모든 페이지가 같이 쓴다.
+
+
+def classic():
+    engine.run(variants.CLASSIC)
+
+
+def case_file():
+    engine.run(variants.CASE_FILE)
+
+
+def trend_lab():
+    engine.run(variants.TREND_LAB)
+
+
+def forecast_lab():
+    engine.run(variants.FORECAST_LAB)
+
+
+st.navigation([
+    st.Page(classic, title="기후 데이터 미션 챌린지", icon="🌊", default=True),
+    st.Page(case_file, title="엘니뇨 사건 파일", icon="🕵️"),
+    st.Page(trend_lab, title="수온 추세 탐구", icon="📈"),
+    st.Page(forecast_lab, title="ENSO 예측 실험실", icon="🔮"),
+]).run()
@@ -0,0 +1,19 @@
+import shutil
+
+import pytest
+
+from enso import data, dataset
+
+HEADER = "날짜,nino3.4 index,ONI index,nino3.4 수온 평균,nino3.4 수온 평균(3개월),nino3.4 수온 평년평균,nino3.4 수온 표준편차\n"
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    """저장소에 포함된 CSV를 복사한 임시 원본과 임시 저장소. tmp_path를 돌려준다."""
+    csv = tmp_path / "oni.csv"
+    shutil.copy(data.DATA_FILE, csv)
+    monkeypatch.setenv(data.PATH_ENV, str(csv))
+    monkeypatch.setenv(dataset.CACHE_ENV, str(tmp_path / "cache"))
+    monkeypatch.delenv(data.REFRESH_ENV, raising=False)
+    dataset.load()
+    return tmp_path
@@ -0,0 +1,24 @@
+from conftest import HEADER
+
+from enso import assign, dataset, engine, ingest, variants
+
+
+def answer_key():
+    return assign.AnswerKey(engine.Context(dataset.load()), variants.VARIANTS.values(), engine.MONTH_CHARTS)
+
+
+def test_task_unchanged_after_new_year_is_appended(store):
+    variant = variants.VARIANTS["app2"]
+    missions = [m for m in variant.missions if m.answer in assign.ANSWERS]
+    students = [("3반", str(i)) for i in range(30)]
+    key = answer_key()
+    before = {(m.number, s): key.task(variant, m, s) for m in missions for s in students}
+
+    rows = [f"{y}-{m:02d},0.1,,27.0,,26.9,0.6" for y, m in [(2025, 8), (2025, 9), (2025, 10), (2025, 11), (2025, 12)]
+            + [(2026, m) for m in range(1, 13)]]
+    (store / "new.csv").write_text(HEADER + "\n".join(rows) + "\n", encoding="utf-8")
+    ingest.ingest(store / "new.csv")
+    key = answer_key()
+
+    assert key.starts.max() < 2026
+    assert {(m.number, s): key.task(variant, m, s) for m in missions for s in students} == before
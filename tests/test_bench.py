@@ -0,0 +1,19 @@
+import pytest
+
+from enso import bench, data, variants
+
+
+@pytest.mark.parametrize("app, variant", [("app.py", variants.CLASSIC), ("app2.py", variants.CASE_FILE)])
+def test_app_variant(app, variant):
+    assert bench.app_variant(data.ROOT / app) is variant
+
+
+@pytest.mark.parametrize("app", ["app3.py", "app4.py", "streamlit_app.py"])
+def test_app_variant_rejects_apps_the_bench_cannot_drive(app):
+    with pytest.raises(ValueError):
+        bench.app_variant(data.ROOT / app)
+
+
+def test_expected_answers_cover_every_mission(store):
+    answers = bench.expected_answers(variants.CLASSIC)
+    assert all(answers({"sid": "abc"}, m.number) is not None for m in variants.CLASSIC.missions)
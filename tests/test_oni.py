@@ -0,0 +1,14 @@
+import numpy as np
+
+from enso import dataset, oni
+
+
+def test_frame_columns_agree_with_provider(store):
+    # frame()이 자료와 같은 이름으로 내보내는 컬럼은 자료 제공처의 값과 같아야 한다
+    df = dataset.load()
+    out = oni.frame(df)
+    for col in out.columns:
+        a, b = out[col].to_numpy(), df[col].to_numpy()
+        both = ~np.isnan(a) & ~np.isnan(b)
+        assert both.sum() > 400, col
+        assert np.abs(a[both] - b[both]).max() < 0.005, col
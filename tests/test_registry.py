@@ -0,0 +1,38 @@
+import shutil
+
+import numpy as np
+import pytest
+
+from enso import dataset, ingest, registry
+
+from conftest import HEADER
+
+
+def test_added_series_survives_rebuild(store):
+    (store / "nino4.csv").write_text("날짜,nino4 index\n2024-01,0.5\n2024-02,0.7\n2030-01,9.9\n", encoding="utf-8")
+    registry.add(store / "nino4.csv", "nino4 index", label="Niño4 지수")
+
+    shutil.rmtree(store / "cache")
+    df = dataset.load()
+
+    assert "nino4 index" in df.columns
+    reg = registry.Registry.from_meta(df.attrs["series"])
+    assert reg.get("nino4:index").label == "Niño4 지수"
+    jan = df.loc[(df["Year"] == 2024) & (df["Month"] == 1), "nino4 index"]
+    assert jan.tolist() == [pytest.approx(0.5)]
+    assert np.isnan(df.loc[df["Year"] == 2000, "nino4 index"]).all()
+    # 나중에 더한 시계열은 새 달에 없어도 된다
+    assert "nino4 index" not in dataset.read_meta()["required"]
+
+
+def test_ingested_values_of_added_series_survive_rebuild(store):
+    (store / "nino4.csv").write_text("날짜,nino4 index\n2024-01,0.5\n", encoding="utf-8")
+    registry.add(store / "nino4.csv", "nino4 index")
+    (store / "new.csv").write_text(HEADER.rstrip("\n") + ",nino4 index\n2025-08,0.1,,27.0,,26.9,0.6,1.5\n",
+                                   encoding="utf-8")
+    ingest.ingest(store / "new.csv")
+
+    shutil.rmtree(store / "cache")
+    df = dataset.load()
+
+    assert df["nino4 index"].iloc[-1] == pytest.approx(1.5)